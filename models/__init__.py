@@ -1,7 +1,10 @@
 # models/__init__.py
 
 
-from models.analytics import UserRequest, RequestResponse, UserActivity, UserInteraction, UserTargetStats
+from models.analytics import (
+    UserRequest, RequestResponse, UserActivity, UserInteraction, UserTargetStats,
+    DailySalesRollup, RollupWatermark
+)
 from models.blog import Post, PostImage
 from models.catalog import Category, Product, ProductImage, ProductPrice
 from models.enum import (
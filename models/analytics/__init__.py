@@ -6,6 +6,7 @@ from models.analytics.request_response import RequestResponse
 from models.analytics.user_activity import UserActivity
 from models.analytics.user_interaction import UserInteraction
 from models.analytics.user_target_status import UserTargetStats
+from models.analytics.daily_sales_rollup import DailySalesRollup, RollupWatermark
 
 
 __all__ = [
@@ -14,6 +15,8 @@ __all__ = [
     "UserInteraction",
     "UserRequest",
     "UserTargetStats",
+    "DailySalesRollup",
+    "RollupWatermark",
 ]
 
 
@@ -0,0 +1,65 @@
+# models/analytics/daily_sales_rollup.py
+"""
+DailySalesRollup - agregate zilnice pre-calculate pentru vânzări.
+
+Tabelul este derivat din orders / order_items / products și reconstruit
+incremental de SalesRollupService. Nu se scrie niciodată manual.
+
+Nivele (coloana `level`):
+- product: zi × status × produs × categorie × vendor (cantitate, venit, comenzi)
+- category: zi × status × categorie (număr exact de comenzi distincte pe categorie)
+- order: zi × status (număr comenzi și total din orders.total_amount)
+
+Business Rules:
+- Ziua este data (UTC) din orders.created_at
+- Rândurile unei zile se șterg și se reinserează la fiecare reprocesare
+- Watermark-ul ultimei reîmprospătări se păstrează în RollupWatermark
+"""
+
+from __future__ import annotations
+from datetime import date, datetime
+from typing import Optional
+
+from sqlalchemy import String, Integer, Numeric, Date, DateTime, Enum, ForeignKey, Index
+from sqlalchemy.orm import Mapped, mapped_column
+
+from cfg import Base
+from models.enum import OrderStatus
+
+
+class DailySalesRollup(Base):
+    """Agregate zilnice de vânzări."""
+    __tablename__ = "daily_sales_rollup"
+    __table_args__ = (
+        Index('ix_daily_sales_rollup_level_day_status', 'level', 'day', 'status'),
+        Index('ix_daily_sales_rollup_product', 'product_id'),
+        Index('ix_daily_sales_rollup_category', 'category_id'),
+    )
+
+    LEVEL_PRODUCT = "product"
+    LEVEL_CATEGORY = "category"
+    LEVEL_ORDER = "order"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+
+    level: Mapped[str] = mapped_column(String(10), nullable=False)
+    day: Mapped[date] = mapped_column(Date, nullable=False)
+    status: Mapped[OrderStatus] = mapped_column(Enum(OrderStatus), nullable=False)
+
+    # Dimensiuni (NULL pe nivelele agregate)
+    product_id: Mapped[Optional[int]] = mapped_column(ForeignKey("products.id", ondelete="CASCADE"))
+    category_id: Mapped[Optional[int]] = mapped_column(ForeignKey("categories.id", ondelete="CASCADE"))
+    vendor_company_id: Mapped[Optional[int]] = mapped_column(ForeignKey("vendor_companies.id", ondelete="CASCADE"))
+
+    # Metrici
+    quantity: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    revenue: Mapped[float] = mapped_column(Numeric(14, 2), default=0, nullable=False)
+    order_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+
+
+class RollupWatermark(Base):
+    """Ultima reîmprospătare pentru fiecare rollup."""
+    __tablename__ = "rollup_watermarks"
+
+    name: Mapped[str] = mapped_column(String(50), primary_key=True)
+    refreshed_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
@@ -16,7 +16,7 @@ from __future__ import annotations
 from typing import Optional, Dict, TYPE_CHECKING, List
 from datetime import datetime
 from typing import Optional
-from sqlalchemy import String, ForeignKey, Text, Integer, Enum, JSON
+from sqlalchemy import String, ForeignKey, Text, Integer, Enum, JSON, PrimaryKeyConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from cfg import Base, CreatedAtMixin, UpdatedAtMixin, IsActiveMixin
@@ -29,8 +29,15 @@ if TYPE_CHECKING:
 class UserActivity(Base, CreatedAtMixin):
     """Model pentru tracking sesiuni utilizator."""
     __tablename__ = "user_activities"
-
-    id: Mapped[int] = mapped_column(primary_key=True)
+    # Partiționat lunar după created_at (vezi services/dashboard/activity_partitions.py);
+    # cheia de partiționare trebuie să facă parte din PK, identitatea ORM rămâne id
+    __table_args__ = (
+        PrimaryKeyConstraint("id", "created_at"),
+        {"postgresql_partition_by": "RANGE (created_at)"}
+    )
+    __mapper_args__ = {"primary_key": ["id"]}
+
+    id: Mapped[int] = mapped_column(Integer, autoincrement=True)
     client_id: Mapped[int] = mapped_column(ForeignKey("clients.id"), nullable=False, index=True)
 
     # Session tracking
@@ -17,7 +17,7 @@ from typing import Optional, List, Dict, TYPE_CHECKING
 from datetime import datetime
 import enum
 
-from sqlalchemy import String, Integer, DateTime, Enum, ForeignKey, Index, JSON, Boolean, func
+from sqlalchemy import String, Integer, DateTime, Enum, ForeignKey, Index, JSON, Boolean, func, PrimaryKeyConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship, validates
 
 
@@ -34,13 +34,21 @@ if TYPE_CHECKING:
 class UserInteraction(Base, CreatedAtMixin):
     """Model pentru tracking interacțiuni specifice."""
     __tablename__ = "user_interactions"
-
-    id: Mapped[int] = mapped_column(primary_key=True)
+    # Partiționat lunar după created_at (vezi services/dashboard/activity_partitions.py)
+    __table_args__ = (
+        PrimaryKeyConstraint("id", "created_at"),
+        # Statistici produs: target_type + target_id + action_type, pe interval
+        Index("ix_user_interactions_target_action_created", "target_type", "target_id", "action_type", "created_at"),
+        {"postgresql_partition_by": "RANGE (created_at)"}
+    )
+    __mapper_args__ = {"primary_key": ["id"]}
+
+    id: Mapped[int] = mapped_column(Integer, autoincrement=True)
     client_id: Mapped[int] = mapped_column(ForeignKey("clients.id"), nullable=False, index=True)
 
     # Ce fel de interacțiune
     action_type: Mapped[ActionType] = mapped_column(Enum(ActionType), nullable=False, index=True)
-    target_type: Mapped[TargetType] = mapped_column(Enum(TargetType), nullable=False, index=True)
+    target_type: Mapped[TargetType] = mapped_column(Enum(TargetType), nullable=False)
 
     # ID-ul țintei (product_id, category_id, post_id, cart_id)
     target_id: Mapped[int] = mapped_column(Integer, nullable=False, index=True)
@@ -48,8 +56,8 @@ class UserInteraction(Base, CreatedAtMixin):
     # Metadata suplimentară (ex: search query, share platform)
     extra_data: Mapped[Optional[dict]] = mapped_column(JSON)
 
-    # Context sesiune
-    activity_id: Mapped[Optional[int]] = mapped_column(ForeignKey("user_activities.id"))
+    # Context sesiune - fără FK: user_activities e partiționat (PK id + created_at)
+    activity_id: Mapped[Optional[int]] = mapped_column(Integer)
 
     # Tracking vizite repetate
     view_count: Mapped[int] = mapped_column(Integer, default=1)
@@ -57,6 +65,9 @@ class UserInteraction(Base, CreatedAtMixin):
 
     # Relationships
     client: Mapped["Client"] = relationship(back_populates="interactions")
-    activity: Mapped[Optional["UserActivity"]] = relationship()
+    activity: Mapped[Optional["UserActivity"]] = relationship(
+        primaryjoin="foreign(UserInteraction.activity_id) == UserActivity.id",
+        viewonly=True
+    )
 
 
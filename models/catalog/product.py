@@ -18,7 +18,8 @@ from typing import Optional, List, TYPE_CHECKING
 import re
 from slugify import slugify
 
-from sqlalchemy import String, Integer, Text, ForeignKey, Index, UniqueConstraint
+from sqlalchemy import String, Integer, Text, ForeignKey, Index, UniqueConstraint, Computed
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship, validates
 from sqlalchemy.ext.hybrid import hybrid_property
 
@@ -48,6 +49,17 @@ class Product(Base, CreatedAtMixin, UpdatedAtMixin, IsActiveMixin):
     description: Mapped[Optional[str]] = mapped_column(Text)
     short_description: Mapped[Optional[str]] = mapped_column(String(500))
 
+    # Full-text (nume A, descriere B) - calculat de PostgreSQL, vezi SearchService
+    search_vector: Mapped[Optional[str]] = mapped_column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('romanian_unaccent', name), 'A') || "
+            "setweight(to_tsvector('romanian_unaccent', coalesce(description, '')), 'B')",
+            persisted=True
+        ),
+        deferred=True
+    )
+
     # Stoc și disponibilitate
     in_stock: Mapped[bool] = mapped_column(default=True)
     stock_quantity: Mapped[Optional[int]] = mapped_column(Integer, default=0)
@@ -20,7 +20,7 @@ from __future__ import annotations
 from typing import Optional, TYPE_CHECKING
 from sqlalchemy import Enum as SQLAlchemyEnum
 
-from sqlalchemy import Numeric, String, Boolean, ForeignKey, Integer, UniqueConstraint, CheckConstraint
+from sqlalchemy import Numeric, String, Boolean, ForeignKey, Integer, UniqueConstraint, CheckConstraint, Index, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship, validates
 
 from cfg import Base, CreatedAtMixin, UpdatedAtMixin, IsActiveMixin
@@ -34,6 +34,13 @@ class ProductPrice(Base, CreatedAtMixin, UpdatedAtMixin, IsActiveMixin):
     """Model pentru prețurile produselor pe grile."""
     __tablename__ = "product_prices"
 
+    __table_args__ = (
+        Index('ix_product_prices_product_type', 'product_id', 'price_type'),
+        # Doar prețurile active, cu amount în index (index-only scan)
+        Index('ix_product_prices_active', 'product_id', 'price_type',
+              postgresql_include=['amount'], postgresql_where=text('is_active')),
+    )
+
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     product_id: Mapped[int] = mapped_column(ForeignKey("products.id"), nullable=False)
 
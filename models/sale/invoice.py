@@ -20,7 +20,7 @@ from typing import Optional, TYPE_CHECKING
 from datetime import datetime
 
 
-from sqlalchemy import String, Integer, Numeric, Text, ForeignKey, Enum, DateTime, Boolean, Index, UniqueConstraint, Enum as SQLEnum
+from sqlalchemy import String, Integer, Numeric, Text, ForeignKey, Enum, DateTime, Boolean, Index, UniqueConstraint, Enum as SQLEnum, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship, validates
 
 
@@ -40,6 +40,9 @@ class Invoice(Base, CreatedAtMixin):
         UniqueConstraint('cart_id', name='uq_invoice_cart'),
         UniqueConstraint('order_id', name='uq_invoice_order'),
         Index('ix_invoice_type', 'invoice_type'),
+        # Oferte valide / expirate
+        Index('ix_invoices_quote_valid_until', 'valid_until', 'cart_id',
+              postgresql_where=text("invoice_type = 'QUOTE'")),
     )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
@@ -18,7 +18,7 @@ from typing import Optional, List, TYPE_CHECKING
 
 from datetime import datetime
 from typing import Optional, List
-from sqlalchemy import String, ForeignKey, Numeric, Text, Integer, Enum
+from sqlalchemy import String, ForeignKey, Numeric, Text, Integer, Enum, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from cfg import Base, CreatedAtMixin, UpdatedAtMixin
@@ -33,6 +33,11 @@ class Order(Base, CreatedAtMixin, UpdatedAtMixin):
     """Model pentru comenzi."""
     __tablename__ = "orders"
 
+    __table_args__ = (
+        Index('ix_orders_status_created_at', 'status', 'created_at'),
+        Index('ix_orders_created_at', 'created_at'),
+    )
+
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     client_id: Mapped[int] = mapped_column(ForeignKey("clients.id"), nullable=False, index=True)
 
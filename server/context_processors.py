@@ -4,6 +4,9 @@ Context processors globali pentru toate template-urile.
 """
 from fastapi import Request
 from middleware.csrf import get_csrf_token, csrf_input_tag, csrf_meta_tag
+from services.dashboard.image_pipeline import image_variant_url
+from services.dashboard.image_resize_cache import image_resized_url
+from server.utils.static_assets import asset_url
 
 
 def global_context_processor(request: Request) -> dict:
@@ -12,4 +15,7 @@ def global_context_processor(request: Request) -> dict:
         "csrf_token": get_csrf_token(request),
         "csrf_input": csrf_input_tag(request),
         "csrf_meta": csrf_meta_tag(request),
+        "image_variant": image_variant_url,
+        "image_resized": image_resized_url,
+        "asset_url": asset_url,
     }
\ No newline at end of file
@@ -130,12 +130,17 @@ class DashboardConfig(BaseModel):
     # UI Settings
     items_per_page: int = 20
     max_items_per_page: int = 100
+    estimate_list_totals: bool = True  # Total estimat (pg_class.reltuples / count cache-uit)
+    exact_count_threshold: int = 10000  # Sub acest număr de rânduri se face count(*) exact
+    count_cache_seconds: int = 30
     enable_dark_mode: bool = False
     default_language: str = "ro"
 
     # Paths (relative to project root)
     static_path: str = "static/webapp"
     templates_path: str = "dashboard/templates"
+    static_build_dir: str = "cache/static"  # Variante .br / .gz ale asset-urilor cu amprentă
+    static_precompress: bool = True
 
     # Image storage paths
     image_paths: Dict[str, str] = {
@@ -146,12 +151,48 @@ class DashboardConfig(BaseModel):
         "vendor": "static/webapp/img/vendor"
     }
 
+    # Variante redimensionate generate la upload (thumbs/ lângă original)
+    image_variant_format: str = "webp"  # webp | jpeg
+    image_variant_quality: int = 80
+
+    # Redimensionare la cerere: /img/{w}x{h}/{path} (cache LRU pe disc)
+    image_resize_sizes: List[str] = ["160x160", "320x320", "480x480", "800x800", "1200x1200"]
+    image_resize_cache_dir: str = "cache/img"
+    image_resize_cache_mb: int = 512
+
+    # PDF (ReportLab) - randare în procese separate
+    pdf_render_workers: int = 2
+    pdf_render_max_concurrent: int = 2  # Peste numărul de worker-i job-urile așteaptă în coadă
+    pdf_render_timeout_seconds: int = 60
+    pdf_batch_max_invoices: int = 500  # Limită pentru descărcarea ZIP în lot
+    pdf_cleanup_interval_minutes: int = 60  # Curățarea PDF-urilor orfane în fundal (0 = oprit)
+    pdf_cleanup_sweep_dirs: int = 2  # Directoare an/lună nemarcate verificate la fiecare rulare
+
+    # WebSocket - coadă de trimitere per conexiune
+    ws_send_queue_size: int = 100
+    ws_send_timeout_seconds: float = 10  # Peste acest timp conexiunea e considerată moartă
+    ws_slow_consumer_policy: str = "drop_oldest"  # drop_oldest | drop_newest | close
+    ws_pubsub_backend: str = "memory"  # memory | postgres (LISTEN/NOTIFY, pentru mai mulți worker-i)
+    ws_pubsub_channel: str = "dashboard_notifications"
+
     # Statistics refresh
     stats_cache_minutes: int = 5
+    sales_rollup_refresh_seconds: int = 60  # Reîmprospătare daily_sales_rollup în fundal (0 = oprit)
+
+    # Cache prețuri catalog (per proces; ceilalți worker-i văd modificările după TTL)
+    price_cache_seconds: int = 60
+    price_cache_preload: bool = True  # Încarcă tot catalogul la pornire
 
     # Activity tracking
     track_user_activity: bool = True
     activity_retention_days: int = 30
+    activity_retention_action: str = "drop"  # drop | detach (partiția expirată rămâne tabel separat, pentru arhivare)
+    activity_partition_months_ahead: int = 2  # Partiții lunare create în avans
+    activity_partition_check_hours: int = 12
+    activity_write_behind: bool = True  # track_interaction pune evenimentele într-un buffer, scrise în lot
+    activity_flush_interval_ms: int = 500
+    activity_flush_batch_size: int = 500  # Flush imediat la atâtea evenimente
+    activity_buffer_max_events: int = 20000  # Peste limită evenimentele noi se pierd (analytics, best effort)
 
 
 # Default config instance
@@ -662,17 +662,42 @@ async def pagination_params(
         page: int = 1,
         per_page: int = 20,
         sort_by: Optional[str] = None,
-        sort_desc: bool = True
+        sort_desc: bool = True,
+        cursor: Optional[str] = None,
+        estimate_total: Optional[bool] = None
 ) -> dict:
     """
     Parametri comuni pentru paginare.
+
+    Cu `cursor` (emis de server.dashboard.utils.pagination) lista trece în
+    modul keyset: pagina următoare se citește după (sort_key, id), fără OFFSET.
+    `estimate_total` implicit din config (estimate_list_totals).
     """
+    from .config import default_config
+    from .utils.pagination import decode_cursor, InvalidCursor, MODE_KEYSET, MODE_OFFSET
+
+    decoded = None
+    if cursor:
+        try:
+            decoded = decode_cursor(cursor)
+        except InvalidCursor:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Cursor de paginare invalid"
+            )
+
+    page = max(1, page)
+    per_page = min(default_config.max_items_per_page, max(1, per_page))
+
     return {
-        "page": max(1, page),
-        "per_page": min(100, max(1, per_page)),
+        "page": page,
+        "per_page": per_page,
         "sort_by": sort_by,
         "sort_desc": sort_desc,
-        "offset": (max(1, page) - 1) * min(100, max(1, per_page))
+        "offset": (page - 1) * per_page,
+        "mode": MODE_KEYSET if decoded else MODE_OFFSET,
+        "cursor": decoded,
+        "estimate_total": default_config.estimate_list_totals if estimate_total is None else estimate_total
     }
 
 
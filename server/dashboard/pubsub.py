@@ -0,0 +1,194 @@
+# server/dashboard/pubsub.py
+"""
+Backend pub/sub pentru notificările WebSocket.
+
+ConnectionManager publică fiecare mesaj aici, iar backend-ul îl livrează
+înapoi (on_message) în fiecare proces abonat - inclusiv cel care l-a trimis:
+- memory: același proces (un singur worker uvicorn)
+- postgres: LISTEN/NOTIFY pe engine-ul asyncpg existent - funcționează între
+  worker-i și între servere, fără infrastructură în plus
+
+Mesajul e un string "<țintă>|<payload JSON>" (țintă = "*" sau staff_id),
+deja serializat - nu se mai parsează / reserializează la livrare.
+"""
+from __future__ import annotations
+import asyncio
+import logging
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Livrarea locală doar pune mesajul în cozile conexiunilor - sincronă
+MessageHandler = Callable[[str], None]
+
+# NOTIFY acceptă payload-uri sub 8000 de octeți
+NOTIFY_MAX_BYTES = 7999
+
+
+class PubSubBackend:
+    """Interfața comună."""
+
+    def __init__(self):
+        self.on_message: Optional[MessageHandler] = None
+
+    async def start(self, on_message: MessageHandler) -> None:
+        self.on_message = on_message
+
+    async def stop(self) -> None:
+        pass
+
+    async def publish(self, message: str) -> None:
+        raise NotImplementedError
+
+    def metrics(self) -> dict:
+        return {"backend": self.name}
+
+    @property
+    def name(self) -> str:
+        return "base"
+
+
+class InMemoryPubSub(PubSubBackend):
+    """Livrare locală, în procesul curent."""
+
+    @property
+    def name(self) -> str:
+        return "memory"
+
+    async def publish(self, message: str) -> None:
+        if self.on_message is not None:
+            self.on_message(message)
+
+
+class PostgresPubSub(PubSubBackend):
+    """
+    LISTEN/NOTIFY PostgreSQL.
+
+    Ascultarea ține o conexiune dedicată din pool-ul engine-ului (reconectare
+    automată cu backoff). Publicarea folosește o conexiune obișnuită din pool.
+    Cât timp ascultarea nu e activă mesajele se livrează și local, ca
+    procesul curent să nu le piardă.
+    """
+
+    RECONNECT_MIN_SECONDS = 1
+    RECONNECT_MAX_SECONDS = 30
+
+    def __init__(self, channel: str):
+        super().__init__()
+        self.channel = channel
+        self._task: Optional[asyncio.Task] = None
+        self._listening = False
+
+        # Metrici
+        self.published = 0
+        self.received = 0
+        self.reconnects = 0
+        self.oversized = 0
+
+    @property
+    def name(self) -> str:
+        return "postgres"
+
+    async def start(self, on_message: MessageHandler) -> None:
+        await super().start(on_message)
+        if self._task is None:
+            self._task = asyncio.create_task(self._listen_loop(), name="ws-pubsub-listen")
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        self._listening = False
+
+    async def publish(self, message: str) -> None:
+        if len(message.encode("utf-8")) > NOTIFY_MAX_BYTES:
+            # Prea mare pentru NOTIFY - ajunge doar la conexiunile locale
+            self.oversized += 1
+            logger.warning(f"Notification too large for NOTIFY ({len(message)} chars), delivered locally only")
+            if self.on_message is not None:
+                self.on_message(message)
+            return
+
+        from sqlalchemy import text
+        from cfg import engine
+
+        async with engine.connect() as connection:
+            await connection.execute(
+                text("SELECT pg_notify(:channel, :payload)"),
+                {"channel": self.channel, "payload": message}
+            )
+            await connection.commit()
+        self.published += 1
+
+        if not self._listening and self.on_message is not None:
+            self.on_message(message)
+
+    def metrics(self) -> dict:
+        return {
+            "backend": self.name,
+            "channel": self.channel,
+            "listening": self._listening,
+            "published": self.published,
+            "received": self.received,
+            "reconnects": self.reconnects,
+            "oversized": self.oversized
+        }
+
+    async def _listen_loop(self) -> None:
+        from sqlalchemy.util import greenlet_spawn
+        from cfg import engine
+
+        delay = self.RECONNECT_MIN_SECONDS
+
+        while True:
+            raw_connection = None
+            try:
+                raw_connection = await engine.raw_connection()
+                driver_connection = raw_connection.driver_connection
+                terminated = asyncio.Event()
+
+                def on_notify(_connection, _pid, _channel, payload):
+                    self.received += 1
+                    self._dispatch(payload)
+
+                driver_connection.add_termination_listener(lambda _connection: terminated.set())
+                await driver_connection.add_listener(self.channel, on_notify)
+
+                self._listening = True
+                delay = self.RECONNECT_MIN_SECONDS
+                logger.info(f"Listening on PostgreSQL channel '{self.channel}'")
+
+                await terminated.wait()
+                logger.warning("PostgreSQL LISTEN connection lost")
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"PostgreSQL LISTEN failed: {type(e).__name__}: {e}")
+
+            finally:
+                self._listening = False
+                if raw_connection is not None:
+                    # Conexiunea nu se mai întoarce în pool cu LISTEN activ
+                    try:
+                        await greenlet_spawn(raw_connection.invalidate)
+                    except Exception:
+                        pass
+
+            self.reconnects += 1
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.RECONNECT_MAX_SECONDS)
+
+    def _dispatch(self, payload: str) -> None:
+        try:
+            if self.on_message is not None:
+                self.on_message(payload)
+        except Exception as e:
+            logger.error(f"Notification dispatch failed: {e}")
+
+
+def create_backend(name: str, channel: str) -> PubSubBackend:
+    if name == "postgres":
+        return PostgresPubSub(channel)
+    return InMemoryPubSub()
@@ -4,11 +4,11 @@ Router principal pentru Dashboard Module.
 """
 from fastapi import APIRouter, Depends, Request, WebSocket
 from fastapi.responses import HTMLResponse, RedirectResponse
-from fastapi.staticfiles import StaticFiles
 from typing import Optional
 
 
 
+from server.utils.static_assets import static_assets
 from .config import DashboardConfig, default_config
 from .dependencies import get_current_staff, require_role, get_current_vendor_staff, get_current_user
 from .routers import (
@@ -280,7 +280,8 @@ def setup_dashboard(app, config: Optional[DashboardConfig] = None):
     # Mount static files for dashboard
     app.mount(
         "/dashboard-static",
-        StaticFiles(directory="server/dashboard/static", html=True),
+        # PDF-urile generate nu primesc amprentă (se schimbă la runtime)
+        static_assets.static_files("/dashboard-static", "server/dashboard/static", exclude=["PDF"], html=True),
         name="dashboard_static"
     )
 
@@ -17,6 +17,7 @@ from models import AuthUserType, VendorStaff
 from models.user import Staff
 from services.models.staff_services import StaffService
 from server.dashboard.utils.timezone import datetime_local, time_only, date_only
+from server.utils.static_assets import asset_url
 from server.dashboard.dependencies import get_current_user_optional # get_current_staff_optional
 from services.models.vendor_staff_service import VendorStaffService
 
@@ -26,6 +27,7 @@ templates = Jinja2Templates(directory="server/dashboard/templates")
 templates.env.filters['datetime_local'] = datetime_local
 templates.env.filters['time_only'] = time_only
 templates.env.filters['date_only'] = date_only
+templates.env.globals['asset_url'] = asset_url
 
 
 # @auth_router.get("/login", response_class=HTMLResponse)
@@ -8,7 +8,7 @@ from fastapi import APIRouter, Request, Depends, Query, HTTPException
 from fastapi.responses import HTMLResponse, JSONResponse
 from fastapi.templating import Jinja2Templates
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_
+from sqlalchemy import select, func, and_, or_, literal_column
 from datetime import datetime, timedelta
 from typing import Optional
 
@@ -23,6 +23,9 @@ from models import (
 )
 from server.dashboard.dependencies import get_current_staff, get_template_context
 from services.models.activity_services import ActivityService
+from services.dashboard.sales_rollup_service import SalesRollupService, sales_rollup_scheduler
+from services.dashboard.timeseries_service import TimeSeriesService, SeriesSpec, BUCKET_DAY
+from services.dashboard.export_service import ExportService, ExportColumn
 
 analytics_router = APIRouter()
 
@@ -264,58 +267,39 @@ async def analytics_overview(
             'is_processed': request_obj.is_processed
         })
 
-    # 6. Chart data - Sessions over time
-    chart_labels = []
-    sessions_data = []
-    pageviews_data = []
-    orders_data = []
-
-    for i in range(days):
-        date = datetime.utcnow() - timedelta(days=days - i - 1)
-        date_start = date.replace(hour=0, minute=0, second=0)
-        date_end = date_start + timedelta(days=1)
-
-        # Sessions for this day
-        day_sessions = await db.execute(
-            select(func.count(UserActivity.id))
-            .where(
-                and_(
-                    UserActivity.session_start >= date_start,
-                    UserActivity.session_start < date_end
-                )
+    # 6. Chart data - Sessions over time (un GROUP BY per tabel, nu 3 query-uri pe zi)
+    buckets = TimeSeriesService.bucket_starts(datetime.utcnow(), days, BUCKET_DAY)
+    series = await TimeSeriesService.fetch_many(
+        db,
+        [
+            SeriesSpec(
+                time_column=UserActivity.session_start,
+                aggregates={
+                    'sessions': func.count(UserActivity.id),
+                    'pageviews': func.sum(UserActivity.page_views)
+                }
+            ),
+            SeriesSpec(
+                time_column=Order.created_at,
+                aggregates={'orders': func.count(Order.id)}
             )
-        )
-
-        # Page views for this day
-        day_pageviews = await db.execute(
-            select(func.sum(UserActivity.page_views))
-            .where(
-                and_(
-                    UserActivity.session_start >= date_start,
-                    UserActivity.session_start < date_end
-                )
-            )
-        )
-
-        # Orders for this day
-        day_orders = await db.execute(
-            select(func.count(Order.id))
-            .where(
-                and_(
-                    Order.created_at >= date_start,
-                    Order.created_at < date_end
-                )
-            )
-        )
+        ],
+        buckets,
+        BUCKET_DAY
+    )
 
-        chart_labels.append(date.strftime('%d/%m'))
-        sessions_data.append(day_sessions.scalar() or 0)
-        pageviews_data.append(day_pageviews.scalar() or 0)
-        orders_data.append(day_orders.scalar() or 0)
+    chart_labels = [bucket_start.strftime('%d/%m') for bucket_start in buckets]
+    sessions_data = series['sessions']
+    pageviews_data = series['pageviews']
+    orders_data = series['orders']
 
     # 7. Referrer sources distribution - Empty for now
     referrer_sources = {}
 
+    # Comenzi în perioadă - din rollup-ul zilnic (cu comenzile scrise în procesul curent)
+    await sales_rollup_scheduler.refresh_pending()
+    total_orders = await SalesRollupService.get_orders_count(db, since.date())
+
     # Metrics summary
     metrics = {
         'total_users': total_users.scalar() or 0,
@@ -324,10 +308,7 @@ async def analytics_overview(
         'conversion_rate': round(conversion_rate, 1),
         'bounce_rate': round(bounce_rate, 1),
         'total_sessions': total_count,
-        'total_orders': await db.scalar(
-            select(func.count(Order.id))
-            .where(Order.created_at >= since)
-        ) or 0
+        'total_orders': total_orders
     }
 
     context.update({
@@ -557,12 +538,188 @@ async def get_analytics_stats(
 
 @analytics_router.get("/export")
 async def export_analytics(
-        db: AsyncSession = Depends(get_db),
         staff=Depends(get_current_staff),
         report_type: str = Query("overview"),
-        days: int = Query(30),
+        days: int = Query(30, ge=1, le=365),
+        category_id: Optional[int] = Query(None),
         format: str = Query("csv")
 ):
-    """Export date analytics în CSV/Excel."""
-    # TODO: Implementare export
-    return {"message": "Export functionality coming soon"}
\ No newline at end of file
+    """Export date analytics în CSV/Excel (streaming)."""
+    ExportService.check_allowed("analytics")
+
+    since = TimeSeriesService.truncate(datetime.utcnow() - timedelta(days=days - 1), BUCKET_DAY)
+
+    if report_type == "overview":
+        query, columns = _overview_export_query(since)
+    elif report_type == "products":
+        query, columns = _products_export_query(since, category_id)
+    else:
+        raise HTTPException(status_code=400, detail="Tip de raport necunoscut")
+
+    return ExportService.stream(query, columns, f"analytics_{report_type}_{days}d", format)
+
+
+def _utc_day(column):
+    """Ziua (UTC) - la fel ca TimeSeriesService, independent de TimeZone-ul sesiunii."""
+    if getattr(column.type, 'timezone', False):
+        column = func.timezone('UTC', column)
+    return func.date_trunc("day", column).label("day")
+
+
+def _overview_export_query(since: datetime):
+    """Un rând per zi: sesiuni, clienți noi, comenzi - câte un GROUP BY per tabel."""
+    day_series = select(
+        func.generate_series(
+            since,
+            TimeSeriesService.truncate(datetime.utcnow(), BUCKET_DAY),
+            literal_column("interval '1 day'")
+        ).label("day")
+    ).subquery("days")
+
+    session_day = _utc_day(UserActivity.created_at)
+    sessions = (
+        select(
+            session_day,
+            func.count(UserActivity.id).label("sessions"),
+            func.sum(UserActivity.page_views).label("page_views"),
+            func.count(UserActivity.id).filter(UserActivity.page_views <= 1).label("bounces")
+        )
+        .where(UserActivity.created_at >= since)
+        .group_by(session_day)
+        .subquery("sessions")
+    )
+
+    client_day = _utc_day(Client.created_at)
+    new_clients = (
+        select(
+            client_day,
+            func.count(Client.id).label("new_clients"),
+            func.count(Client.id).filter(Client.status != UserStatus.ANONIM).label("registered")
+        )
+        .where(Client.created_at >= since)
+        .group_by(client_day)
+        .subquery("new_clients")
+    )
+
+    order_day = _utc_day(Order.created_at)
+    orders = (
+        select(
+            order_day,
+            func.count(Order.id).label("orders"),
+            func.sum(Order.total_amount).filter(
+                Order.status.in_([OrderStatus.PROCESSING, OrderStatus.COMPLETED])
+            ).label("revenue")
+        )
+        .where(Order.created_at >= since)
+        .group_by(order_day)
+        .subquery("orders")
+    )
+
+    query = (
+        select(
+            day_series.c.day,
+            func.coalesce(sessions.c.sessions, 0).label("sessions"),
+            func.coalesce(sessions.c.page_views, 0).label("page_views"),
+            func.coalesce(sessions.c.bounces, 0).label("bounces"),
+            func.coalesce(new_clients.c.new_clients, 0).label("new_clients"),
+            func.coalesce(new_clients.c.registered, 0).label("registered"),
+            func.coalesce(orders.c.orders, 0).label("orders"),
+            func.coalesce(orders.c.revenue, 0).label("revenue")
+        )
+        .select_from(day_series)
+        .outerjoin(sessions, sessions.c.day == day_series.c.day)
+        .outerjoin(new_clients, new_clients.c.day == day_series.c.day)
+        .outerjoin(orders, orders.c.day == day_series.c.day)
+        .order_by(day_series.c.day)
+    )
+
+    columns = [
+        # Zilele sunt în UTC - nu se convertesc în ora locală
+        ExportColumn("day", "Data", lambda value: value.date()),
+        ExportColumn("sessions", "Sesiuni"),
+        ExportColumn("page_views", "Vizualizări pagini"),
+        ExportColumn("bounces", "Sesiuni bounce"),
+        ExportColumn("new_clients", "Clienți noi"),
+        ExportColumn("registered", "Înregistrați"),
+        ExportColumn("orders", "Comenzi"),
+        ExportColumn("revenue", "Venituri"),
+    ]
+    return query, columns
+
+
+def _products_export_query(since: datetime, category_id: Optional[int]):
+    """Un rând per produs cu activitate în perioadă (fără query per produs)."""
+    interactions = (
+        select(
+            UserInteraction.target_id.label("product_id"),
+            func.count(UserInteraction.id).filter(
+                UserInteraction.action_type == ActionType.VIEW
+            ).label("views"),
+            func.count(UserInteraction.id).filter(
+                UserInteraction.action_type == ActionType.ADD_TO_CART
+            ).label("cart_adds")
+        )
+        .where(
+            and_(
+                UserInteraction.target_type == TargetType.PRODUCT,
+                UserInteraction.created_at >= since
+            )
+        )
+        .group_by(UserInteraction.target_id)
+        .subquery("interactions")
+    )
+
+    requests = (
+        select(
+            UserRequest.product_id,
+            func.count(UserRequest.id).label("requests")
+        )
+        .where(
+            and_(
+                UserRequest.product_id.isnot(None),
+                UserRequest.created_at >= since
+            )
+        )
+        .group_by(UserRequest.product_id)
+        .subquery("requests")
+    )
+
+    views = func.coalesce(interactions.c.views, 0)
+    cart_adds = func.coalesce(interactions.c.cart_adds, 0)
+
+    query = (
+        select(
+            Product.id,
+            Product.sku,
+            Product.name,
+            Category.name.label("category"),
+            views.label("views"),
+            cart_adds.label("cart_adds"),
+            func.round(cart_adds * 100.0 / func.nullif(views, 0), 1).label("conversion"),
+            func.coalesce(requests.c.requests, 0).label("requests")
+        )
+        .join(Category, Product.category_id == Category.id)
+        .outerjoin(interactions, interactions.c.product_id == Product.id)
+        .outerjoin(requests, requests.c.product_id == Product.id)
+        .where(
+            or_(
+                interactions.c.product_id.isnot(None),
+                requests.c.product_id.isnot(None)
+            )
+        )
+        .order_by(views.desc(), Product.id)
+    )
+    if category_id:
+        query = query.where(Product.category_id == category_id)
+
+    columns = [
+        ExportColumn("id", "ID"),
+        ExportColumn("sku", "SKU"),
+        ExportColumn("name", "Produs"),
+        ExportColumn("category", "Categorie"),
+        ExportColumn("views", "Vizualizări"),
+        ExportColumn("cart_adds", "Adăugări în coș"),
+        ExportColumn("conversion", "Conversie (%)"),
+        ExportColumn("requests", "Cereri"),
+    ]
+    return query, columns
@@ -15,16 +15,20 @@ from fastapi import APIRouter, Depends, Request, HTTPException, Query, Form
 from fastapi.responses import HTMLResponse, RedirectResponse, JSONResponse
 from fastapi.templating import Jinja2Templates
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_, or_, text
+from sqlalchemy import select, func, and_, text
 from sqlalchemy.orm import selectinload
 from jinja2 import Environment
 
 from cfg import get_db
 from models import Cart, CartItem, Client, Product, Order, Category, OrderStatus
-from server.dashboard.dependencies import get_current_staff, get_template_context, PermissionChecker
+from server.dashboard.dependencies import get_current_staff, get_template_context, PermissionChecker, pagination_params
 from server.dashboard.utils.timezone import datetime_local, time_only, date_only, days_ago
+from server.dashboard.utils.related_counts import count_related
+from server.dashboard.utils.pagination import paginate
 from services.models.cart_service import CartService
 from services.models.order_service import OrderService
+from services.models.product_service import ProductService
+from services.dashboard.search_service import SearchService, PRODUCT_SEARCH, CLIENT_SEARCH
 from server.dashboard.utils import CART_ITEMS_ROWS
 
 
@@ -43,11 +47,10 @@ templates.env.filters['days_ago'] = days_ago
 @cart_router.get("/", response_class=HTMLResponse)
 async def cart_list(
         request: Request,
-        page: int = Query(1, ge=1),
-        per_page: int = Query(20, ge=1, le=100),
         search: Optional[str] = None,
         days_old: Optional[int] = None,
         client_id: Optional[int] = Query(None),  # ADĂUGAT: pentru filtrare după client
+        pagination: dict = Depends(pagination_params),
         staff=Depends(get_current_staff),
         db: AsyncSession = Depends(get_db)
 ):
@@ -66,13 +69,7 @@ async def cart_list(
         filters.append(Cart.client_id == client_id)
 
     if search:
-        query = query.join(Client).where(
-            or_(
-                Client.first_name.ilike(f"%{search}%"),
-                Client.last_name.ilike(f"%{search}%"),
-                Client.email.ilike(f"%{search}%")
-            )
-        )
+        query = query.join(Client).where(SearchService.condition(CLIENT_SEARCH, search))
 
     if days_old:
         cutoff_date = datetime.utcnow() - timedelta(days=days_old)
@@ -96,13 +93,7 @@ async def cart_list(
         total_query = total_query.where(Cart.client_id == client_id)
 
     if search:
-        total_query = total_query.join(Client).where(
-            or_(
-                Client.first_name.ilike(f"%{search}%"),
-                Client.last_name.ilike(f"%{search}%"),
-                Client.email.ilike(f"%{search}%")
-            )
-        )
+        total_query = total_query.join(Client).where(SearchService.condition(CLIENT_SEARCH, search))
     if filters and not client_id:  # Evită dublarea filtrului client_id
         total_query = total_query.where(and_(*filters))
     elif filters and client_id:  # Aplică doar filtrele non-client_id
@@ -110,15 +101,13 @@ async def cart_list(
         if non_client_filters:
             total_query = total_query.where(and_(*non_client_filters))
 
-    total_result = await db.execute(total_query)
-    total = total_result.scalar() or 0
-
-    # Sortare și paginare
-    offset = (page - 1) * per_page
-    query = query.order_by(Cart.updated_at.desc()).offset(offset).limit(per_page)
-
-    result = await db.execute(query)
-    carts = result.scalars().all()
+    # Sortare și paginare (keyset când există cursor)
+    page_result = await paginate(
+        db, query, total_query, pagination,
+        sort_column=Cart.updated_at, id_column=Cart.id
+    )
+    carts = page_result.items
+    total = page_result.total
 
     # Calculează totale pentru fiecare coș
     cart_totals = {}
@@ -177,7 +166,7 @@ async def cart_list(
     total_carts_count = total_carts_result.scalar() or 0
     abandoned_count = abandoned_carts.scalar() or 0
 
-    total_pages = (total + per_page - 1) // per_page
+    total_pages = page_result.total_pages
 
     # ADĂUGAT: Logică navigare pentru întoarcerea la client
     back_url = None
@@ -194,10 +183,12 @@ async def cart_list(
         "page_title": page_title,
         "carts": carts,
         "cart_totals": cart_totals,
-        "page": page,
-        "per_page": per_page,
+        "page": page_result.page,
+        "per_page": page_result.per_page,
         "total": total,
+        "total_is_estimate": page_result.total_is_estimate,
         "total_pages": int(total_pages),
+        "next_page_url": page_result.next_url(request),
         "total_carts": total_carts_count,
         "abandoned_carts": abandoned_count,
         "total_value": total_value,
@@ -239,13 +230,10 @@ async def cart_create_form(
     )
     clients = clients_result.scalars().all()
 
-    # Get order counts for each client
-    client_orders_count = {}
-    for c in clients:
-        orders_count = await db.execute(
-            select(func.count(Order.id)).where(Order.client_id == c.id)
-        )
-        client_orders_count[c.id] = orders_count.scalar() or 0
+    # Get order counts for all clients - un singur query
+    client_orders_count = await count_related(
+        db, Order.client_id, [c.id for c in clients]
+    )
 
     context = await get_template_context(request, staff)
     context.update({
@@ -323,12 +311,7 @@ async def select_products(
         products_query = products_query.where(Product.category_id == category_id)
 
     if search:
-        products_query = products_query.where(
-            or_(
-                Product.name.ilike(f"%{search}%"),
-                Product.sku.ilike(f"%{search}%")
-            )
-        )
+        products_query = SearchService.apply(products_query, PRODUCT_SEARCH, search)
 
     products_result = await db.execute(products_query.limit(50))
     products = products_result.scalars().all()
@@ -397,6 +380,11 @@ async def create_cart_with_products(
         )
         client = client_result.scalar_one()
 
+        # Prețurile tuturor produselor selectate într-un singur query (add_item le ia din cache)
+        await ProductService.get_prices_for_user_status(
+            db, [product_id for product_id, _ in selected_products], client.status
+        )
+
         # Adaugă produsele în coș
         for product_id, quantity in selected_products:
             await CartService.add_item(
@@ -545,12 +533,7 @@ async def manage_cart(
     if category_id_int:
         products_query = products_query.where(Product.category_id == category_id_int)
     if search:
-        products_query = products_query.where(
-            or_(
-                Product.name.ilike(f"%{search}%"),
-                Product.sku.ilike(f"%{search}%")
-            )
-        )
+        products_query = SearchService.apply(products_query, PRODUCT_SEARCH, search)
     products_result = await db.execute(products_query.limit(50))
     products = products_result.scalars().all()
 
@@ -627,12 +610,7 @@ async def edit_cart(
         products_query = products_query.where(Product.category_id == category_id)
 
     if search:
-        products_query = products_query.where(
-            or_(
-                Product.name.ilike(f"%{search}%"),
-                Product.sku.ilike(f"%{search}%")
-            )
-        )
+        products_query = SearchService.apply(products_query, PRODUCT_SEARCH, search)
 
     products_result = await db.execute(products_query.limit(50))
     products = products_result.scalars().all()
@@ -16,6 +16,7 @@ from cfg import get_db
 from models import Category, Product
 from server.dashboard.dependencies import get_current_staff, get_template_context, PermissionChecker
 from server.dashboard.utils.timezone import datetime_local, time_only, date_only
+from server.dashboard.utils.related_counts import count_related
 from services.models.category_services import CategoryService
 from services.dashboard.file_service import FileService
 
@@ -101,22 +102,10 @@ async def category_list(
     )
     total_active = active_categories.scalar() or 0
 
-    # Count products per category
-    category_products = {}
-    for cat in categories:
-        products_count = await db.execute(
-            select(func.count(Product.id))
-            .where(Product.category_id == cat.id)
-        )
-        category_products[cat.id] = products_count.scalar() or 0
-
-        # Count pentru subcategorii
-        for child in cat.children:
-            child_products = await db.execute(
-                select(func.count(Product.id))
-                .where(Product.category_id == child.id)
-            )
-            category_products[child.id] = child_products.scalar() or 0
+    # Count products per category (inclusiv subcategorii) - un singur query
+    category_ids = [cat.id for cat in categories]
+    category_ids += [child.id for cat in categories for child in cat.children]
+    category_products = await count_related(db, Product.category_id, category_ids)
 
     total_pages = (total + per_page - 1) // per_page
 
@@ -11,14 +11,18 @@ from fastapi import APIRouter, Depends, Request, Query, HTTPException, Form
 from fastapi.responses import HTMLResponse, RedirectResponse
 from fastapi.templating import Jinja2Templates
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_, or_
+from sqlalchemy import select, func, and_
 from sqlalchemy.orm import selectinload
 
 from cfg import get_db
 from models import Client, UserStatus, Order, UserRequest, OrderStatus
-from server.dashboard.dependencies import get_current_staff, get_template_context, PermissionChecker
+from server.dashboard.dependencies import get_current_staff, get_template_context, PermissionChecker, pagination_params
 from server.dashboard.utils.timezone import datetime_local, time_only, date_only
+from server.dashboard.utils.related_counts import load_related_counts
+from server.dashboard.utils.pagination import paginate
 from services.models.client_services import ClientService
+from services.dashboard.export_service import ExportService, ExportColumn
+from services.dashboard.search_service import SearchService, CLIENT_SEARCH
 
 client_router = APIRouter()
 templates = Jinja2Templates(directory="server/dashboard/templates/staf")
@@ -29,20 +33,40 @@ templates.env.filters['time_only'] = time_only
 templates.env.filters['date_only'] = date_only
 
 
+def _client_filters(status: Optional[str], search: Optional[str]) -> list:
+    """Condițiile WHERE pentru lista de clienți (folosite și la export)."""
+    filters = []
+
+    if status and status != "all":
+        filters.append(Client.status == UserStatus(status))
+
+    if search:
+        filters.append(SearchService.condition(CLIENT_SEARCH, search))
+
+    return filters
+
+
+def _client_sort_column(sort_by: Optional[str]):
+    if sort_by == "name":
+        return Client.first_name
+    if sort_by == "status":
+        return Client.status
+    return Client.created_at
+
+
 @client_router.get("/", response_class=HTMLResponse)
 async def client_list(
         request: Request,
-        page: int = Query(1, ge=1),
-        per_page: int = Query(20, ge=1, le=100),
         status: Optional[str] = None,
         search: Optional[str] = None,
         show_inactive: bool = Query(False),
-        sort_by: str = "created_at",
-        sort_desc: bool = True,
+        pagination: dict = Depends(pagination_params),
         staff=Depends(get_current_staff),
         db: AsyncSession = Depends(get_db)
 ):
-    """Listă clienți cu filtre și paginare."""
+    """Listă clienți cu filtre și paginare (offset sau keyset)."""
+    sort_by = pagination["sort_by"] or "created_at"
+    sort_desc = pagination["sort_desc"]
 
     # Query de bază
     # query = select(Client).where(Client.is_active == True)
@@ -58,19 +82,10 @@ async def client_list(
 
 
 
-    # Filtre
-    if status and status != "all":
-        query = query.where(Client.status == UserStatus(status))
-
-    if search:
-        search_filter = or_(
-            Client.first_name.ilike(f"%{search}%"),
-            Client.last_name.ilike(f"%{search}%"),
-            Client.email.ilike(f"%{search}%"),
-            Client.phone.ilike(f"%{search}%"),
-            Client.username.ilike(f"%{search}%")
-        )
-        query = query.where(search_filter)
+    # Filtre (aceleași și pentru export)
+    filters = _client_filters(status, search)
+    if filters:
+        query = query.where(and_(*filters))
 
     # Total pentru paginare
     if show_inactive:
@@ -78,50 +93,27 @@ async def client_list(
     else:
         total_query = select(func.count()).select_from(Client).where(Client.is_active == True)
 
-    if status and status != "all":
-        total_query = total_query.where(Client.status == UserStatus(status))
-    if search:
-        total_query = total_query.where(search_filter)
-
-    total_result = await db.execute(total_query)
-    total = total_result.scalar() or 0
+    if filters:
+        total_query = total_query.where(and_(*filters))
 
     # Sortare
-    if sort_by == "name":
-        order_by = Client.first_name
-    elif sort_by == "status":
-        order_by = Client.status
-    elif sort_by == "created_at":
-        order_by = Client.created_at
-    else:
-        order_by = Client.created_at
+    order_by = _client_sort_column(sort_by)
 
-    if sort_desc:
-        order_by = order_by.desc()
-
-    # Paginare
-    offset = (page - 1) * per_page
-    query = query.order_by(order_by).offset(offset).limit(per_page)
-
-    result = await db.execute(query)
-    clients = result.scalars().all()
-
-    # Statistici pentru fiecare client
-    client_stats = {}
-    for client in clients:
-        # Count orders
-        orders_count = await db.execute(
-            select(func.count(Order.id)).where(Order.client_id == client.id)
-        )
-        # Count requests
-        requests_count = await db.execute(
-            select(func.count(UserRequest.id)).where(UserRequest.client_id == client.id)
-        )
-
-        client_stats[client.id] = {
-            "orders": orders_count.scalar() or 0,
-            "requests": requests_count.scalar() or 0
-        }
+    # Paginare (keyset când există cursor) + total estimat pentru lista nefiltrată
+    page_result = await paginate(
+        db, query, total_query, pagination,
+        sort_column=order_by, id_column=Client.id,
+        table_name=Client.__tablename__ if show_inactive and not filters else None
+    )
+    clients = page_result.items
+    total = page_result.total
+
+    # Statistici pentru clienții din pagină - un query per relație
+    client_stats = await load_related_counts(
+        db,
+        [client.id for client in clients],
+        {"orders": Order.client_id, "requests": UserRequest.client_id}
+    )
 
     # Stats pentru cards
     stats = {
@@ -142,7 +134,7 @@ async def client_list(
     for status_row, count in status_counts:
         stats[status_row.value] = count
 
-    total_pages = (total + per_page - 1) // per_page
+    total_pages = page_result.total_pages
 
     context = await get_template_context(request, staff)
     context.update({
@@ -150,10 +142,12 @@ async def client_list(
         "clients": clients,
         "client_stats": client_stats,
         "stats": stats,
-        "page": page,
-        "per_page": per_page,
+        "page": page_result.page,
+        "per_page": page_result.per_page,
         "total": total,
+        "total_is_estimate": page_result.total_is_estimate,
         "total_pages": total_pages,
+        "next_page_url": page_result.next_url(request),
         "status_filter": status,
         "search_query": search,
         "show_inactive": show_inactive,
@@ -166,6 +160,54 @@ async def client_list(
 
 
 
+@client_router.get("/export")
+async def client_export(
+        status: Optional[str] = None,
+        search: Optional[str] = None,
+        sort_by: Optional[str] = Query(None),
+        sort_desc: bool = Query(True),
+        format: str = Query("csv"),
+        staff=Depends(PermissionChecker("read", "client"))
+):
+    """Export clienți (CSV / XLSX) cu filtrele din listă."""
+    ExportService.check_allowed("client")
+
+    query = select(
+        Client.id,
+        Client.first_name,
+        Client.last_name,
+        Client.username,
+        Client.email,
+        Client.phone,
+        Client.status,
+        Client.is_active,
+        Client.created_at
+    )
+
+    filters = _client_filters(status, search)
+    if filters:
+        query = query.where(and_(*filters))
+
+    order_by = _client_sort_column(sort_by)
+    if sort_desc:
+        query = query.order_by(order_by.desc(), Client.id.desc())
+    else:
+        query = query.order_by(order_by.asc(), Client.id.asc())
+
+    columns = [
+        ExportColumn("id", "ID"),
+        ExportColumn("first_name", "Prenume"),
+        ExportColumn("last_name", "Nume"),
+        ExportColumn("username", "Username"),
+        ExportColumn("email", "Email"),
+        ExportColumn("phone", "Telefon"),
+        ExportColumn("status", "Status"),
+        ExportColumn("is_active", "Activ", lambda value: "Da" if value else "Nu"),
+        ExportColumn("created_at", "Înregistrat"),
+    ]
+    return ExportService.stream(query, columns, "clienti", format)
+
+
 @client_router.get("/create", response_class=HTMLResponse)
 async def client_create_form(
         request: Request,
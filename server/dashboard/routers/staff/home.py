@@ -19,6 +19,8 @@ from server.dashboard.dependencies import get_current_staff, get_template_contex
 from server.dashboard.routers.auth import create_access_token
 from server.dashboard.utils.timezone import datetime_local, time_only, date_only, datetime_iso
 from services.dashboard.stats_service import DashboardStatsService
+from services.dashboard.stats_cache import stats_cache
+from services.dashboard.price_cache import price_cache
 from server.dashboard.websocket import notification_manager, get_current_staff_ws
 
 home_router = APIRouter()
@@ -258,7 +260,7 @@ async def websocket_notifications(
             while True:
                 data = await websocket.receive_text()
                 if data == "ping":
-                    await websocket.send_text("pong")
+                    await notification_manager.send_text(websocket, staff_id, "pong")
 
         except WebSocketDisconnect:
             print(f"WS Disconnected: Staff ID {staff_id}")
@@ -309,6 +311,36 @@ async def get_db_stats(
     }
 
 
+@home_router.get("/api/stats-cache")
+async def get_stats_cache_info(
+        staff=Depends(get_current_staff),
+        _=Depends(require_role(["super_admin"]))
+):
+    """Returnează contoarele cache-ului de statistici (hit/miss/evictions)."""
+    return stats_cache.get_stats()
+
+
+@home_router.get("/api/ws-stats")
+async def get_ws_stats(
+        staff=Depends(get_current_staff),
+        _=Depends(require_role(["super_admin"]))
+):
+    """Returnează conexiunile WebSocket și contoarele de livrare (cozi, drop-uri, latență)."""
+    return {
+        "connections": notification_manager.get_connections_count(),
+        "delivery": notification_manager.metrics()
+    }
+
+
+@home_router.get("/api/price-cache")
+async def get_price_cache_info(
+        staff=Depends(get_current_staff),
+        _=Depends(require_role(["super_admin"]))
+):
+    """Returnează contoarele cache-ului de prețuri (hit/miss/queries)."""
+    return price_cache.get_stats()
+
+
 @home_router.get("/api/ws-token")
 async def get_ws_token(
         staff=Depends(get_current_staff)
@@ -13,7 +13,6 @@ logger = logging.getLogger("uvicorn.error")
 from fastapi import APIRouter, Depends, HTTPException, status, Request, UploadFile, File, Form
 from fastapi.responses import HTMLResponse, JSONResponse
 from fastapi.templating import Jinja2Templates
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Dict, Optional
 import pandas as pd
@@ -22,11 +21,14 @@ from datetime import datetime
 from pathlib import Path
 
 from cfg import get_db
-from models import Staff, StaffRole, Product, ProductPrice, PriceType, Category
+from models import Staff, StaffRole
 from server.dashboard.dependencies import get_current_staff, get_template_context, PermissionChecker
 from server.dashboard.utils.timezone import datetime_local
 from services.models.product_service import ProductService
 from services.models.category_services import CategoryService
+from services.dashboard.product_import_service import ProductImportService
+from services.dashboard.import_jobs import import_job_runner
+from server.dashboard.config import default_config
 
 import_router = APIRouter()
 
@@ -161,123 +163,13 @@ async def preview_import(
         contents = await file.read()
         df = pd.read_excel(io.BytesIO(contents))
 
-        # Validare și procesare
-        products = []
-        errors = []
-
-        # Mapare coloane Excel -> câmpuri sistem
-        column_mapping = {
-            'SKU': 'sku',
-            'Nume': 'name',
-            'Descriere': 'description',
-            'Descriere Scurtă': 'short_description',
-            'ID Categorie': 'category_id',
-            'Preț Anonim': 'price_anonim',
-            'Preț User': 'price_user',
-            'Preț Instalator': 'price_instalator',
-            'Preț Pro': 'price_pro',
-            'Meta Title': 'meta_title',
-            'Meta Description': 'meta_description',
-            'În Stoc': 'in_stock',
-            'Cantitate': 'stock_quantity'
-        }
-
-        # Verifică categoriile valide
-        valid_category_ids = set()
-        if import_type == 'general':
-            # Obține toate ID-urile de categorii din Excel
-            category_ids = []
-            if 'ID Categorie' in df.columns:
-                category_ids = df['ID Categorie'].dropna().unique().tolist()
-                # Convertește la int
-                category_ids = [int(float(x)) for x in category_ids if pd.notna(x)]
-
-                result = await db.execute(
-                    select(Category.id).where(Category.id.in_(category_ids))
-                )
-                valid_category_ids = set(row[0] for row in result)
-
-        for idx, row in df.iterrows():
-            product_data = {
-                'row': idx + 2,  # Excel row number
-                'errors': [],
-                'warnings': []
-            }
-
-            # Extrage datele
-            for excel_col, system_field in column_mapping.items():
-                if excel_col in df.columns:
-                    value = row.get(excel_col)
-                    if pd.notna(value):
-                        # Conversii specifice pe tip de câmp
-                        if system_field == 'category_id':
-                            product_data[system_field] = int(float(value))
-                        elif system_field in ['price_anonim', 'price_user', 'price_instalator', 'price_pro']:
-                            product_data[system_field] = float(value)
-                        elif system_field == 'stock_quantity':
-                            product_data[system_field] = int(float(value))
-                        elif system_field == 'in_stock':
-                            # Convertește DA/NU în boolean
-                            if isinstance(value, str):
-                                product_data[system_field] = value.upper() in ['DA', 'YES', 'TRUE', '1']
-                            else:
-                                product_data[system_field] = bool(value)
-                        else:
-                            product_data[system_field] = str(value) if not isinstance(value, str) else value
-
-            # Pentru import per categorie
-            if import_type == 'category' and category_id:
-                product_data['category_id'] = category_id
-
-            # Validări
-            if not product_data.get('sku'):
-                product_data['errors'].append('SKU lipsă')
-            else:
-                # Verifică unicitate SKU
-                existing = await db.execute(
-                    select(Product).where(Product.sku == product_data['sku'])
-                )
-                if existing.scalar_one_or_none():
-                    product_data['errors'].append(f"SKU {product_data['sku']} există deja")
-
-            if not product_data.get('name'):
-                product_data['errors'].append('Nume lipsă')
-
-            # Validare prețuri
-            for price_type in ['price_anonim', 'price_user', 'price_instalator', 'price_pro']:
-                if not product_data.get(price_type) or product_data.get(price_type, 0) <= 0:
-                    product_data['errors'].append(f'{price_type.replace("_", " ").title()} invalid')
-
-            # Validare categorie pentru import general
-            if import_type == 'general':
-                if not product_data.get('category_id'):
-                    product_data['errors'].append('ID categorie lipsă')
-                elif int(product_data.get('category_id', 0)) not in valid_category_ids:
-                    product_data['errors'].append(f"Categoria {product_data.get('category_id')} nu există")
-
-            # Warnings pentru logica prețuri
-            if all(product_data.get(p, 0) > 0 for p in ['price_anonim', 'price_user', 'price_instalator', 'price_pro']):
-                if product_data['price_user'] >= product_data['price_anonim']:
-                    product_data['warnings'].append('Preț user >= preț anonim')
-                if product_data['price_instalator'] >= product_data['price_user']:
-                    product_data['warnings'].append('Preț instalator >= preț user')
-                if product_data['price_pro'] >= product_data['price_instalator']:
-                    product_data['warnings'].append('Preț pro >= preț instalator')
-
-            products.append(product_data)
-
-        # Statistici
-        valid_count = len([p for p in products if not p['errors']])
-        error_count = len([p for p in products if p['errors']])
+        # Validare pe coloane + un singur lookup pentru SKU-uri existente
+        preview = await ProductImportService.preview_frame(db, df, import_type, category_id)
 
         return JSONResponse({
             "success": True,
-            "products": products,
-            "stats": {
-                "total": len(products),
-                "valid": valid_count,
-                "errors": error_count
-            }
+            "products": preview["products"],
+            "stats": preview["stats"]
         })
 
     except Exception as e:
@@ -293,7 +185,7 @@ async def process_import(
         staff: Staff = Depends(get_current_staff),
         db: AsyncSession = Depends(get_db)
 ):
-    """Procesează importul efectiv."""
+    """Pornește importul efectiv ca job în fundal; progresul se citește din /jobs/{job_id}."""
     # Verifică permisiuni
     if staff.role not in [StaffRole.SUPER_ADMIN, StaffRole.MANAGER]:
         raise HTTPException(status_code=403)
@@ -304,113 +196,56 @@ async def process_import(
     try:
         # Obține datele din request
         data = await request.json()
-        import_type = data.get('type')
         category_id = data.get('category_id')
         products_data = data.get('products', [])
 
-        results = {
-            'success': 0,
-            'failed': 0,
-            'details': []
-        }
-
-        # Procesează fiecare produs
-        for idx, product_data in enumerate(products_data):
-            try:
-                logger.info(f"Processing product {idx + 1}: SKU={product_data.get('sku')}")
-
-                # Generează slug
-                from slugify import slugify
-                base_slug = slugify(product_data['name'])
-                slug = base_slug
-                counter = 1
-
-                # Verifică unicitate slug
-                while True:
-                    existing_slug = await db.execute(
-                        select(Product).where(Product.slug == slug)
-                    )
-                    if not existing_slug.scalar_one_or_none():
-                        break
-                    slug = f"{base_slug}-{counter}"
-                    counter += 1
-
-                # Creează produsul
-                product = Product(
-                    vendor_company_id=1,  # System Vendor în MVP
-                    category_id=product_data.get('category_id', category_id),
-                    name=product_data['name'],
-                    slug=slug,
-                    sku=product_data['sku'],
-                    description=product_data.get('description'),
-                    short_description=product_data.get('short_description'),
-                    in_stock=product_data.get('in_stock', True),
-                    stock_quantity=product_data.get('stock_quantity', 0),
-                    meta_title=product_data.get('meta_title') or product_data['name'],
-                    meta_description=product_data.get('meta_description'),
-                    sort_order=0
-                )
-                db.add(product)
-                await db.flush()
-
-                # Adaugă prețurile
-                price_mapping = {
-                    PriceType.ANONIM: float(product_data.get('price_anonim', 0)),
-                    PriceType.USER: float(product_data.get('price_user', 0)),
-                    PriceType.INSTALATOR: float(product_data.get('price_instalator', 0)),
-                    PriceType.PRO: float(product_data.get('price_pro', 0))
-                }
-
-                for price_type, amount in price_mapping.items():
-                    price = ProductPrice(
-                        product_id=product.id,
-                        price_type=price_type,
-                        amount=amount,
-                        currency="MDL"
-                    )
-                    db.add(price)
-
-                results['success'] += 1
-                results['details'].append({
-                    'row': product_data.get('row', 0),
-                    'sku': product_data['sku'],
-                    'status': 'success',
-                    'product_id': product.id
-                })
-
-            except Exception as e:
-                logger.error(f"Error processing product {idx + 1}: {str(e)}")
-                import traceback
-                logger.error(traceback.format_exc())
-
-                results['failed'] += 1
-                results['details'].append({
-                    'row': product_data.get('row', 0),
-                    'sku': product_data.get('sku', 'N/A'),
-                    'status': 'error',
-                    'message': str(e)
-                })
-
-        # Commit toate modificările
-        await db.commit()
+        if len(products_data) > default_config.import_max_rows:
+            return JSONResponse({
+                "success": False,
+                "error": f"Maxim {default_config.import_max_rows} produse per import"
+            }, status_code=400)
+
+        job = import_job_runner.submit(
+            staff_id=staff.id,
+            products_data=products_data,
+            default_category_id=int(category_id) if category_id else None,
+            vendor_company_id=1  # System Vendor în MVP
+        )
 
         return JSONResponse({
             "success": True,
-            "results": results
-        })
+            "job": job.to_dict(),
+            "status_url": f"/dashboard/staff/import/jobs/{job.id}"
+        }, status_code=202)
 
     except Exception as e:
         logger.error(f"Fatal error in import: {str(e)}")
         import traceback
         logger.error(traceback.format_exc())
 
-        await db.rollback()
         return JSONResponse({
             "success": False,
             "error": f"Eroare la import: {str(e)}"
         }, status_code=500)
 
 
+@import_router.get("/jobs/{job_id}")
+async def import_job_status(
+        job_id: str,
+        staff: Staff = Depends(get_current_staff)
+):
+    """Progresul unui job de import (rezultatele complete când s-a terminat)."""
+    job = import_job_runner.get(job_id)
+
+    if not job or (job.staff_id != staff.id and staff.role != StaffRole.SUPER_ADMIN):
+        raise HTTPException(status_code=404, detail="Job de import inexistent")
+
+    return JSONResponse({
+        "success": True,
+        "job": job.to_dict(include_details=job.is_finished)
+    })
+
+
 @import_router.get("/template/{import_type}")
 async def download_template(
         import_type: str,
@@ -5,11 +5,10 @@ Router pentru gestionarea facturilor și ofertelor.
 from __future__ import annotations
 import pprint
 import traceback
-from pathlib import Path
 from typing import Optional, List
 from datetime import datetime, timedelta
 from fastapi import APIRouter, Depends, Request, HTTPException, Query, Form, File, UploadFile
-from fastapi.responses import HTMLResponse, RedirectResponse, FileResponse, JSONResponse
+from fastapi.responses import HTMLResponse, RedirectResponse, FileResponse, JSONResponse, StreamingResponse
 from fastapi.templating import Jinja2Templates
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, and_, or_, delete
@@ -17,13 +16,16 @@ from sqlalchemy.orm import selectinload
 
 from cfg import get_db
 from models import Invoice, InvoiceType, Cart, Order, Client, CartItem, OrderItem
-from server.dashboard.dependencies import get_current_staff, get_template_context, PermissionChecker
+from server.dashboard.dependencies import get_current_staff, get_template_context, PermissionChecker, pagination_params, require_role
 from server.dashboard.utils.timezone import datetime_local, date_only, get_invoice_status, get_local_timezone
 from server.dashboard.utils import decimal_to_float
+from server.dashboard.utils.pagination import paginate
 from services.models.invoice_service import InvoiceService
 from services.models.cart_service import CartService
 
 from services.dashboard.pdf_service_reportlab import PDFService
+from services.dashboard.pdf_render_pool import pdf_render_pool
+from services.dashboard.invoice_batch_service import InvoiceBatchService
 from services.dashboard.email_service import EmailService
 from services.dashboard.telegram_invoice_service import TelegramInvoiceService
 
@@ -45,35 +47,14 @@ templates.env.filters['get_invoice_status'] = get_invoice_status
 # print("DEBUG: Filters registered:", list(templates.env.filters.keys()))
 
 
-@invoice_router.get("/", response_class=HTMLResponse)
-async def invoice_list(
-        request: Request,
-        page: int = Query(1, ge=1),
-        per_page: int = Query(20, ge=1, le=100),
-        invoice_type: Optional[str] = None,
-        search: Optional[str] = None,
-        status: Optional[str] = None,  # active, expired, converted
-        client_id: Optional[int] = Query(None),
-        staff=Depends(get_current_staff),
-        db: AsyncSession = Depends(get_db)
-):
-    """Listă toate invoice-urile cu filtre."""
-
-    # Get current time in local timezone for proper comparison
-    local_tz = get_local_timezone()
-    now_local = datetime.now(local_tz)
-    now_utc = datetime.utcnow()
-
-    print(f"DEBUG: Current UTC time: {now_utc}")
-    print(f"DEBUG: Current local time: {now_local}")
-
-    # Query de bază
-    query = select(Invoice).options(
-        selectinload(Invoice.cart).selectinload(Cart.client),
-        selectinload(Invoice.order).selectinload(Order.client)
-    )
-
-    # Filtre
+def _invoice_filters(
+        invoice_type: Optional[str],
+        search: Optional[str],
+        status: Optional[str],
+        client_id: Optional[int],
+        now_utc: datetime
+) -> list:
+    """Condițiile WHERE pentru lista de invoice-uri (folosite și la descărcarea în lot)."""
     filters = []
 
     if invoice_type:
@@ -109,14 +90,46 @@ async def invoice_list(
             filters.append(Invoice.converted_to_order == True)
 
     if client_id:
-        # Filtrare prin cart sau order
-        query = query.outerjoin(Cart).outerjoin(Order).where(
+        # Filtrare prin cart sau order (subquery - fără join-uri în query-ul principal)
+        filters.append(
             or_(
-                Cart.client_id == client_id,
-                Order.client_id == client_id
+                Invoice.cart_id.in_(select(Cart.id).where(Cart.client_id == client_id)),
+                Invoice.order_id.in_(select(Order.id).where(Order.client_id == client_id))
             )
         )
 
+    return filters
+
+
+@invoice_router.get("/", response_class=HTMLResponse)
+async def invoice_list(
+        request: Request,
+        invoice_type: Optional[str] = None,
+        search: Optional[str] = None,
+        status: Optional[str] = None,  # active, expired, converted
+        client_id: Optional[int] = Query(None),
+        pagination: dict = Depends(pagination_params),
+        staff=Depends(get_current_staff),
+        db: AsyncSession = Depends(get_db)
+):
+    """Listă toate invoice-urile cu filtre."""
+
+    # Get current time in local timezone for proper comparison
+    local_tz = get_local_timezone()
+    now_local = datetime.now(local_tz)
+    now_utc = datetime.utcnow()
+
+    print(f"DEBUG: Current UTC time: {now_utc}")
+    print(f"DEBUG: Current local time: {now_local}")
+
+    # Query de bază
+    query = select(Invoice).options(
+        selectinload(Invoice.cart).selectinload(Cart.client),
+        selectinload(Invoice.order).selectinload(Order.client)
+    )
+
+    # Filtre (aceleași și pentru descărcarea în lot)
+    filters = _invoice_filters(invoice_type, search, status, client_id, now_utc)
     if filters:
         query = query.where(and_(*filters))
 
@@ -125,23 +138,14 @@ async def invoice_list(
     if filters:
         total_query = total_query.where(and_(*filters))
 
-    if client_id:
-        total_query = total_query.outerjoin(Cart).outerjoin(Order).where(
-            or_(
-                Cart.client_id == client_id,
-                Order.client_id == client_id
-            )
-        )
-
-    total_result = await db.execute(total_query)
-    total = total_result.scalar() or 0
-
-    # Sortare și paginare
-    offset = (page - 1) * per_page
-    query = query.order_by(Invoice.created_at.desc()).offset(offset).limit(per_page)
-
-    result = await db.execute(query)
-    invoices = result.scalars().all()
+    # Sortare și paginare (keyset când există cursor)
+    page_result = await paginate(
+        db, query, total_query, pagination,
+        sort_column=Invoice.created_at, id_column=Invoice.id,
+        table_name=None if filters else Invoice.__tablename__
+    )
+    invoices = page_result.items
+    total = page_result.total
 
     # Adaugă status calculat pentru fiecare invoice
     for invoice in invoices:
@@ -231,10 +235,12 @@ async def invoice_list(
         "page_title": page_title,
         "invoices": invoices,
         "stats": stats,
-        "page": page,
-        "per_page": per_page,
+        "page": page_result.page,
+        "per_page": page_result.per_page,
         "total": total,
-        "total_pages": (total + per_page - 1) // per_page,
+        "total_is_estimate": page_result.total_is_estimate,
+        "total_pages": page_result.total_pages,
+        "next_page_url": page_result.next_url(request),
         "type_filter": invoice_type,
         "status_filter": status,
         "search_query": search,
@@ -250,6 +256,59 @@ async def invoice_list(
     return templates.TemplateResponse("invoice/list.html", context)
 
 
+@invoice_router.get("/batch/download")
+async def download_invoice_batch(
+        invoice_type: Optional[str] = None,
+        search: Optional[str] = None,
+        status: Optional[str] = None,
+        client_id: Optional[int] = Query(None),
+        month: Optional[str] = Query(None, pattern=r"^\d{4}-\d{2}$"),
+        staff=Depends(get_current_staff),
+        db: AsyncSession = Depends(get_db)
+):
+    """
+    Arhivă ZIP cu PDF-urile invoice-urilor filtrate (filtrele din listă + lună YYYY-MM).
+    Arhiva se trimite în flux; PDF-urile lipsă se randează pe parcurs (concurență limitată).
+    """
+    from server.dashboard.config import default_config
+
+    filters = _invoice_filters(invoice_type, search, status, client_id, datetime.utcnow())
+
+    if month:
+        year, month_num = (int(part) for part in month.split("-"))
+        if not 1 <= month_num <= 12:
+            raise HTTPException(status_code=400, detail="Lună invalidă")
+        month_start = datetime(year, month_num, 1)
+        month_end = datetime(year + month_num // 12, month_num % 12 + 1, 1)
+        filters.append(and_(Invoice.created_at >= month_start, Invoice.created_at < month_end))
+
+    max_invoices = default_config.pdf_batch_max_invoices
+    query = select(Invoice).order_by(Invoice.created_at, Invoice.id).limit(max_invoices + 1)
+    if filters:
+        query = query.where(and_(*filters))
+    invoices = list((await db.execute(query)).scalars().all())
+
+    if not invoices:
+        raise HTTPException(status_code=404, detail="Niciun document pentru filtrele selectate")
+    if len(invoices) > max_invoices:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Prea multe documente (maxim {max_invoices}). Restrângeți filtrele."
+        )
+
+    batch = await InvoiceBatchService.prepare(db, invoices)
+
+    label = month or datetime.now().strftime("%Y%m%d_%H%M")
+    return StreamingResponse(
+        InvoiceBatchService.stream_zip(batch),
+        media_type="application/zip",
+        headers={
+            "Content-Disposition": f'attachment; filename="documente_{label}.zip"',
+            "Cache-Control": "no-store"
+        }
+    )
+
+
 @invoice_router.get("/{invoice_id}", response_class=HTMLResponse)
 async def invoice_detail(
         request: Request,
@@ -667,9 +726,10 @@ async def send_invoice(
         if not invoice:
             raise HTTPException(status_code=404)
 
-        # Asigură-te că PDF există
-        if not invoice.document_path or not Path(invoice.document_path).exists():
-            invoice.document_path = await PDFService.generate_invoice_pdf(invoice, db)
+        # PDF-ul curent (după hash-ul conținutului) - un fișier vechi nu se mai trimite
+        previous_path = invoice.document_path
+        await PDFService.get_invoice_pdf(invoice, db)
+        if invoice.document_path != previous_path:
             await db.commit()
 
         success = False
@@ -765,12 +825,18 @@ async def send_invoice(
 
 @invoice_router.get("/{invoice_id}/download")
 async def download_invoice(
+        request: Request,
         invoice_id: int,
         staff=Depends(get_current_staff),
         db: AsyncSession = Depends(get_db)
 ):
-    """Descarcă PDF invoice."""
-    from fastapi.responses import FileResponse
+    """
+    Descarcă PDF invoice.
+
+    PDF-ul e refolosit cât timp hash-ul datelor nu se schimbă; hash-ul e
+    ETag-ul răspunsului (304 pentru If-None-Match, Range prin FileResponse).
+    """
+    from fastapi.responses import FileResponse, Response
     from pathlib import Path
 
     result = await db.execute(
@@ -781,47 +847,40 @@ async def download_invoice(
     if not invoice:
         raise HTTPException(status_code=404)
 
-    # Generează PDF dacă nu există
-    if not invoice.document_path:
-        try:
-            invoice.document_path = await PDFService.generate_invoice_pdf(invoice, db)
-            await db.commit()
-        except Exception as e:
-            print(f"Error generating PDF: {e}")
-            raise HTTPException(
-                status_code=500,
-                detail="Eroare la generarea PDF"
-            )
+    previous_path = invoice.document_path
+    try:
+        document_path, content_hash = await PDFService.get_invoice_pdf(invoice, db)
+    except Exception:
+        logger.exception(f"Error generating PDF for invoice {invoice_id}")
+        raise HTTPException(
+            status_code=500,
+            detail="Eroare la generarea PDF"
+        )
+
+    if document_path != previous_path:
+        await db.commit()
+
+    etag = f'"{content_hash}"'
+    cache_headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        if etag in candidates or "*" in candidates:
+            return Response(status_code=304, headers=cache_headers)
 
     # Construiește path-ul corect
     # Dacă path-ul este relativ, îl face absolut relativ la directorul curent
-    pdf_path = Path(invoice.document_path)
+    pdf_path = Path(document_path)
     if not pdf_path.is_absolute():
         pdf_path = Path.cwd() / pdf_path
 
-    # Verifică că fișierul există
-    if not pdf_path.exists():
-        # Încearcă să regenereze PDF-ul
-        try:
-            invoice.document_path = await PDFService.generate_invoice_pdf(invoice, db, force_regenerate=True)
-            await db.commit()
-
-            pdf_path = Path(invoice.document_path)
-            if not pdf_path.is_absolute():
-                pdf_path = Path.cwd() / pdf_path
-
-        except Exception as e:
-            print(f"Error regenerating PDF: {e}")
-            raise HTTPException(
-                status_code=404,
-                detail="Fișierul PDF nu a fost găsit și nu a putut fi regenerat"
-            )
-
-    # Returnează fișierul
+    # Returnează fișierul (FileResponse tratează Range / If-Range)
     return FileResponse(
         path=str(pdf_path),
         media_type='application/pdf',
-        filename=f"{invoice.invoice_number}.pdf"
+        filename=f"{invoice.invoice_number}.pdf",
+        headers=cache_headers
     )
 
 
@@ -926,6 +985,15 @@ async def preview_quote(
     })
 
 
+@invoice_router.get("/api/pdf-render-stats")
+async def get_pdf_render_stats(
+        staff=Depends(get_current_staff),
+        _=Depends(require_role(["super_admin"]))
+):
+    """Metrici pentru randarea PDF (coadă, timp de randare, timeout-uri)."""
+    return JSONResponse(pdf_render_pool.metrics())
+
+
 @invoice_router.get("/api/stats")
 async def get_invoice_stats(
         period: str = Query("month"),  # today, week, month, year
@@ -15,10 +15,15 @@ from sqlalchemy.orm import selectinload
 
 from cfg import get_db
 from models import Order, OrderStatus, Client, Product, Staff, Cart, CartItem
-from server.dashboard.dependencies import get_current_staff, get_template_context, PermissionChecker
+from server.dashboard.dependencies import get_current_staff, get_template_context, PermissionChecker, pagination_params
 from server.dashboard.utils.timezone import datetime_local, time_only, date_only
+from server.dashboard.utils.pagination import paginate
 from services.models.order_service import OrderService
+from services.dashboard.export_service import ExportService, ExportColumn
+from services.dashboard.search_service import SearchService, PRODUCT_SEARCH, CLIENT_SEARCH, ORDER_SEARCH
 from services.models.cart_service import CartService
+from services.dashboard.sales_rollup_service import SalesRollupService
+from services.dashboard.stats_cache import stats_cache, ORDER_DEPENDENT_STATS
 
 order_router = APIRouter()
 templates = Jinja2Templates(directory="server/dashboard/templates/staf")
@@ -28,30 +33,16 @@ templates.env.filters['time_only'] = time_only
 templates.env.filters['date_only'] = date_only
 
 
-@order_router.get("/", response_class=HTMLResponse)
-async def order_list(
-        request: Request,
-        page: int = Query(1, ge=1),
-        per_page: int = Query(20, ge=1, le=100),
-        status: Optional[str] = None,
-        search: Optional[str] = None,
-        period: Optional[str] = None,
-        client_id: Optional[int] = Query(None),
-        sort_by: str = Query("created_at"),
-        sort_desc: bool = Query(True),
-        staff=Depends(get_current_staff),
-        db: AsyncSession = Depends(get_db)
-):
-    """Listă comenzi cu filtre și paginare."""
-
-    # Query de bază
-    query = select(Order).options(
-        selectinload(Order.client),
-        selectinload(Order.items),
-        selectinload(Order.processed_by)
-    )
-
-    # Filtre
+def _order_filters(
+        status: Optional[str],
+        search: Optional[str],
+        period: Optional[str],
+        client_id: Optional[int]
+) -> list:
+    """
+    Condițiile WHERE pentru lista de comenzi (folosite și la export).
+    Căutarea folosește coloane din Client - query-ul trebuie să facă join.
+    """
     filters = []
 
     if status:
@@ -61,12 +52,10 @@ async def order_list(
         filters.append(Order.client_id == client_id)
 
     if search:
-        query = query.join(Client).where(
+        filters.append(
             or_(
-                Order.order_number.ilike(f"%{search}%"),
-                Client.first_name.ilike(f"%{search}%"),
-                Client.last_name.ilike(f"%{search}%"),
-                Client.email.ilike(f"%{search}%")
+                SearchService.condition(ORDER_SEARCH, search),
+                SearchService.condition(CLIENT_SEARCH, search)
             )
         )
 
@@ -84,45 +73,62 @@ async def order_list(
         if start_date:
             filters.append(Order.created_at >= start_date)
 
-    if filters:
-        query = query.where(and_(*filters))
+    return filters
+
+
+def _order_sort_column(sort_by: Optional[str]):
+    if sort_by == "order_number":
+        return Order.order_number
+    if sort_by == "total_amount":
+        return Order.total_amount
+    if sort_by == "status":
+        return Order.status
+    return Order.created_at
+
 
-    # Total pentru paginare
-    total_query = select(func.count(Order.id))
+@order_router.get("/", response_class=HTMLResponse)
+async def order_list(
+        request: Request,
+        status: Optional[str] = None,
+        search: Optional[str] = None,
+        period: Optional[str] = None,
+        client_id: Optional[int] = Query(None),
+        pagination: dict = Depends(pagination_params),
+        staff=Depends(get_current_staff),
+        db: AsyncSession = Depends(get_db)
+):
+    """Listă comenzi cu filtre și paginare (offset sau keyset)."""
+    sort_by = pagination["sort_by"] or "created_at"
+    sort_desc = pagination["sort_desc"]
+
+    # Query de bază
+    query = select(Order).options(
+        selectinload(Order.client),
+        selectinload(Order.items),
+        selectinload(Order.processed_by)
+    )
+    total_query = select(func.count(Order.id)).select_from(Order)
+
+    # Filtre (aceleași și pentru export)
+    filters = _order_filters(status, search, period, client_id)
     if search:
-        total_query = total_query.select_from(Order).join(Client).where(
-            or_(
-                Order.order_number.ilike(f"%{search}%"),
-                Client.first_name.ilike(f"%{search}%"),
-                Client.last_name.ilike(f"%{search}%"),
-                Client.email.ilike(f"%{search}%")
-            )
-        )
+        query = query.join(Client)
+        total_query = total_query.join(Client)
     if filters:
+        query = query.where(and_(*filters))
         total_query = total_query.where(and_(*filters))
 
-    total_result = await db.execute(total_query)
-    total = total_result.scalar() or 0
-
     # Sortare
-    if sort_by == "order_number":
-        order_by = Order.order_number
-    elif sort_by == "total_amount":
-        order_by = Order.total_amount
-    elif sort_by == "status":
-        order_by = Order.status
-    else:
-        order_by = Order.created_at
-
-    if sort_desc:
-        order_by = order_by.desc()
+    order_by = _order_sort_column(sort_by)
 
-    # Paginare
-    offset = (page - 1) * per_page
-    query = query.order_by(order_by).offset(offset).limit(per_page)
-
-    result = await db.execute(query)
-    orders = result.scalars().all()
+    # Paginare (keyset când există cursor) + total estimat pentru lista nefiltrată
+    page_result = await paginate(
+        db, query, total_query, pagination,
+        sort_column=order_by, id_column=Order.id,
+        table_name=None if filters else Order.__tablename__
+    )
+    orders = page_result.items
+    total = page_result.total
 
     # Obține informații client dacă se filtrează după client
     filtered_client = None
@@ -185,7 +191,7 @@ async def order_list(
         "monthly_revenue": float(client_revenue.scalar() or 0)
     }
 
-    total_pages = (total + per_page - 1) // per_page
+    total_pages = page_result.total_pages
 
     # Logică navigare pentru întoarcerea la client
     back_url = None
@@ -202,10 +208,12 @@ async def order_list(
         "page_title": page_title,
         "orders": orders,
         "stats": stats,
-        "page": page,
-        "per_page": per_page,
+        "page": page_result.page,
+        "per_page": page_result.per_page,
         "total": total,
+        "total_is_estimate": page_result.total_is_estimate,
         "total_pages": total_pages,
+        "next_page_url": page_result.next_url(request),
         "search_query": search,
         "status_filter": status,
         "period_filter": period,
@@ -221,6 +229,62 @@ async def order_list(
     return templates.TemplateResponse("order/list.html", context)
 
 
+@order_router.get("/export")
+async def order_export(
+        status: Optional[str] = None,
+        search: Optional[str] = None,
+        period: Optional[str] = None,
+        client_id: Optional[int] = Query(None),
+        sort_by: Optional[str] = Query(None),
+        sort_desc: bool = Query(True),
+        format: str = Query("csv"),
+        staff=Depends(PermissionChecker("read", "order"))
+):
+    """Export comenzi (CSV / XLSX) cu filtrele din listă."""
+    ExportService.check_allowed("order")
+
+    query = (
+        select(
+            Order.order_number,
+            Order.created_at,
+            Order.status,
+            Client.first_name,
+            Client.last_name,
+            Client.email,
+            Client.phone,
+            Order.total_amount,
+            Order.currency,
+            Order.processed_at
+        )
+        .select_from(Order)
+        .outerjoin(Client, Order.client_id == Client.id)
+    )
+
+    filters = _order_filters(status, search, period, client_id)
+    if filters:
+        query = query.where(and_(*filters))
+
+    order_by = _order_sort_column(sort_by)
+    if sort_desc:
+        query = query.order_by(order_by.desc(), Order.id.desc())
+    else:
+        query = query.order_by(order_by.asc(), Order.id.asc())
+
+    columns = [
+        ExportColumn("order_number", "Număr comandă"),
+        ExportColumn("created_at", "Data"),
+        ExportColumn("status", "Status"),
+        ExportColumn("first_name", "Prenume"),
+        ExportColumn("last_name", "Nume"),
+        ExportColumn("email", "Email"),
+        ExportColumn("phone", "Telefon"),
+        ExportColumn("total_amount", "Total"),
+        ExportColumn("currency", "Valută"),
+        ExportColumn("processed_at", "Procesată la"),
+    ]
+    return ExportService.stream(query, columns, "comenzi", format)
+
+
 @order_router.get("/create", response_class=HTMLResponse)
 async def order_create_form(
         request: Request,
@@ -618,12 +682,7 @@ async def add_products_to_cart(
         products_query = products_query.where(Product.category_id == category_id)
 
     if search:
-        products_query = products_query.where(
-            or_(
-                Product.name.ilike(f"%{search}%"),
-                Product.sku.ilike(f"%{search}%")
-            )
-        )
+        products_query = SearchService.apply(products_query, PRODUCT_SEARCH, search)
 
     products_result = await db.execute(products_query.limit(50))
     products = products_result.scalars().all()
@@ -827,6 +886,10 @@ async def finalize_order(
         order.processed_at = datetime.utcnow()
         await db.commit()
 
+        # Statusul s-a schimbat după create_from_cart
+        stats_cache.invalidate(ORDER_DEPENDENT_STATS)
+        SalesRollupService.mark_orders_dirty([order.id])
+
         return RedirectResponse(
             url=f"/dashboard/staff/order/{order.id}?success=created",
             status_code=303
@@ -861,12 +924,7 @@ async def search_products_api(
     )
 
     if q:
-        query = query.where(
-            or_(
-                Product.name.ilike(f"%{q}%"),
-                Product.sku.ilike(f"%{q}%")
-            )
-        )
+        query = SearchService.apply(query, PRODUCT_SEARCH, q)
 
     if category_id:
         query = query.where(Product.category_id == category_id)
@@ -17,6 +17,7 @@ from server.dashboard.dependencies import get_current_staff, get_template_contex
 from server.dashboard.utils.timezone import datetime_local, time_only, date_only
 from services.models.blog_service import BlogService
 from services.dashboard.file_service import FileService
+from services.dashboard.image_pipeline import image_variant_url
 
 post_image_router = APIRouter()
 templates = Jinja2Templates(directory="server/dashboard/templates/staf")
@@ -451,7 +452,8 @@ async def image_gallery_modal(
     context = {
         "request": request,
         "images": images,
-        "post_id": post_id
+        "post_id": post_id,
+        "image_variant": image_variant_url
     }
 
     return templates.TemplateResponse(
@@ -7,7 +7,7 @@ from fastapi import APIRouter, Depends, Request, HTTPException, Form, Query, Upl
 from fastapi.responses import HTMLResponse, RedirectResponse, JSONResponse
 from fastapi.templating import Jinja2Templates
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_, or_
+from sqlalchemy import select, func, and_
 from sqlalchemy.orm import selectinload
 
 from cfg import get_db
@@ -16,6 +16,7 @@ from server.dashboard.dependencies import get_current_staff, get_template_contex
 from server.dashboard.utils.timezone import datetime_local, time_only, date_only
 from services.models.product_service import ProductService
 from services.dashboard.file_service import FileService
+from services.dashboard.search_service import SearchService, PRODUCT_SEARCH
 
 product_image_router = APIRouter()
 templates = Jinja2Templates(directory="server/dashboard/templates/staf")
@@ -51,12 +52,7 @@ async def product_image_gallery(
         query = query.where(Product.category_id == category_id)
 
     if search:
-        query = query.where(
-            or_(
-                Product.name.ilike(f"%{search}%"),
-                Product.sku.ilike(f"%{search}%")
-            )
-        )
+        query = query.where(SearchService.condition(PRODUCT_SEARCH, search))
 
     # Total pentru paginare
     total_query = select(func.count(Product.id)).select_from(Product).where(Product.is_active == True)
@@ -64,12 +60,7 @@ async def product_image_gallery(
     if category_id:
         total_query = total_query.where(Product.category_id == category_id)
     if search:
-        total_query = total_query.where(
-            or_(
-                Product.name.ilike(f"%{search}%"),
-                Product.sku.ilike(f"%{search}%")
-            )
-        )
+        total_query = total_query.where(SearchService.condition(PRODUCT_SEARCH, search))
 
     total_result = await db.execute(total_query)
     total = total_result.scalar() or 0
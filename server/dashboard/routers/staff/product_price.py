@@ -6,18 +6,20 @@ Permite vizualizare și actualizare în masă a prețurilor.
 
 from __future__ import annotations
 from typing import Optional
-from fastapi import APIRouter, Depends, Request, HTTPException, Form, Query
+from fastapi import APIRouter, Depends, Request, HTTPException, Form
 from fastapi.responses import HTMLResponse, RedirectResponse, JSONResponse
 from fastapi.templating import Jinja2Templates
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_, or_
+from sqlalchemy import select, func, and_
 from sqlalchemy.orm import selectinload
 
 from cfg import get_db
 from models import Product, ProductPrice, PriceType, Category, Vendor, VendorCompany
-from server.dashboard.dependencies import get_current_staff, get_template_context, PermissionChecker
+from server.dashboard.dependencies import get_current_staff, get_template_context, PermissionChecker, pagination_params
 from server.dashboard.utils.timezone import datetime_local, time_only, date_only
+from server.dashboard.utils.pagination import paginate
 from services.models.product_service import ProductService
+from services.dashboard.search_service import SearchService, PRODUCT_SEARCH
 
 product_price_router = APIRouter()
 templates = Jinja2Templates(directory="server/dashboard/templates/staf")
@@ -31,8 +33,7 @@ templates.env.filters['date_only'] = date_only
 @product_price_router.get("/", response_class=HTMLResponse)
 async def price_list(
         request: Request,
-        page: int = Query(1, ge=1),
-        per_page: int = Query(20, ge=1, le=100),
+        pagination: dict = Depends(pagination_params),
         staff=Depends(get_current_staff),
         db: AsyncSession = Depends(get_db)
 ):
@@ -64,12 +65,7 @@ async def price_list(
         query = query.where(Product.vendor_company_id == vendor_company_id)
 
     if search:
-        query = query.where(
-            or_(
-                Product.name.ilike(f"%{search}%"),
-                Product.sku.ilike(f"%{search}%")
-            )
-        )
+        query = query.where(SearchService.condition(PRODUCT_SEARCH, search))
 
     # Total pentru paginare
     # total_query = select(func.count(Product.id)).select_from(Product).where(Product.is_active == True)
@@ -79,23 +75,16 @@ async def price_list(
     if vendor_company_id:
         total_query = total_query.where(Product.vendor_company_id == vendor_company_id)
     if search:
-        total_query = total_query.where(
-            or_(
-                Product.name.ilike(f"%{search}%"),
-                Product.sku.ilike(f"%{search}%")
-            )
-        )
+        total_query = total_query.where(SearchService.condition(PRODUCT_SEARCH, search))
 
-    total_result = await db.execute(total_query)
-    total = total_result.scalar() or 0
-
-    # Paginare
-    offset = (page - 1) * per_page
-    query = query.order_by(Product.name).offset(offset).limit(per_page)
-
-    result = await db.execute(query)
-
-    products = result.scalars().all()
+    # Paginare - alfabetic după nume (keyset când există cursor)
+    page_result = await paginate(
+        db, query, total_query, dict(pagination, sort_desc=False),
+        sort_column=Product.name, id_column=Product.id,
+        table_name=None if (category_id or vendor_company_id or search) else Product.__tablename__
+    )
+    products = page_result.items
+    total = page_result.total
 
 
     # Organizare prețuri pentru afișare - TOATE prețurile (active și inactive)
@@ -146,7 +135,7 @@ async def price_list(
     )
     vendors = vendors_result.scalars().all()
 
-    total_pages = (total + per_page - 1) // per_page
+    total_pages = page_result.total_pages
 
     context = await get_template_context(request, staff, db)
     context.update({
@@ -155,10 +144,12 @@ async def price_list(
         "product_prices": product_prices,
         "categories": categories,
         "vendors": vendors,
-        "page": page,
-        "per_page": per_page,
+        "page": page_result.page,
+        "per_page": page_result.per_page,
         "total": total,
+        "total_is_estimate": page_result.total_is_estimate,
         "total_pages": total_pages,
+        "next_page_url": page_result.next_url(request),
         "category_filter": category_id,
         "vendor_filter": vendor_company_id,
         "search_query": search,
@@ -10,7 +10,7 @@ from fastapi import APIRouter, Depends, Request, HTTPException, Form, Query
 from fastapi.responses import HTMLResponse, RedirectResponse
 from fastapi.templating import Jinja2Templates
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_, or_
+from sqlalchemy import select, func, and_
 from sqlalchemy.orm import selectinload
 from slugify import slugify
 
@@ -20,6 +20,8 @@ from server.dashboard.dependencies import get_current_staff, get_template_contex
 from server.dashboard.utils.timezone import datetime_local, time_only, date_only
 from services.models.product_service import ProductService
 from services.dashboard.file_service import FileService
+from services.dashboard.search_service import SearchService, PRODUCT_SEARCH
+from services.dashboard.price_cache import price_cache
 
 products_router = APIRouter()
 templates = Jinja2Templates(directory="server/dashboard/templates/staf")
@@ -55,13 +57,8 @@ async def product_list(
     filters = []
 
     if search:
-        filters.append(
-            or_(
-                Product.name.ilike(f"%{search}%"),
-                Product.sku.ilike(f"%{search}%"),
-                Product.description.ilike(f"%{search}%")
-            )
-        )
+        # Descrierea e acoperită de full-text (search_vector)
+        filters.append(SearchService.condition(PRODUCT_SEARCH, search))
 
     if category_id:
         filters.append(Product.category_id == category_id)
@@ -278,6 +275,8 @@ async def product_create(
             db.add(price)
 
         await db.commit()
+        # Prețurile sunt în a doua tranzacție - o citire între ele ar fi memorat "fără preț"
+        price_cache.invalidate([product.id])
 
         return RedirectResponse(
             url=f"/dashboard/staff/product?success=created",
@@ -2,7 +2,7 @@
 from __future__ import annotations
 from typing import Optional
 from datetime import datetime
-from fastapi import APIRouter, Depends, Request, Query, HTTPException, Form
+from fastapi import APIRouter, Depends, Request, HTTPException, Form
 from fastapi.responses import HTMLResponse, RedirectResponse
 from fastapi.templating import Jinja2Templates
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -11,8 +11,9 @@ from sqlalchemy.orm import selectinload
 
 from cfg import get_db
 from models import UserRequest, RequestType, Client, Product, Staff, RequestResponse
-from server.dashboard.dependencies import get_current_staff, get_template_context, PermissionChecker
+from server.dashboard.dependencies import get_current_staff, get_template_context, PermissionChecker, pagination_params
 from server.dashboard.utils.timezone import datetime_local, time_only, date_only
+from server.dashboard.utils.pagination import paginate
 from services.models.request_services import RequestService
 
 user_request_router = APIRouter()
@@ -27,11 +28,10 @@ templates.env.filters['date_only'] = date_only
 @user_request_router.get("/", response_class=HTMLResponse)
 async def user_request_list(
         request: Request,
-        page: int = Query(1, ge=1),
-        per_page: int = Query(20, ge=1, le=100),
         request_type: Optional[str] = None,
         is_processed: Optional[str] = None,
         search: Optional[str] = None,
+        pagination: dict = Depends(pagination_params),
         staff: Staff = Depends(get_current_staff),
         db: AsyncSession = Depends(get_db)
 ):
@@ -75,28 +75,29 @@ async def user_request_list(
     if filters:
         total_query = total_query.join(Client).where(and_(*filters))
 
-    total_result = await db.execute(total_query)
-    total = total_result.scalar() or 0
-
-    # Paginare
-    offset = (page - 1) * per_page
-    query = query.order_by(UserRequest.created_at.desc()).offset(offset).limit(per_page)
-
-    result = await db.execute(query)
-    requests = result.scalars().all()
+    # Paginare (keyset când există cursor)
+    page_result = await paginate(
+        db, query, total_query, pagination,
+        sort_column=UserRequest.created_at, id_column=UserRequest.id,
+        table_name=None if filters else UserRequest.__tablename__
+    )
+    requests = page_result.items
+    total = page_result.total
 
     # Calculăm total pages
-    total_pages = (total + per_page - 1) // per_page
+    total_pages = page_result.total_pages
 
     # Context pentru template
     context = await get_template_context(request, staff)
     context.update({
         "page_title": "Cereri Utilizatori",
         "requests": requests,
-        "page": page,
-        "per_page": per_page,
+        "page": page_result.page,
+        "per_page": page_result.per_page,
         "total": total,
+        "total_is_estimate": page_result.total_is_estimate,
         "total_pages": total_pages,
+        "next_page_url": page_result.next_url(request),
         "request_type_filter": request_type,
         "is_processed_filter": is_processed,
         "search_query": search,
@@ -475,6 +475,7 @@ async def toggle_company_status(
     """
     from sqlalchemy import select, update
     from models import VendorCompany, Product, ProductPrice
+    from services.dashboard.price_cache import price_cache
 
     result = await db.execute(
         select(VendorCompany).where(VendorCompany.id == company_id)
@@ -539,6 +540,9 @@ async def toggle_company_status(
 
     await db.commit()
 
+    if not new_status:
+        price_cache.invalidate(product_ids)
+
     return RedirectResponse(
         url=f"/dashboard/staff/vendor_company/{company_id}",
         status_code=303
@@ -0,0 +1,288 @@
+# server/dashboard/utils/pagination.py
+"""
+Paginare pentru listele din dashboard: offset (clasic) și keyset (cursor).
+
+Keyset: pagina următoare se citește cu WHERE (sort_key, id) < (ultimul rând)
+în loc de OFFSET, deci costul nu crește cu numărul paginii. Cursorul este
+opac pentru client (base64 JSON) și conține sortarea pentru care a fost emis.
+
+Totalul poate fi estimat:
+- listă nefiltrată: pg_class.reltuples (O(1), actualizat de ANALYZE)
+- listă filtrată: count(*) păstrat în cache câteva secunde
+
+Usage:
+    page = await paginate(
+        db, query, total_query, pagination,
+        sort_column=Order.created_at, id_column=Order.id,
+        table_name=None if filters else Order.__tablename__
+    )
+    page.items, page.total, page.next_cursor
+"""
+from __future__ import annotations
+import base64
+import binascii
+import json
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlencode
+
+from sqlalchemy import Enum, text, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+MODE_OFFSET = "offset"
+MODE_KEYSET = "keyset"
+
+_MAX_CACHED_COUNTS = 256
+_count_cache: Dict[Tuple[str, str], Tuple[float, int]] = {}
+
+
+class InvalidCursor(ValueError):
+    """Cursor corupt sau într-un format necunoscut."""
+
+
+# ==================== CURSOR ====================
+
+def encode_cursor(sort_by: Optional[str], sort_desc: bool, sort_value: Any, row_id: int) -> str:
+    """Cursor opac pentru (sort_key, id) al ultimului rând din pagină."""
+    if isinstance(sort_value, datetime):
+        tag, value = "dt", sort_value.isoformat()
+    elif isinstance(sort_value, Decimal):
+        tag, value = "n", str(sort_value)
+    elif isinstance(sort_value, bool):
+        raise InvalidCursor("Boolean sort keys are not supported")
+    elif isinstance(sort_value, (int, float, str)):
+        tag, value = "v", sort_value
+    else:
+        raise InvalidCursor(f"Unsupported sort value: {type(sort_value).__name__}")
+
+    payload = {"s": sort_by, "d": bool(sort_desc), "t": tag, "v": value, "i": row_id}
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    """
+    Decodează un cursor emis de encode_cursor.
+
+    Returns:
+        {"sort_by", "sort_desc", "value", "id"}
+
+    Raises:
+        InvalidCursor
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        tag, value, row_id = payload["t"], payload["v"], int(payload["i"])
+        if tag == "dt":
+            value = datetime.fromisoformat(value)
+        elif tag == "n":
+            value = Decimal(value)
+        elif tag != "v":
+            raise InvalidCursor(f"Unknown cursor tag: {tag}")
+        return {
+            "sort_by": payload.get("s"),
+            "sort_desc": bool(payload.get("d", True)),
+            "value": value,
+            "id": row_id
+        }
+    except InvalidCursor:
+        raise
+    except (binascii.Error, ValueError, KeyError, TypeError) as e:
+        raise InvalidCursor(str(e)) from e
+
+
+def supports_keyset(column: Any) -> bool:
+    """Keyset cere o cheie NOT NULL cu ordine totală (fără Enum / Boolean)."""
+    col = getattr(column, "expression", column)
+    if getattr(col, "nullable", True) or isinstance(col.type, Enum):
+        return False
+    try:
+        return col.type.python_type in (datetime, Decimal, int, float, str)
+    except NotImplementedError:
+        return False
+
+
+# ==================== TOTAL ====================
+
+async def estimated_count(db: AsyncSession, table_name: str) -> Optional[int]:
+    """Numărul de rânduri estimat de planner (None dacă tabelul nu a fost analizat)."""
+    result = await db.execute(
+        text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table_name)"),
+        {"table_name": table_name}
+    )
+    estimate = result.scalar()
+    if estimate is None or estimate < 0:
+        return None
+    return int(estimate)
+
+
+async def cached_count(db: AsyncSession, count_query: Any, ttl_seconds: Optional[int] = None) -> int:
+    """count(*) reutilizat pentru același query + parametri timp de ttl_seconds."""
+    from server.dashboard.config import default_config
+
+    ttl = default_config.count_cache_seconds if ttl_seconds is None else ttl_seconds
+    compiled = count_query.compile()
+    key = (str(compiled), repr(sorted(compiled.params.items(), key=lambda item: item[0])))
+
+    now = time.monotonic()
+    cached = _count_cache.get(key)
+    if cached and cached[0] > now:
+        return cached[1]
+
+    total = (await db.execute(count_query)).scalar() or 0
+
+    if len(_count_cache) >= _MAX_CACHED_COUNTS:
+        for expired_key in [k for k, (expires, _) in _count_cache.items() if expires <= now]:
+            del _count_cache[expired_key]
+        if len(_count_cache) >= _MAX_CACHED_COUNTS:
+            _count_cache.pop(next(iter(_count_cache)))
+    _count_cache[key] = (now + ttl, total)
+    return total
+
+
+async def count_total(
+        db: AsyncSession,
+        count_query: Any,
+        estimate: bool,
+        table_name: Optional[str] = None
+) -> Tuple[int, bool]:
+    """
+    Totalul pentru paginare.
+
+    Args:
+        table_name: doar pentru liste nefiltrate - permite estimarea din pg_class
+
+    Returns:
+        (total, is_estimate)
+    """
+    if not estimate:
+        return (await db.execute(count_query)).scalar() or 0, False
+
+    from server.dashboard.config import default_config
+
+    if table_name:
+        approx = await estimated_count(db, table_name)
+        if approx is not None and approx >= default_config.exact_count_threshold:
+            return approx, True
+        # Tabel mic sau neanalizat: count(*) exact e ieftin
+        return (await db.execute(count_query)).scalar() or 0, False
+
+    return await cached_count(db, count_query), True
+
+
+# ==================== PAGINARE ====================
+
+@dataclass
+class Page:
+    """O pagină de rezultate plus metadatele de navigare."""
+    items: List[Any]
+    page: int
+    per_page: int
+    total: int
+    total_is_estimate: bool = False
+    has_next: bool = False
+    next_cursor: Optional[str] = None
+    mode: str = MODE_OFFSET
+
+    @property
+    def total_pages(self) -> int:
+        pages = (self.total + self.per_page - 1) // self.per_page
+        if self.has_next:
+            pages = max(pages, self.page + 1)
+        return max(pages, self.page if self.items else 0)
+
+    def next_url(self, request: Any) -> Optional[str]:
+        """URL pentru pagina următoare, păstrând filtrele din query string."""
+        if not self.has_next:
+            return None
+        params = [(k, v) for k, v in request.query_params.multi_items() if k not in ("page", "cursor", "mode")]
+        params.append(("page", self.page + 1))
+        if self.next_cursor:
+            params.append(("cursor", self.next_cursor))
+        return f"?{urlencode(params)}"
+
+
+async def paginate(
+        db: AsyncSession,
+        query: Any,
+        count_query: Any,
+        pagination: Dict[str, Any],
+        sort_column: Any,
+        id_column: Any,
+        table_name: Optional[str] = None
+) -> Page:
+    """
+    Execută query-ul paginat (offset sau keyset) și calculează totalul.
+
+    Args:
+        query: SELECT fără ORDER BY / LIMIT
+        count_query: SELECT count(...) cu aceleași filtre
+        pagination: rezultatul dependency-ului pagination_params
+        sort_column: cheia de sortare (ex. Order.created_at)
+        id_column: cheia unică pentru departajare (ex. Order.id)
+        table_name: setat doar pentru liste nefiltrate (estimare din pg_class)
+    """
+    page = pagination["page"]
+    per_page = pagination["per_page"]
+    sort_desc = pagination["sort_desc"]
+    sort_by = pagination.get("sort_by")
+    cursor = pagination.get("cursor")
+
+    keyset_capable = supports_keyset(sort_column)
+    if sort_desc:
+        query = query.order_by(sort_column.desc(), id_column.desc())
+    else:
+        query = query.order_by(sort_column.asc(), id_column.asc())
+
+    # Cursorul e valid doar pentru sortarea cu care a fost emis
+    use_keyset = (
+        pagination.get("mode") == MODE_KEYSET
+        and keyset_capable
+        and cursor is not None
+        and cursor["sort_by"] == sort_by
+        and cursor["sort_desc"] == sort_desc
+    )
+
+    if use_keyset:
+        boundary = tuple_(sort_column, id_column)
+        after = tuple_(cursor["value"], cursor["id"])
+        query = query.where(boundary < after if sort_desc else boundary > after)
+    else:
+        if cursor is not None:
+            page = 1
+        query = query.offset((page - 1) * per_page)
+
+    result = await db.execute(query.limit(per_page + 1))
+    rows = list(result.scalars().all())
+
+    has_next = len(rows) > per_page
+    items = rows[:per_page]
+
+    next_cursor = None
+    if has_next and keyset_capable:
+        last = items[-1]
+        next_cursor = encode_cursor(
+            sort_by, sort_desc,
+            getattr(last, sort_column.key),
+            getattr(last, id_column.key)
+        )
+
+    total, is_estimate = await count_total(
+        db, count_query, pagination.get("estimate_total", False), table_name
+    )
+
+    return Page(
+        items=items,
+        page=page,
+        per_page=per_page,
+        total=total,
+        total_is_estimate=is_estimate,
+        has_next=has_next,
+        next_cursor=next_cursor,
+        mode=MODE_KEYSET if use_keyset else MODE_OFFSET
+    )
@@ -0,0 +1,79 @@
+# server/dashboard/utils/related_counts.py
+"""
+Încărcare în lot a numărătorilor pentru relații (evită N+1 în liste).
+
+În loc de câte un SELECT count(...) pentru fiecare rând din pagină,
+se face un singur query GROUP BY per relație pentru toate ID-urile.
+
+Usage:
+    counts = await load_related_counts(
+        db,
+        [client.id for client in clients],
+        {"orders": Order.client_id, "requests": UserRequest.client_id}
+    )
+    counts[client.id]["orders"]
+"""
+from __future__ import annotations
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import select, func, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+async def count_related(
+        db: AsyncSession,
+        fk_column: Any,
+        parent_ids: Iterable[int],
+        conditions: Optional[List[Any]] = None
+) -> Dict[int, int]:
+    """
+    Numără rândurile din tabelul copil pentru fiecare părinte, într-un singur query.
+
+    Args:
+        fk_column: coloana FK din tabelul copil (ex. Order.client_id)
+        parent_ids: ID-urile părinților din pagina curentă
+        conditions: filtre suplimentare pe tabelul copil
+
+    Returns:
+        {parent_id: count} - include 0 pentru părinții fără copii
+    """
+    ids = list({parent_id for parent_id in parent_ids if parent_id is not None})
+    if not ids:
+        return {}
+
+    stmt = (
+        select(fk_column, func.count().label('count'))
+        .where(and_(fk_column.in_(ids), *(conditions or [])))
+        .group_by(fk_column)
+    )
+    result = await db.execute(stmt)
+
+    counts = {parent_id: 0 for parent_id in ids}
+    for parent_id, count in result.all():
+        counts[parent_id] = count
+    return counts
+
+
+async def load_related_counts(
+        db: AsyncSession,
+        parent_ids: Iterable[int],
+        relations: Dict[str, Any]
+) -> Dict[int, Dict[str, int]]:
+    """
+    Numărători pentru mai multe relații: un query per relație.
+
+    Args:
+        relations: nume -> coloană FK (ex. {"orders": Order.client_id})
+
+    Returns:
+        {parent_id: {nume_relație: count}}
+    """
+    ids = list({parent_id for parent_id in parent_ids if parent_id is not None})
+    combined: Dict[int, Dict[str, int]] = {parent_id: {} for parent_id in ids}
+
+    for name, fk_column in relations.items():
+        counts = await count_related(db, fk_column, ids)
+        for parent_id in ids:
+            combined[parent_id][name] = counts.get(parent_id, 0)
+
+    return combined
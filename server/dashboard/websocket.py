@@ -1,6 +1,15 @@
 # server/dashboard/websocket.py
 """
 WebSocket manager pentru notificări real-time.
+
+Fiecare conexiune are coada ei (limitată) și un task writer propriu:
+mesajul se serializează o singură dată, apoi se pune în coada fiecărei
+conexiuni - un browser lent nu mai blochează celelalte tab-uri. Coada
+plină se tratează după ws_slow_consumer_policy; un send blocat peste
+ws_send_timeout_seconds închide conexiunea.
+
+Mesajele către staff trec prin backend-ul pub/sub (ws_pubsub_backend):
+cu "postgres" ajung la conexiunile din toți worker-ii / toate serverele.
 """
 
 from __future__ import annotations
@@ -8,6 +17,7 @@ from fastapi import WebSocket, WebSocketDisconnect, Query, Depends, status
 from fastapi.exceptions import WebSocketException
 from typing import Dict, Set, Optional
 import json
+import time
 import asyncio
 from datetime import datetime
 from sqlalchemy import select
@@ -16,6 +26,8 @@ from jose import JWTError, jwt
 
 from cfg import get_db, SECRET_KEY, ALGORITHM
 from models import Staff
+from server.dashboard.config import default_config
+from server.dashboard.pubsub import PubSubBackend, InMemoryPubSub, create_backend
 
 
 # În metoda connect, elimină try/except care verifică client_state
@@ -29,69 +41,213 @@ async def connect(self, websocket: WebSocket, staff_id: int):
     print(f"Manager: Added connection for staff {staff_id}")
 
 
+class _Connection:
+    """
+    O conexiune WebSocket cu coada ei de trimitere.
+    Un singur writer per socket - mesajele pleacă în ordine, fără trimiteri concurente.
+    """
+
+    def __init__(self, manager: "ConnectionManager", websocket: WebSocket, staff_id: int):
+        self.manager = manager
+        self.websocket = websocket
+        self.staff_id = staff_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=manager.queue_size)
+        self.writer: Optional[asyncio.Task] = None
+        self.closed = False
+
+    def start(self) -> None:
+        self.writer = asyncio.create_task(self._write_loop(), name=f"ws-writer-{self.staff_id}")
+
+    def offer(self, payload: str) -> None:
+        """Pune mesajul (deja serializat) în coadă, fără să aștepte socket-ul."""
+        if self.closed:
+            return
+        try:
+            self.queue.put_nowait((payload, time.perf_counter()))
+            return
+        except asyncio.QueueFull:
+            pass
+
+        policy = self.manager.slow_consumer_policy
+        self.manager.dropped += 1
+        if policy == "drop_newest":
+            return
+        if policy == "close":
+            self.closed = True
+            self.manager.closed_slow += 1
+            print(f"WS slow consumer closed: staff {self.staff_id}")
+            self.manager._spawn(self.manager._drop(self, code=1013, reason="Too slow"))
+            return
+
+        # drop_oldest: cel mai vechi mesaj face loc celui nou
+        self.queue.get_nowait()
+        self.queue.put_nowait((payload, time.perf_counter()))
+
+    async def _write_loop(self) -> None:
+        manager = self.manager
+        while True:
+            payload, queued_at = await self.queue.get()
+            try:
+                await asyncio.wait_for(self.websocket.send_text(payload), timeout=manager.send_timeout)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Socket mort / blocat - nu mai așteptăm timeout-ul TCP
+                print(f"WS send failed for staff {self.staff_id}: {type(e).__name__}")
+                manager.send_failures += 1
+                manager._spawn(manager._drop(self, code=1011, reason="Send failed"))
+                return
+            manager._record_send(time.perf_counter() - queued_at)
+
+
 class ConnectionManager:
     """Manager pentru conexiuni WebSocket active."""
 
-    def __init__(self):
-        # staff_id -> set of websockets
-        self.active_connections: Dict[int, Set[WebSocket]] = {}
+    def __init__(
+            self,
+            queue_size: int = 100,
+            send_timeout: float = 10,
+            slow_consumer_policy: str = "drop_oldest",
+            backend: Optional[PubSubBackend] = None
+    ):
+        # staff_id -> {websocket: conexiune}
+        self.active_connections: Dict[int, Dict[WebSocket, _Connection]] = {}
         self._lock = asyncio.Lock()
+        self._background: Set[asyncio.Task] = set()
+
+        self.queue_size = queue_size
+        self.send_timeout = send_timeout
+        self.slow_consumer_policy = slow_consumer_policy
+
+        # Fără start() (scripturi, bot) mesajele se livrează doar local
+        self.backend = backend or InMemoryPubSub()
+        self.backend.on_message = self._deliver
+
+        # Metrici
+        self.sent = 0
+        self.dropped = 0
+        self.closed_slow = 0
+        self.send_failures = 0
+        self._latency_total = 0.0
+        self._latency_max = 0.0
 
     async def connect(self, websocket: WebSocket, staff_id: int):
         """Conectează un staff member."""
         # NU mai face accept aici - se face în endpoint
 
+        connection = _Connection(self, websocket, staff_id)
         async with self._lock:
-            if staff_id not in self.active_connections:
-                self.active_connections[staff_id] = set()
-            self.active_connections[staff_id].add(websocket)
-
-        # Trimite confirmare DOAR dacă conexiunea e deschisă
-        try:
-            if websocket.client_state.value == 1:  # CONNECTED
-                await websocket.send_json({
-                    "type": "connection",
-                    "status": "connected",
-                    "staff_id": staff_id,
-                    "timestamp": datetime.utcnow().isoformat()
-                })
-        except Exception as e:
-            print(f"Error sending connection confirmation: {e}")
-            # Remove conexiunea dacă nu merge
-            await self.disconnect(websocket, staff_id)
-
-
+            self.active_connections.setdefault(staff_id, {})[websocket] = connection
+        connection.start()
+
+        # Confirmarea trece prin coadă, ca orice alt mesaj
+        connection.offer(self._serialize({
+            "type": "connection",
+            "status": "connected",
+            "staff_id": staff_id,
+            "timestamp": datetime.utcnow().isoformat()
+        }))
 
     async def disconnect(self, websocket: WebSocket, staff_id: int):
         """Deconectează un staff member."""
         async with self._lock:
-            if staff_id in self.active_connections:
-                self.active_connections[staff_id].discard(websocket)
-                if not self.active_connections[staff_id]:
-                    del self.active_connections[staff_id]
+            connections = self.active_connections.get(staff_id)
+            connection = connections.pop(websocket, None) if connections is not None else None
+            if connections is not None and not connections:
+                del self.active_connections[staff_id]
+
+        if connection is not None:
+            connection.closed = True
+            if connection.writer is not None and connection.writer is not asyncio.current_task():
+                connection.writer.cancel()
+
+    async def send_text(self, websocket: WebSocket, staff_id: int, text: str):
+        """Text către o singură conexiune (ex: pong), prin coada ei."""
+        connection = self.active_connections.get(staff_id, {}).get(websocket)
+        if connection is not None:
+            connection.offer(text)
 
     async def send_to_staff(self, staff_id: int, message: dict):
-        """Trimite mesaj către un staff specific."""
-        if staff_id in self.active_connections:
-            dead_connections = set()
-            for connection in self.active_connections[staff_id]:
-                try:
-                    await connection.send_json(message)
-                except Exception:
-                    dead_connections.add(connection)
-
-            # Curăță conexiunile moarte
-            for conn in dead_connections:
-                await self.disconnect(conn, staff_id)
+        """Trimite mesaj către un staff specific (toate tab-urile, din orice worker)."""
+        await self._publish(f"{staff_id}|{self._serialize(message)}")
 
     async def broadcast_to_all(self, message: dict):
-        """Trimite mesaj către toți staff conectați."""
-        tasks = []
-        for staff_id in self.active_connections:
-            tasks.append(self.send_to_staff(staff_id, message))
+        """Trimite mesaj către toți staff conectați - serializat o singură dată."""
+        await self._publish(f"*|{self._serialize(message)}")
+
+    async def start(self):
+        """Pornește abonarea la backend-ul pub/sub (lifespan)."""
+        await self.backend.start(self._deliver)
+
+    async def shutdown(self):
+        """Oprește abonarea și writer-ii (lifespan)."""
+        await self.backend.stop()
+        for staff_id, connections in list(self.active_connections.items()):
+            for websocket in list(connections):
+                await self.disconnect(websocket, staff_id)
+
+    async def _publish(self, message: str):
+        try:
+            await self.backend.publish(message)
+        except Exception as e:
+            # Notificarea nu are voie să strice operația care a generat-o
+            print(f"WS publish failed ({self.backend.name}): {type(e).__name__}: {e}")
+            self._deliver(message)
+
+    def _deliver(self, message: str) -> None:
+        """Mesaj primit de la backend: '<staff_id sau *>|<payload>' -> cozile locale."""
+        target, _, payload = message.partition("|")
+        if target == "*":
+            groups = list(self.active_connections.values())
+        else:
+            try:
+                groups = [self.active_connections.get(int(target), {})]
+            except ValueError:
+                return
+        for connections in groups:
+            for connection in list(connections.values()):
+                connection.offer(payload)
+
+    def metrics(self) -> dict:
+        queue_depths = [
+            connection.queue.qsize()
+            for connections in self.active_connections.values()
+            for connection in connections.values()
+        ]
+        return {
+            "sent": self.sent,
+            "dropped": self.dropped,
+            "closed_slow": self.closed_slow,
+            "send_failures": self.send_failures,
+            "queue_depth_total": sum(queue_depths),
+            "queue_depth_max": max(queue_depths, default=0),
+            "send_latency_ms_avg": round(self._latency_total / self.sent * 1000, 2) if self.sent else None,
+            "send_latency_ms_max": round(self._latency_max * 1000, 2),
+            "slow_consumer_policy": self.slow_consumer_policy,
+            "pubsub": self.backend.metrics()
+        }
+
+    async def _drop(self, connection: _Connection, code: int, reason: str):
+        await self.disconnect(connection.websocket, connection.staff_id)
+        try:
+            await asyncio.wait_for(connection.websocket.close(code=code, reason=reason), timeout=self.send_timeout)
+        except Exception:
+            pass
+
+    def _spawn(self, coroutine) -> None:
+        task = asyncio.create_task(coroutine)
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    def _record_send(self, latency: float) -> None:
+        self.sent += 1
+        self._latency_total += latency
+        self._latency_max = max(self._latency_max, latency)
 
-        if tasks:
-            await asyncio.gather(*tasks, return_exceptions=True)
+    @staticmethod
+    def _serialize(message: dict) -> str:
+        # Același format ca WebSocket.send_json
+        return json.dumps(message, separators=(",", ":"), ensure_ascii=False)
 
     async def send_order_notification(self, order_data: dict):
         """Trimite notificare pentru comandă nouă."""
@@ -156,7 +312,12 @@ class ConnectionManager:
 
 
 # Instanță globală
-notification_manager = ConnectionManager()
+notification_manager = ConnectionManager(
+    queue_size=default_config.ws_send_queue_size,
+    send_timeout=default_config.ws_send_timeout_seconds,
+    slow_consumer_policy=default_config.ws_slow_consumer_policy,
+    backend=create_backend(default_config.ws_pubsub_backend, default_config.ws_pubsub_channel)
+)
 
 
 # async def get_current_staff_ws(
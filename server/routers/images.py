@@ -0,0 +1,39 @@
+# server/routers/images.py
+"""
+Imagini redimensionate la cerere: /img/{w}x{h}/{path}
+(path relativ la static/webapp/img, ex: /img/480x480/product/SKU_uuid.png).
+"""
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import FileResponse, Response
+
+from services.dashboard.image_pipeline import InvalidImage
+from services.dashboard.image_resize_cache import image_resize_cache, parse_size
+
+router = APIRouter()
+
+# Cheia variantei se schimbă odată cu originalul - răspunsul nu se mai revalidează
+CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+@router.get("/img/{size}/{path:path}", include_in_schema=False)
+async def resized_image(request: Request, size: str, path: str):
+    """Varianta redimensionată (încadrată în w x h) din cache-ul pe disc."""
+    dimensions = parse_size(size)
+    if dimensions is None or dimensions not in image_resize_cache.sizes:
+        raise HTTPException(status_code=404, detail="Dimensiune nepermisă")
+
+    source = image_resize_cache.resolve_source(path)
+    if source is None:
+        raise HTTPException(status_code=404, detail="Imagine inexistentă")
+
+    try:
+        file_path, key = await image_resize_cache.get(dimensions, source)
+    except (FileNotFoundError, InvalidImage):
+        raise HTTPException(status_code=404, detail="Imagine inexistentă")
+
+    etag = f'"{key}"'
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+
+    return FileResponse(file_path, media_type=image_resize_cache.media_type(), headers=headers)
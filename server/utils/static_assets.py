@@ -0,0 +1,258 @@
+# server/utils/static_assets.py
+"""
+Fișiere statice cu amprentă (hash în nume) și precomprimate.
+
+- build() calculează hash-ul fiecărui asset (JS/CSS/imagini/fonturi) și
+  scrie variantele .br / .gz în build_dir (o singură dată per hash)
+- asset_url('/dashboard-static/css/dashboard.css') ->
+  '/dashboard-static/css/dashboard.1a2b3c4d5e.css'
+- URL-urile cu hash primesc Cache-Control immutable și varianta comprimată
+  acceptată de client (Accept-Encoding); restul se servesc ca înainte
+
+Directoarele cu upload-uri (imagini produse, PDF-uri) se exclud - se
+schimbă la runtime, iar amprenta se calculează la pornire.
+
+Build în avans (deploy):
+    python -m server.utils.static_assets
+"""
+from __future__ import annotations
+import gzip
+import hashlib
+import logging
+import mimetypes
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import anyio
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Scope
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - doar .gz
+    brotli = None
+
+try:
+    import zopfli.gzip
+except ImportError:  # pragma: no cover - gzip din stdlib
+    zopfli = None
+
+logger = logging.getLogger(__name__)
+
+FINGERPRINT_EXTENSIONS = {
+    ".js", ".css", ".svg", ".png", ".jpg", ".jpeg", ".gif", ".webp", ".ico",
+    ".woff", ".woff2", ".ttf", ".otf", ".json", ".map"
+}
+COMPRESS_EXTENSIONS = {".js", ".css", ".svg", ".json", ".map", ".ttf", ".otf"}
+
+# Varianta comprimată se păstrează doar dacă economisește măcar 10%
+MIN_COMPRESSION_RATIO = 0.9
+HASH_LENGTH = 10
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+@dataclass
+class Asset:
+    """Un fișier static cu amprentă."""
+    path: str  # relativ la directorul mount-ului: css/dashboard.css
+    hashed_path: str  # css/dashboard.1a2b3c4d5e.css
+    encodings: Dict[str, str] = field(default_factory=dict)  # "br" / "gzip" -> cale fișier comprimat
+
+
+def _hashed_name(path: str, digest: str) -> str:
+    stem, dot, extension = path.rpartition(".")
+    if not dot:
+        return f"{path}.{digest}"
+    return f"{stem}.{digest}.{extension}"
+
+
+def _write_atomic(target: Path, data: bytes) -> None:
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, target)
+
+
+def _compress(data: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(data, quality=11)
+    if zopfli is not None:
+        return zopfli.gzip.compress(data)
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+class AssetMount:
+    """Un director static montat sub un prefix URL, cu manifestul lui."""
+
+    def __init__(self, prefix: str, directory: str, build_dir: Path, exclude: Iterable[str] = ()):
+        self.prefix = prefix.rstrip("/")
+        self.directory = Path(directory)
+        self.build_dir = build_dir / self.prefix.strip("/")
+        self.exclude = tuple(item.strip("/") + "/" for item in exclude)
+
+        self.assets: Dict[str, Asset] = {}  # cale -> Asset
+        self.by_hashed_path: Dict[str, Asset] = {}  # cale cu hash -> Asset
+
+    def build(self, precompress: bool = True) -> Tuple[int, int]:
+        """Recalculează manifestul; returnează (asset-uri, fișiere comprimate scrise acum)."""
+        assets = {}
+        written = 0
+        encodings = ["br", "gzip"] if brotli is not None else ["gzip"]
+
+        for file_path, path in self._walk():
+            data = file_path.read_bytes()
+            digest = hashlib.sha256(data).hexdigest()[:HASH_LENGTH]
+            asset = Asset(path=path, hashed_path=_hashed_name(path, digest))
+
+            if precompress and file_path.suffix.lower() in COMPRESS_EXTENSIONS:
+                for encoding in encodings:
+                    suffix = ".br" if encoding == "br" else ".gz"
+                    target = self.build_dir / f"{asset.hashed_path}{suffix}"
+                    if not target.exists():
+                        compressed = _compress(data, encoding)
+                        if len(compressed) > len(data) * MIN_COMPRESSION_RATIO:
+                            continue
+                        _write_atomic(target, compressed)
+                        written += 1
+                    asset.encodings[encoding] = str(target)
+
+            assets[path] = asset
+
+        self.assets = assets
+        self.by_hashed_path = {asset.hashed_path: asset for asset in assets.values()}
+        return len(assets), written
+
+    def _walk(self) -> Iterator[Tuple[Path, str]]:
+        """(cale fișier, cale relativă) - directoarele excluse nu se parcurg deloc."""
+        for root, dirs, files in os.walk(self.directory):
+            relative = os.path.relpath(root, self.directory)
+            prefix = "" if relative == "." else relative.replace(os.sep, "/") + "/"
+            dirs[:] = sorted(name for name in dirs if not f"{prefix}{name}/".startswith(self.exclude))
+            for name in sorted(files):
+                if os.path.splitext(name)[1].lower() in FINGERPRINT_EXTENSIONS:
+                    yield Path(root) / name, prefix + name
+
+    def url(self, path: str) -> Optional[str]:
+        asset = self.assets.get(path.lstrip("/"))
+        if asset is None:
+            return None
+        return f"{self.prefix}/{asset.hashed_path}"
+
+
+class FingerprintedStaticFiles(StaticFiles):
+    """StaticFiles + URL-uri cu hash (immutable) și variante .br / .gz."""
+
+    def __init__(self, mount: AssetMount, **kwargs):
+        super().__init__(directory=str(mount.directory), **kwargs)
+        self.mount = mount
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        asset = self.mount.by_hashed_path.get(path.replace(os.sep, "/"))
+        if asset is None or scope["method"] not in ("GET", "HEAD"):
+            return await super().get_response(path, scope)
+
+        file_path = str(self.mount.directory / asset.path)
+        headers = {"Cache-Control": IMMUTABLE_CACHE_CONTROL}
+        if asset.encodings:
+            headers["Vary"] = "Accept-Encoding"
+            encoding = self._choose_encoding(scope, asset)
+            if encoding:
+                file_path = asset.encodings[encoding]
+                headers["Content-Encoding"] = encoding
+
+        try:
+            stat_result = await anyio.to_thread.run_sync(os.stat, file_path)
+        except FileNotFoundError:
+            # Fișierul s-a schimbat după build - URL-ul vechi nu mai e valid
+            return await super().get_response(path, scope)
+
+        media_type, _ = mimetypes.guess_type(asset.path)
+        response = FileResponse(
+            file_path,
+            stat_result=stat_result,
+            media_type=media_type or "application/octet-stream",
+            headers=headers
+        )
+        # If-None-Match / If-Modified-Since - 304, ca StaticFiles pentru restul fișierelor
+        if self.is_not_modified(response.headers, Headers(scope=scope)):
+            return NotModifiedResponse(response.headers)
+        return response
+
+    @staticmethod
+    def _choose_encoding(scope: Scope, asset: Asset) -> Optional[str]:
+        accept = ""
+        for name, value in scope.get("headers", []):
+            if name == b"accept-encoding":
+                accept = value.decode("latin-1").lower()
+                break
+        accepted = {
+            item.split(";")[0].strip()
+            for item in accept.split(",")
+            if not item.strip().endswith(("q=0", "q=0.0"))
+        }
+        for encoding in ("br", "gzip"):
+            if encoding in asset.encodings and encoding in accepted:
+                return encoding
+        return None
+
+
+class StaticAssets:
+    """Registrul mount-urilor statice; asset_url() pentru template-uri."""
+
+    def __init__(self, build_dir: Optional[str] = None, precompress: Optional[bool] = None):
+        # None => se citește lazy din DashboardConfig (evită import circular)
+        self._build_dir = build_dir
+        self._precompress = precompress
+        self.mounts: List[AssetMount] = []
+
+    @property
+    def build_dir(self) -> Path:
+        if self._build_dir is None:
+            from server.dashboard.config import default_config
+            self._build_dir = default_config.static_build_dir
+        return Path(self._build_dir)
+
+    @property
+    def precompress(self) -> bool:
+        if self._precompress is None:
+            from server.dashboard.config import default_config
+            self._precompress = default_config.static_precompress
+        return self._precompress
+
+    def static_files(self, prefix: str, directory: str, exclude: Iterable[str] = (), **kwargs) -> FingerprintedStaticFiles:
+        """Aplicația StaticFiles pentru app.mount(prefix, ...)."""
+        mount = AssetMount(prefix, directory, self.build_dir, exclude)
+        self.mounts.append(mount)
+        return FingerprintedStaticFiles(mount, **kwargs)
+
+    def build(self) -> None:
+        for mount in self.mounts:
+            count, written = mount.build(self.precompress)
+            logger.info(f"Static assets {mount.prefix}: {count} fingerprinted, {written} compressed")
+
+    def asset_url(self, url: str) -> str:
+        """URL-ul cu hash; neschimbat pentru fișierele necunoscute (sau înainte de build)."""
+        for mount in self.mounts:
+            if url.startswith(mount.prefix + "/"):
+                return mount.url(url[len(mount.prefix):]) or url
+        return url
+
+
+# Instanță globală; setările din DashboardConfig se citesc la prima folosire
+static_assets = StaticAssets()
+asset_url = static_assets.asset_url
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
+    # Mount-urile se înregistrează la importul aplicației, în instanța din pachet
+    import server_start  # noqa: F401
+    from server.utils.static_assets import static_assets as registered_assets
+
+    registered_assets.build()
@@ -2,6 +2,7 @@
 
 import sys
 import io
+import asyncio
 import logging
 
 from middleware.csrf import CSRFProtectMiddleware
@@ -12,10 +13,11 @@ sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
 
 from loging.srv_logging import setup_srv_logging
 from server.routers import include_versioned_routers
+from server.routers.images import router as image_router
+from server.utils.static_assets import static_assets
 from server.dashboard import setup_dashboard
 
 
@@ -26,10 +28,61 @@ async def lifespan(app: FastAPI):
     """
     # STARTUP - cod executat la pornirea aplicației
     # Poți adăuga aici inițializări
+    from utils.pdf_renderer import init_pdf_resources
+    from services.dashboard.pdf_render_pool import pdf_render_pool
+    init_pdf_resources()  # Fonturi + stiluri pentru randările din proces (fallback)
+    pdf_render_pool.start()
+
+    # Amprente + variante .br / .gz pentru asset_url()
+    await asyncio.to_thread(static_assets.build)
+
+    from services.dashboard.pdf_cleanup import pdf_cleanup_scheduler
+    pdf_cleanup_scheduler.start()
+
+    # Partiții lunare user_activities / user_interactions (create în avans + retenție)
+    from services.dashboard.activity_partitions import activity_partition_scheduler
+    activity_partition_scheduler.start()
+
+    # Rollup-ul zilnic de vânzări (rapoarte) - reîmprospătat în fundal
+    from services.dashboard.sales_rollup_service import sales_rollup_scheduler
+    sales_rollup_scheduler.start()
+
+    # Write-behind pentru ActivityService.track_interaction
+    from server.dashboard.config import default_config
+    from services.models.interaction_buffer import interaction_buffer
+    if default_config.activity_write_behind:
+        interaction_buffer.start()
+
+    # Prețurile catalogului în memorie (un singur SELECT); la eroare se încarcă la cerere
+    if default_config.price_cache_preload:
+        from cfg.depends import async_session_maker
+        from services.dashboard.price_cache import price_cache
+        try:
+            async with async_session_maker() as session:
+                await price_cache.warm(session)
+        except Exception as e:
+            logging.getLogger(__name__).warning(f"Price cache preload failed: {e}")
+
+    # Notificări WebSocket între worker-i (pub/sub)
+    from server.dashboard.websocket import notification_manager
+    await notification_manager.start()
 
     yield  # Aplicația rulează
 
     # SHUTDOWN - cod executat la oprirea aplicației
+    from services.dashboard.import_jobs import import_job_runner
+    await import_job_runner.shutdown()
+
+    await notification_manager.shutdown()
+
+    await pdf_cleanup_scheduler.shutdown()
+    await activity_partition_scheduler.shutdown()
+    await sales_rollup_scheduler.shutdown()
+    await pdf_render_pool.shutdown()
+
+    # Evenimentele rămase în buffer se scriu înainte de închiderea pool-ului DB
+    await interaction_buffer.shutdown()
+
     from cfg.depends import close_db_connections
     await close_db_connections()
 
@@ -57,7 +110,8 @@ app.add_middleware(CSRFProtectMiddleware)
 
 #==>   Mount pentru static aplicație de bază
 app.mount("/static",
-          StaticFiles(directory="static", html=True),
+          # Upload-urile (webapp/img) se schimbă la runtime - fără amprentă
+          static_assets.static_files("/static", "static", exclude=["webapp/img"], html=True),
           name="static"
           )
 
@@ -67,6 +121,9 @@ async def welcome() -> dict:
     return {"message": "404 page not found"}
 
 
+# Imagini redimensionate la cerere: /img/{w}x{h}/{path}
+app.include_router(image_router)
+
 # Înregistrarea dinamica: toate versiunile de API-uri GLOBALE
 include_versioned_routers(app)
 
@@ -0,0 +1,227 @@
+# services/dashboard/activity_partitions.py
+"""
+Partiții lunare pentru user_activities și user_interactions.
+
+Tabelele sunt partiționate RANGE (created_at), o partiție pe lună:
+user_interactions_p2026_10 = [2026-10-01, 2026-11-01) UTC.
+
+- partițiile pentru luna curentă + activity_partition_months_ahead se
+  creează în avans (un INSERT fără partiție potrivită ar eșua)
+- partițiile complet mai vechi decât activity_retention_days se șterg
+  (DROP TABLE - doar metadate, fără DELETE pe milioane de rânduri) sau se
+  detașează (activity_retention_action = "detach") și rămân tabele
+  separate, pentru arhivare (pg_dump) și ștergere manuală
+
+Interogările cu filtru pe created_at citesc doar partițiile din interval.
+
+Rulare manuală:
+    python -m services.dashboard.activity_partitions [--dry-run]
+"""
+from __future__ import annotations
+import asyncio
+import logging
+import re
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+from sqlalchemy import select, func, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from cfg import async_session_maker
+
+logger = logging.getLogger(__name__)
+
+PARTITIONED_TABLES = ("user_activities", "user_interactions")
+
+_PARTITION_SUFFIX = re.compile(r"_p(\d{4})_(\d{2})$")
+
+
+def month_start(value: date) -> date:
+    return value.replace(day=1)
+
+
+def add_months(value: date, months: int) -> date:
+    index = value.year * 12 + value.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    return f"{table}_p{month.year:04d}_{month.month:02d}"
+
+
+class ActivityPartitions:
+    """Creare în avans și retenție pentru partițiile lunare."""
+
+    # Cheie pentru pg_advisory_xact_lock - un singur worker face mentenanța
+    ADVISORY_LOCK_KEY = 731_002
+
+    @staticmethod
+    async def list_partitions(db: AsyncSession, table: str) -> Dict[date, str]:
+        """Partițiile lunare existente: prima zi a lunii -> nume tabel."""
+        result = await db.execute(
+            text(
+                "SELECT child.relname FROM pg_inherits "
+                "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+                "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+                "WHERE parent.relname = :table"
+            ),
+            {"table": table}
+        )
+        partitions = {}
+        for name in result.scalars().all():
+            match = _PARTITION_SUFFIX.search(name)
+            if match and name.startswith(f"{table}_p"):
+                partitions[date(int(match.group(1)), int(match.group(2)), 1)] = name
+        return partitions
+
+    @staticmethod
+    async def create_partition(db: AsyncSession, table: str, month: date) -> str:
+        name = partition_name(table, month)
+        await db.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {table} "
+            f"FOR VALUES FROM ('{month.isoformat()} 00:00:00+00') "
+            f"TO ('{add_months(month, 1).isoformat()} 00:00:00+00')"
+        ))
+        return name
+
+    @staticmethod
+    async def maintain(
+            db: AsyncSession,
+            months_ahead: int,
+            retention_days: int,
+            action: str = "drop",
+            dry_run: bool = False
+    ) -> Dict[str, List[str]]:
+        """
+        Creează partițiile lipsă și aplică retenția, într-o singură tranzacție.
+
+        Returns:
+            {"created": [...], "dropped": [...], "detached": [...]}
+        """
+        stats = {"created": [], "dropped": [], "detached": []}
+        if action not in ("drop", "detach"):
+            action = "drop"
+
+        await db.execute(select(func.pg_advisory_xact_lock(ActivityPartitions.ADVISORY_LOCK_KEY)))
+
+        today = datetime.now(timezone.utc).date()
+        current = month_start(today)
+        # O partiție expiră doar când toată luna e în afara retenției
+        cutoff = today - timedelta(days=retention_days)
+
+        for table in PARTITIONED_TABLES:
+            existing = await ActivityPartitions.list_partitions(db, table)
+
+            for offset in range(max(months_ahead, 0) + 1):
+                month = add_months(current, offset)
+                if month not in existing:
+                    if not dry_run:
+                        await ActivityPartitions.create_partition(db, table, month)
+                    stats["created"].append(partition_name(table, month))
+
+            if retention_days <= 0:
+                continue
+
+            for month, name in sorted(existing.items()):
+                if add_months(month, 1) > cutoff or month >= current:
+                    continue
+                if not dry_run:
+                    if action == "detach":
+                        await db.execute(text(f"ALTER TABLE {table} DETACH PARTITION {name}"))
+                    else:
+                        await db.execute(text(f"DROP TABLE {name}"))
+                stats["detached" if action == "detach" else "dropped"].append(name)
+
+        if dry_run:
+            await db.rollback()
+        else:
+            await db.commit()
+
+        return stats
+
+
+class ActivityPartitionScheduler:
+    """Mentenanța partițiilor la pornire și apoi periodic."""
+
+    def __init__(self, interval_hours: int, months_ahead: int, retention_days: int, action: str):
+        self.interval_hours = interval_hours
+        self.months_ahead = months_ahead
+        self.retention_days = retention_days
+        self.action = action
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is not None or self.interval_hours <= 0:
+            return
+        self._task = asyncio.create_task(self._loop(), name="activity-partitions")
+        logger.info(f"Activity partition maintenance every {self.interval_hours} h")
+
+    async def shutdown(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    async def run_once(self) -> Dict[str, List[str]]:
+        async with async_session_maker() as db:
+            stats = await ActivityPartitions.maintain(
+                db,
+                months_ahead=self.months_ahead,
+                retention_days=self.retention_days,
+                action=self.action
+            )
+        if any(stats.values()):
+            logger.info(
+                f"Activity partitions: created {stats['created'] or '-'}, "
+                f"dropped {stats['dropped'] or '-'}, detached {stats['detached'] or '-'}"
+            )
+        return stats
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Activity partition maintenance failed")
+            await asyncio.sleep(self.interval_hours * 3600)
+
+
+def _create_scheduler() -> ActivityPartitionScheduler:
+    from server.dashboard.config import default_config
+
+    return ActivityPartitionScheduler(
+        interval_hours=default_config.activity_partition_check_hours,
+        months_ahead=default_config.activity_partition_months_ahead,
+        retention_days=default_config.activity_retention_days,
+        action=default_config.activity_retention_action
+    )
+
+
+# Instanță globală
+activity_partition_scheduler = _create_scheduler()
+
+
+async def maintain_partitions_command(dry_run: bool = False):
+    scheduler = activity_partition_scheduler
+    print(f"Activity partitions (dry_run={dry_run}, retention={scheduler.retention_days} days, "
+          f"action={scheduler.action})...")
+
+    async with async_session_maker() as db:
+        stats = await ActivityPartitions.maintain(
+            db,
+            months_ahead=scheduler.months_ahead,
+            retention_days=scheduler.retention_days,
+            action=scheduler.action,
+            dry_run=dry_run
+        )
+
+    for key, names in stats.items():
+        print(f"- {key}: {', '.join(names) or '-'}")
+
+
+if __name__ == "__main__":
+    import sys
+
+    asyncio.run(maintain_partitions_command(dry_run="--dry-run" in sys.argv))
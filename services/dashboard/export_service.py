@@ -0,0 +1,234 @@
+# services/dashboard/export_service.py
+"""
+Export în flux (CSV / XLSX) pentru listele și rapoartele din dashboard.
+
+Rândurile se citesc cu AsyncSession.stream() (cursor pe server, pe
+partiții) și se scriu imediat în răspuns - nu se încarcă obiecte ORM și
+nici tot rezultatul în memorie:
+- CSV: fiecare partiție devine un chunk din StreamingResponse
+- XLSX: xlsxwriter în modul constant_memory scrie într-un fișier temporar,
+  care apoi se trimite pe bucăți
+
+Query-ul primit trebuie să selecteze coloane (nu entități); sesiunea e
+deschisă de generator, pentru că răspunsul se trimite după ce handler-ul
+(și sesiunea din get_db) s-au încheiat.
+"""
+from __future__ import annotations
+import asyncio
+import csv
+import enum
+import io
+import logging
+import os
+import tempfile
+from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, AsyncIterator, Callable, List, Optional
+from urllib.parse import quote
+
+import xlsxwriter
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+
+from cfg import async_session_maker
+from server.dashboard.utils.timezone import utc_to_local
+
+logger = logging.getLogger(__name__)
+
+
+FORMAT_CSV = "csv"
+FORMAT_XLSX = "xlsx"
+
+MEDIA_TYPES = {
+    FORMAT_CSV: "text/csv; charset=utf-8",
+    FORMAT_XLSX: "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+}
+
+
+@dataclass
+class ExportColumn:
+    """
+    O coloană din export.
+
+    key: numele coloanei din rândul SELECT (label)
+    header: antetul din fișier
+    formatter: conversie opțională a valorii (ex. enum -> text)
+    """
+    key: str
+    header: str
+    formatter: Optional[Callable[[Any], Any]] = None
+
+
+class ExportService:
+    """Export CSV / XLSX în flux."""
+
+    # Rânduri citite din DB per partiție
+    PARTITION_SIZE = 1000
+
+    # Bucăți pentru trimiterea fișierului XLSX
+    FILE_CHUNK_SIZE = 64 * 1024
+
+    @staticmethod
+    def check_allowed(model_name: str) -> None:
+        """Verifică ModelConfig.allow_export și că exportul e activat global."""
+        from server.dashboard.config import default_config, STAFF_MODELS_CONFIG
+
+        model_config = STAFF_MODELS_CONFIG.get(model_name)
+        if not default_config.enable_export or (model_config and not model_config.allow_export):
+            raise HTTPException(status_code=403, detail="Exportul nu este permis pentru această secțiune")
+
+    @staticmethod
+    def normalize_format(export_format: str) -> str:
+        export_format = (export_format or FORMAT_CSV).lower()
+        if export_format in ("excel", "xls"):
+            export_format = FORMAT_XLSX
+        if export_format not in MEDIA_TYPES:
+            raise HTTPException(status_code=400, detail="Format invalid. Acceptăm csv sau xlsx")
+        return export_format
+
+    @staticmethod
+    def stream(
+            stmt: Any,
+            columns: List[ExportColumn],
+            filename: str,
+            export_format: str = FORMAT_CSV,
+            max_rows: Optional[int] = None
+    ) -> StreamingResponse:
+        """
+        Răspuns streaming pentru query-ul dat.
+
+        Args:
+            stmt: SELECT pe coloane etichetate, cu filtrele și sortarea listei
+            filename: fără extensie
+            max_rows: implicit DashboardConfig.export_max_rows
+        """
+        from server.dashboard.config import default_config
+
+        export_format = ExportService.normalize_format(export_format)
+        limit = max_rows or default_config.export_max_rows
+        stmt = stmt.limit(limit)
+
+        if export_format == FORMAT_XLSX:
+            body = ExportService._xlsx_chunks(stmt, columns)
+        else:
+            body = ExportService._csv_chunks(stmt, columns)
+
+        full_name = f"{filename}_{datetime.now().strftime('%Y%m%d_%H%M')}.{export_format}"
+        return StreamingResponse(
+            body,
+            media_type=MEDIA_TYPES[export_format],
+            headers={
+                "Content-Disposition": f"attachment; filename*=UTF-8''{quote(full_name)}",
+                "Cache-Control": "no-store"
+            }
+        )
+
+    # ==================== SURSE ====================
+
+    @staticmethod
+    async def _partitions(stmt: Any) -> AsyncIterator[List[Any]]:
+        """Rândurile query-ului pe partiții, citite cu cursor pe server."""
+        async with async_session_maker() as session:
+            result = await session.stream(
+                stmt.execution_options(yield_per=ExportService.PARTITION_SIZE)
+            )
+            async for partition in result.partitions():
+                yield partition
+
+    @staticmethod
+    def _row_values(row: Any, columns: List[ExportColumn], for_excel: bool) -> List[Any]:
+        mapping = row._mapping
+        values = []
+        for column in columns:
+            value = mapping[column.key]
+            if column.formatter is not None:
+                value = column.formatter(value)
+            values.append(ExportService._plain(value, for_excel))
+        return values
+
+    @staticmethod
+    def _plain(value: Any, for_excel: bool) -> Any:
+        """Valori scriabile în CSV / XLSX (ore locale, enum -> valoare)."""
+        if value is None:
+            return "" if not for_excel else None
+        if isinstance(value, enum.Enum):
+            return value.value
+        if isinstance(value, datetime):
+            local = utc_to_local(value).replace(tzinfo=None)
+            return local if for_excel else local.strftime("%d.%m.%Y %H:%M")
+        if isinstance(value, date):
+            return value if for_excel else value.strftime("%d.%m.%Y")
+        if isinstance(value, Decimal):
+            return float(value)
+        return value
+
+    # ==================== CSV ====================
+
+    @staticmethod
+    async def _csv_chunks(stmt: Any, columns: List[ExportColumn]) -> AsyncIterator[bytes]:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+
+        # BOM - Excel deschide corect diacriticele
+        buffer.write("\ufeff")
+        writer.writerow([column.header for column in columns])
+
+        rows = 0
+        async for partition in ExportService._partitions(stmt):
+            for row in partition:
+                writer.writerow(ExportService._row_values(row, columns, for_excel=False))
+            rows += len(partition)
+
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate(0)
+
+        if buffer.tell():
+            yield buffer.getvalue().encode("utf-8")
+        logger.info(f"CSV export finished: {rows} rows")
+
+    # ==================== XLSX ====================
+
+    @staticmethod
+    async def _xlsx_chunks(stmt: Any, columns: List[ExportColumn]) -> AsyncIterator[bytes]:
+        fd, path = tempfile.mkstemp(suffix=".xlsx")
+        os.close(fd)
+
+        try:
+            workbook = xlsxwriter.Workbook(path, {
+                "constant_memory": True,
+                "tmpdir": os.path.dirname(path),
+                "default_date_format": "dd.mm.yyyy hh:mm",
+                "remove_timezone": True
+            })
+            worksheet = workbook.add_worksheet("Export")
+            header_format = workbook.add_format({"bold": True, "bg_color": "#4472C4", "font_color": "white"})
+
+            for col_num, column in enumerate(columns):
+                worksheet.write(0, col_num, column.header, header_format)
+                worksheet.set_column(col_num, col_num, max(12, len(column.header) + 2))
+
+            # constant_memory: rândurile se scriu strict în ordine și se eliberează imediat
+            row_num = 1
+            async for partition in ExportService._partitions(stmt):
+                for row in partition:
+                    worksheet.write_row(row_num, 0, ExportService._row_values(row, columns, for_excel=True))
+                    row_num += 1
+                await asyncio.sleep(0)
+
+            # Arhivarea finală (zip) nu se face pe event loop
+            await asyncio.to_thread(workbook.close)
+            logger.info(f"XLSX export finished: {row_num - 1} rows")
+
+            with open(path, "rb") as handle:
+                while True:
+                    chunk = await asyncio.to_thread(handle.read, ExportService.FILE_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    yield chunk
+        finally:
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
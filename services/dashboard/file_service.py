@@ -2,12 +2,12 @@
 
 from __future__ import annotations
 import os
-import uuid
 from pathlib import Path
-from typing import Optional, List, Tuple
-from PIL import Image
+from typing import List, Tuple
 from fastapi import UploadFile, HTTPException
 
+from services.dashboard.image_pipeline import ImagePipeline, ImageTooLarge, InvalidImage, delete_variants
+
 ALLOWED_EXTENSIONS = {".png", ".jpg", ".jpeg"}
 MAX_FILE_SIZE = 2 * 1024 * 1024  # 2MB
 
@@ -17,32 +17,30 @@ class FileService:
 
     @staticmethod
     def validate_image(file: UploadFile) -> None:
-        """Validează fișier imagine."""
-        # Verifică extensia
-        file_ext = Path(file.filename).suffix.lower()
+        """
+        Validează extensia. Dimensiunea se verifică la scriere, iar conținutul
+        (PIL) în thread - vezi ImagePipeline.
+        """
+        file_ext = Path(file.filename or "").suffix.lower()
         if file_ext not in ALLOWED_EXTENSIONS:
             raise HTTPException(
                 status_code=400,
                 detail=f"Format nepermis. Formate acceptate: {', '.join(ALLOWED_EXTENSIONS)}"
             )
 
-        # Verifică dimensiunea
-        file.file.seek(0, 2)  # Mergi la sfârșitul fișierului
-        file_size = file.file.tell()
-        file.file.seek(0)  # Revino la început
+    @staticmethod
+    async def _save_image(file: UploadFile, directory: str, prefix: str) -> Tuple[str, str, int]:
+        """Upload în flux + variante redimensionate; returnează (path, filename, size)."""
+        FileService.validate_image(file)
 
-        if file_size > MAX_FILE_SIZE:
+        try:
+            return await ImagePipeline.save(file, directory, prefix, MAX_FILE_SIZE)
+        except ImageTooLarge:
             raise HTTPException(
                 status_code=400,
                 detail=f"Fișier prea mare. Maxim permis: {MAX_FILE_SIZE / 1024 / 1024}MB"
             )
-
-        # Verifică dacă e imagine validă
-        try:
-            img = Image.open(file.file)
-            img.verify()
-            file.file.seek(0)
-        except:
+        except InvalidImage:
             raise HTTPException(
                 status_code=400,
                 detail="Fișier corupt sau format invalid"
@@ -54,21 +52,7 @@ class FileService:
             product_sku: str
     ) -> Tuple[str, str, int]:
         """Salvează imagine produs și returnează (path, filename, size)."""
-        FileService.validate_image(file)
-
-        # Generează nume unic
-        file_ext = Path(file.filename).suffix.lower()
-        unique_filename = f"{product_sku}_{uuid.uuid4()}{file_ext}"
-
-        # Calea completă
-        save_path = Path("static/webapp/img/product") / unique_filename
-
-        # Salvează fișierul
-        file_content = await file.read()
-        with open(save_path, "wb") as f:
-            f.write(file_content)
-
-        return str(save_path), unique_filename, len(file_content)
+        return await FileService._save_image(file, "static/webapp/img/product", product_sku)
 
     @staticmethod
     async def save_blog_image(
@@ -76,18 +60,7 @@ class FileService:
             post_slug: str
     ) -> Tuple[str, str, int]:
         """Salvează imagine blog și returnează (path, filename, size)."""
-        FileService.validate_image(file)
-
-        file_ext = Path(file.filename).suffix.lower()
-        unique_filename = f"{post_slug}_{uuid.uuid4()}{file_ext}"
-
-        save_path = Path("static/webapp/img/blog") / unique_filename
-
-        file_content = await file.read()
-        with open(save_path, "wb") as f:
-            f.write(file_content)
-
-        return str(save_path), unique_filename, len(file_content)
+        return await FileService._save_image(file, "static/webapp/img/blog", post_slug)
 
     @staticmethod
     async def save_category_image(
@@ -95,18 +68,8 @@ class FileService:
             category_slug: str
     ) -> str:
         """Salvează imagine categorie și returnează path."""
-        FileService.validate_image(file)
-
-        file_ext = Path(file.filename).suffix.lower()
-        unique_filename = f"{category_slug}_{uuid.uuid4()}{file_ext}"
-
-        save_path = Path("static/webapp/img/category") / unique_filename
-
-        file_content = await file.read()
-        with open(save_path, "wb") as f:
-            f.write(file_content)
-
-        return str(save_path)
+        save_path, _, _ = await FileService._save_image(file, "static/webapp/img/category", category_slug)
+        return save_path
 
     @staticmethod
     def delete_image(image_path: str) -> bool:
@@ -114,6 +77,7 @@ class FileService:
         try:
             if os.path.exists(image_path):
                 os.remove(image_path)
+                delete_variants(image_path)
                 return True
             return False
         except Exception:
@@ -0,0 +1,249 @@
+# services/dashboard/image_pipeline.py
+"""
+Pipeline pentru upload-ul imaginilor (produse, blog, categorii).
+
+1. upload-ul se scrie pe disc în flux, pe bucăți (aiofiles), într-un fișier
+   temporar - dimensiunea se verifică în timpul scrierii, fără să se țină
+   tot fișierul în memorie
+2. verificarea (PIL) și generarea variantelor rulează într-un thread,
+   nu în event loop
+3. variantele (sm / md / lg) se salvează în thumbs/ lângă original, în
+   formatul din config (WebP sau JPEG)
+
+În template-uri `image_variant(path, "md")` întoarce URL-ul variantei, cu
+fallback la original pentru imaginile vechi (fără variante).
+
+Generare variante pentru imaginile existente:
+    python -m services.dashboard.image_pipeline static/webapp/img/product
+"""
+from __future__ import annotations
+import asyncio
+import os
+import uuid
+from contextlib import suppress
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import aiofiles
+from PIL import Image, ImageOps
+
+# nume -> (lățime, înălțime) maxime; raportul de aspect se păstrează
+VARIANT_SIZES: Dict[str, Tuple[int, int]] = {
+    "sm": (160, 160),  # liste în dashboard
+    "md": (480, 480),  # grile (galerie, catalog)
+    "lg": (1200, 1200),  # pagina de produs / articol
+}
+VARIANTS_DIR = "thumbs"
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+
+class InvalidImage(Exception):
+    """Fișierul nu e o imagine validă."""
+
+
+class ImageTooLarge(Exception):
+    """Upload-ul depășește dimensiunea maximă."""
+
+
+def variant_settings() -> Tuple[str, int]:
+    from server.dashboard.config import default_config
+
+    image_format = default_config.image_variant_format.lower()
+    if image_format not in ("webp", "jpeg"):
+        image_format = "webp"
+    return image_format, default_config.image_variant_quality
+
+
+def variant_path(image_path: str, name: str) -> str:
+    """static/.../product/x.png -> static/.../product/thumbs/x_md.webp"""
+    image_format, _ = variant_settings()
+    extension = "jpg" if image_format == "jpeg" else image_format
+    path = Path(image_path)
+    return str(path.parent / VARIANTS_DIR / f"{path.stem}_{name}.{extension}")
+
+
+def image_variant_url(image_path: str, name: str = "md") -> str:
+    """URL-ul variantei redimensionate; originalul dacă varianta nu există."""
+    if not image_path:
+        return ""
+    candidate = variant_path(image_path, name)
+    return f"/{candidate}" if os.path.exists(candidate) else f"/{image_path}"
+
+
+def _verify(image_path: str) -> None:
+    try:
+        with Image.open(image_path) as image:
+            image.verify()
+    except Exception as e:
+        raise InvalidImage(str(e)) from e
+
+
+def _load_for_resize(image_path: str, max_size: Tuple[int, int], image_format: str) -> Image.Image:
+    """Deschide imaginea orientată corect, în modul potrivit formatului de ieșire."""
+    with Image.open(image_path) as image:
+        # JPEG: decodare direct la rezoluție redusă (mult mai rapid)
+        image.draft("RGB", max_size)
+        image = ImageOps.exif_transpose(image)
+
+    if image_format == "jpeg" and image.mode != "RGB":
+        image = image.convert("RGBA")
+        background = Image.new("RGB", image.size, (255, 255, 255))
+        background.paste(image, mask=image.getchannel("A"))
+        image = background
+    elif image.mode not in ("RGB", "RGBA"):
+        image = image.convert("RGBA")
+    return image
+
+
+def _save_atomic(image: Image.Image, target: str, image_format: str, quality: int) -> None:
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    tmp_target = f"{target}.tmp"
+    image.save(tmp_target, format=image_format.upper(), quality=quality, optimize=True)
+    os.replace(tmp_target, target)
+
+
+def generate_variants(image_path: str) -> List[str]:
+    """
+    Verifică imaginea și generează variantele (sincron - rulează în thread).
+
+    Raises:
+        InvalidImage: fișier corupt sau format necunoscut
+    """
+    image_format, quality = variant_settings()
+    _verify(image_path)
+
+    created = []
+    image = _load_for_resize(image_path, max(VARIANT_SIZES.values()), image_format)
+
+    # De la mare la mic: fiecare variantă pornește din precedenta
+    for name, size in sorted(VARIANT_SIZES.items(), key=lambda item: -item[1][0]):
+        image.thumbnail(size, Image.Resampling.LANCZOS)
+        target = variant_path(image_path, name)
+        _save_atomic(image, target, image_format, quality)
+        created.append(target)
+
+    return created
+
+
+def resize_image(image_path: str, target: str, size: Tuple[int, int]) -> int:
+    """
+    Redimensionează (încadrat în size, fără mărire) și salvează în target.
+    Returnează dimensiunea fișierului rezultat.
+
+    Raises:
+        InvalidImage: fișier corupt sau format necunoscut
+    """
+    image_format, quality = variant_settings()
+    _verify(image_path)
+
+    image = _load_for_resize(image_path, size, image_format)
+    image.thumbnail(size, Image.Resampling.LANCZOS)
+    _save_atomic(image, target, image_format, quality)
+    return os.path.getsize(target)
+
+
+def variant_media_type() -> str:
+    image_format, _ = variant_settings()
+    return f"image/{image_format}"
+
+
+def delete_variants(image_path: str) -> int:
+    """Șterge variantele unei imagini (originalul rămâne)."""
+    deleted = 0
+    for name in VARIANT_SIZES:
+        with suppress(FileNotFoundError):
+            os.remove(variant_path(image_path, name))
+            deleted += 1
+    return deleted
+
+
+class ImagePipeline:
+    """Upload în flux + validare și variante în thread pool."""
+
+    @staticmethod
+    async def stream_to_disk(file, target: Path, max_size: int) -> int:
+        """
+        Scrie upload-ul în `target.part` pe bucăți.
+
+        Raises:
+            ImageTooLarge: depășește max_size (fișierul parțial se șterge)
+        """
+        tmp_path = target.with_name(target.name + ".part")
+        size = 0
+        try:
+            async with aiofiles.open(tmp_path, "wb") as output:
+                while True:
+                    chunk = await file.read(UPLOAD_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    size += len(chunk)
+                    if size > max_size:
+                        raise ImageTooLarge(f"{size} > {max_size}")
+                    await output.write(chunk)
+        except BaseException:
+            with suppress(FileNotFoundError):
+                await asyncio.to_thread(os.remove, tmp_path)
+            raise
+        return size
+
+    @staticmethod
+    async def save(file, directory: str, prefix: str, max_size: int) -> Tuple[str, str, int]:
+        """
+        Salvează upload-ul ca `{prefix}_{uuid}{ext}` în directory și generează variantele.
+
+        Returns:
+            (path, filename, size)
+
+        Raises:
+            ImageTooLarge / InvalidImage
+        """
+        extension = Path(file.filename).suffix.lower()
+        filename = f"{prefix}_{uuid.uuid4()}{extension}"
+        target = Path(directory) / filename
+        tmp_path = target.with_name(target.name + ".part")
+
+        size = await ImagePipeline.stream_to_disk(file, target, max_size)
+        try:
+            # Originalul se mută la locul final, apoi variantele; la eroare se șterg ambele
+            await asyncio.to_thread(ImagePipeline._finalize, str(tmp_path), str(target))
+        except BaseException:
+            with suppress(FileNotFoundError):
+                await asyncio.to_thread(os.remove, tmp_path)
+            raise
+
+        return str(target), filename, size
+
+    @staticmethod
+    def _finalize(tmp_path: str, target: str) -> None:
+        os.replace(tmp_path, target)
+        try:
+            generate_variants(target)
+        except BaseException:
+            delete_variants(target)
+            with suppress(FileNotFoundError):
+                os.remove(target)
+            raise
+
+
+def _backfill(directory: str) -> None:
+    """Generează variantele lipsă pentru imaginile existente."""
+    created = failed = 0
+    for entry in sorted(Path(directory).iterdir()):
+        if not entry.is_file() or entry.suffix.lower() not in (".png", ".jpg", ".jpeg"):
+            continue
+        if all(os.path.exists(variant_path(str(entry), name)) for name in VARIANT_SIZES):
+            continue
+        try:
+            generate_variants(str(entry))
+            created += 1
+        except Exception as e:
+            failed += 1
+            print(f"  - {entry}: {e}")
+    print(f"{directory}: {created} images processed, {failed} failed")
+
+
+if __name__ == "__main__":
+    import sys
+
+    for arg in sys.argv[1:]:
+        _backfill(arg)
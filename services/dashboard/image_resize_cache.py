@@ -0,0 +1,208 @@
+# services/dashboard/image_resize_cache.py
+"""
+Imagini redimensionate la cerere (/img/{w}x{h}/{path}) cu cache LRU pe disc.
+
+- path e relativ la static/webapp/img (ex: product/SKU_uuid.png); sunt
+  permise doar directoarele din SOURCE_DIRS și dimensiunile din config
+- varianta se generează o singură dată, într-un thread; cererile simultane
+  pentru aceeași variantă așteaptă aceeași generare
+- cheia include mtime-ul originalului: un fișier înlocuit produce altă variantă
+- cache-ul e limitat în MB; la depășire se șterg variantele folosite cel mai demult
+"""
+from __future__ import annotations
+import asyncio
+import hashlib
+import logging
+import os
+import re
+from collections import OrderedDict
+from contextlib import suppress
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from services.dashboard.image_pipeline import resize_image, variant_media_type, variant_settings
+
+logger = logging.getLogger(__name__)
+
+IMAGE_ROOT = Path("static/webapp/img")
+SOURCE_DIRS = ("product", "blog", "category")
+SOURCE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".webp")
+
+_SIZE_PATTERN = re.compile(r"^(\d{1,4})x(\d{1,4})$")
+
+
+def parse_size(size: str) -> Optional[Tuple[int, int]]:
+    """'480x480' -> (480, 480); None pentru un format invalid."""
+    match = _SIZE_PATTERN.match(size)
+    if not match:
+        return None
+    return int(match.group(1)), int(match.group(2))
+
+
+def image_resized_url(image_path: str, width: int, height: int) -> str:
+    """
+    URL-ul redimensionat pentru o cale din DB (static/webapp/img/...).
+    Căile din afara IMAGE_ROOT rămân neschimbate.
+    """
+    if not image_path:
+        return ""
+    try:
+        relative = Path(image_path).relative_to(IMAGE_ROOT)
+    except ValueError:
+        return f"/{image_path}"
+    return f"/img/{width}x{height}/{relative.as_posix()}"
+
+
+class ImageResizeCache:
+    """Cache LRU pe disc pentru variantele redimensionate."""
+
+    def __init__(self, directory: str, max_bytes: int, sizes: Iterable[str]):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.sizes = {size for size in (parse_size(value) for value in sizes) if size}
+
+        # cheie -> dimensiune fișier; ordinea = ordinea folosirii (LRU la început)
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        self._total_bytes = 0
+        self._loaded = False
+        self._load_lock = asyncio.Lock()
+        self._pending: Dict[str, asyncio.Future] = {}
+
+        # Metrici
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def resolve_source(self, path: str) -> Optional[Path]:
+        """Calea originalului sau None dacă e în afara directoarelor permise."""
+        relative = Path(path)
+        if relative.is_absolute() or ".." in relative.parts or len(relative.parts) < 2:
+            return None
+        if relative.parts[0] not in SOURCE_DIRS:
+            return None
+        if relative.suffix.lower() not in SOURCE_EXTENSIONS:
+            return None
+        return IMAGE_ROOT / relative
+
+    async def get(self, size: Tuple[int, int], source: Path) -> Tuple[Path, str]:
+        """
+        Varianta din cache (generată dacă lipsește).
+
+        Returns:
+            (cale fișier, cheie - folosită ca ETag)
+
+        Raises:
+            FileNotFoundError: originalul nu există
+            InvalidImage: originalul nu e o imagine validă
+        """
+        if not self._loaded:
+            async with self._load_lock:
+                if not self._loaded:
+                    await asyncio.to_thread(self._load_index)
+
+        stat = await asyncio.to_thread(os.stat, source)
+        key = self._key(size, source, stat.st_mtime_ns)
+        target = self._path_for(key)
+
+        if key in self._entries and await asyncio.to_thread(target.exists):
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return target, key
+
+        task = self._pending.get(key)
+        if task is None:
+            self.misses += 1
+            task = asyncio.ensure_future(asyncio.to_thread(resize_image, str(source), str(target), size))
+            self._pending[key] = task
+            task.add_done_callback(lambda _: self._pending.pop(key, None))
+            task.add_done_callback(lambda done: self._on_created(key, done))
+        await asyncio.shield(task)
+        return target, key
+
+    @staticmethod
+    def media_type() -> str:
+        return variant_media_type()
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "size_mb": round(self._total_bytes / 1024 / 1024, 1),
+            "max_mb": round(self.max_bytes / 1024 / 1024, 1),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "generating": len(self._pending)
+        }
+
+    def _key(self, size: Tuple[int, int], source: Path, mtime_ns: int) -> str:
+        image_format, quality = variant_settings()
+        raw = f"{size[0]}x{size[1]}:{source.as_posix()}:{mtime_ns}:{image_format}:{quality}"
+        return hashlib.sha1(raw.encode()).hexdigest()
+
+    def _path_for(self, key: str) -> Path:
+        image_format, _ = variant_settings()
+        extension = "jpg" if image_format == "jpeg" else image_format
+        return self.directory / key[:2] / f"{key}.{extension}"
+
+    def _on_created(self, key: str, task: asyncio.Future) -> None:
+        if task.cancelled() or task.exception() is not None:
+            return
+        previous = self._entries.pop(key, 0)
+        self._entries[key] = task.result()
+        self._total_bytes += task.result() - previous
+        if self._total_bytes > self.max_bytes:
+            victims = self._select_victims()
+            if victims:
+                asyncio.ensure_future(asyncio.to_thread(self._remove_files, victims))
+
+    def _select_victims(self) -> list:
+        """Scoate din index cele mai vechi intrări până sub limită (90%, ca să nu se evacueze la fiecare fișier)."""
+        victims = []
+        target_bytes = self.max_bytes * 0.9
+        while self._total_bytes > target_bytes and len(self._entries) > 1:
+            key, size = self._entries.popitem(last=False)
+            self._total_bytes -= size
+            victims.append(self._path_for(key))
+        self.evictions += len(victims)
+        return victims
+
+    @staticmethod
+    def _remove_files(paths: list) -> None:
+        for path in paths:
+            with suppress(FileNotFoundError):
+                os.remove(path)
+
+    def _load_index(self) -> None:
+        """Indexul LRU la pornire, din fișierele existente (ordonate după mtime)."""
+        files = []
+        if self.directory.exists():
+            for bucket in os.scandir(self.directory):
+                if not bucket.is_dir():
+                    continue
+                for entry in os.scandir(bucket.path):
+                    if entry.is_file() and not entry.name.endswith(".tmp"):
+                        stat = entry.stat()
+                        files.append((stat.st_mtime, Path(entry.name).stem, stat.st_size))
+
+        for _, key, size in sorted(files):
+            self._entries[key] = size
+            self._total_bytes += size
+        self._loaded = True
+        logger.info(f"Image cache: {len(self._entries)} files, {self._total_bytes / 1024 / 1024:.1f} MB")
+
+        if self._total_bytes > self.max_bytes:
+            self._remove_files(self._select_victims())
+
+
+def _create_cache() -> ImageResizeCache:
+    from server.dashboard.config import default_config
+
+    return ImageResizeCache(
+        directory=default_config.image_resize_cache_dir,
+        max_bytes=default_config.image_resize_cache_mb * 1024 * 1024,
+        sizes=default_config.image_resize_sizes
+    )
+
+
+# Instanță globală
+image_resize_cache = _create_cache()
@@ -0,0 +1,209 @@
+# services/dashboard/import_jobs.py
+"""
+Job-uri de import rulate în fundal (în procesul serverului).
+
+Request-ul /import/process doar înregistrează job-ul și răspunde imediat;
+importul rulează într-un task asyncio cu sesiune DB proprie:
+- numărul de job-uri simultane e limitat (o conexiune din pool per job)
+- fiecare chunk e comis separat - un timeout / restart nu pierde tot
+- progresul se citește prin polling (GET /import/jobs/{id}) și se trimite
+  și pe websocket-ul de notificări al staff-ului care a pornit importul
+
+Registry-ul e în memorie: job-urile terminate se păstrează JOB_RETENTION.
+"""
+from __future__ import annotations
+import asyncio
+import logging
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict, List, Any, Optional
+
+from cfg import engine, async_session_maker
+from services.dashboard.product_import_service import ProductImportService
+
+logger = logging.getLogger(__name__)
+
+
+JOB_PENDING = "pending"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+
+# Jumătate din pool rămâne pentru request-uri (pool_size=5 -> 2 job-uri simultane)
+MAX_CONCURRENT_JOBS = max(1, engine.pool.size() // 2)
+
+JOB_RETENTION = timedelta(hours=1)
+
+
+@dataclass
+class ImportJob:
+    """Starea unui import în fundal."""
+    id: str
+    staff_id: int
+    total: int
+    status: str = JOB_PENDING
+    processed: int = 0
+    success: int = 0
+    failed: int = 0
+    details: List[Dict[str, Any]] = field(default_factory=list)
+    error: Optional[str] = None
+    created_at: datetime = field(default_factory=datetime.utcnow)
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in (JOB_COMPLETED, JOB_FAILED)
+
+    def to_dict(self, include_details: bool = False) -> Dict[str, Any]:
+        data = {
+            "id": self.id,
+            "status": self.status,
+            "total": self.total,
+            "processed": self.processed,
+            "progress": round(self.processed * 100 / self.total, 1) if self.total else 100.0,
+            "success": self.success,
+            "failed": self.failed,
+            "error": self.error,
+            "created_at": self.created_at.isoformat(),
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None
+        }
+        if include_details:
+            data["results"] = {
+                "success": self.success,
+                "failed": self.failed,
+                "details": sorted(self.details, key=lambda detail: detail['row'])
+            }
+        return data
+
+
+class ImportJobRunner:
+    """Registry + execuție pentru job-urile de import."""
+
+    def __init__(self, max_concurrent: int = MAX_CONCURRENT_JOBS):
+        self._jobs: Dict[str, ImportJob] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+
+    def submit(
+            self,
+            staff_id: int,
+            products_data: List[Dict[str, Any]],
+            default_category_id: Optional[int] = None,
+            vendor_company_id: int = 1
+    ) -> ImportJob:
+        """Înregistrează job-ul și pornește task-ul (rulează când se eliberează un slot)."""
+        self._purge_finished()
+
+        job = ImportJob(id=uuid.uuid4().hex, staff_id=staff_id, total=len(products_data))
+        self._jobs[job.id] = job
+
+        task = asyncio.create_task(
+            self._run(job, products_data, default_category_id, vendor_company_id),
+            name=f"import-job-{job.id}"
+        )
+        self._tasks[job.id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(job.id, None))
+
+        logger.info(f"Import job {job.id} queued: {job.total} rows (staff {staff_id})")
+        return job
+
+    def get(self, job_id: str) -> Optional[ImportJob]:
+        return self._jobs.get(job_id)
+
+    def list_for_staff(self, staff_id: int) -> List[ImportJob]:
+        return [job for job in self._jobs.values() if job.staff_id == staff_id]
+
+    async def shutdown(self) -> None:
+        """Anulează job-urile în curs (chunk-urile deja comise rămân)."""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _run(
+            self,
+            job: ImportJob,
+            products_data: List[Dict[str, Any]],
+            default_category_id: Optional[int],
+            vendor_company_id: int
+    ) -> None:
+        async with self._semaphore:
+            job.status = JOB_RUNNING
+            job.started_at = datetime.utcnow()
+            await self._notify(job)
+
+            results = {'success': 0, 'failed': 0, 'details': job.details}
+            try:
+                async with async_session_maker() as db:
+                    ready = await ProductImportService.prepare_rows(
+                        db, products_data, results, default_category_id, vendor_company_id
+                    )
+                    # Rândurile respinse la validare sunt deja procesate
+                    self._sync(job, results, job.total - len(ready))
+                    await self._notify(job)
+
+                    chunk_size = ProductImportService.CHUNK_SIZE
+                    for start in range(0, len(ready), chunk_size):
+                        chunk = ready[start:start + chunk_size]
+                        chunk_results = {'success': 0, 'failed': 0, 'details': []}
+                        await ProductImportService.insert_chunk(db, chunk, chunk_results)
+                        await db.commit()
+
+                        # Se contabilizează doar după commit
+                        results['success'] += chunk_results['success']
+                        results['failed'] += chunk_results['failed']
+                        results['details'].extend(chunk_results['details'])
+
+                        self._sync(job, results, job.processed + len(chunk))
+                        await self._notify(job)
+
+                job.status = JOB_COMPLETED
+                logger.info(f"Import job {job.id} completed: {job.success} success, {job.failed} failed")
+
+            except asyncio.CancelledError:
+                job.status = JOB_FAILED
+                job.error = "Import întrerupt (server oprit)"
+                raise
+            except Exception as e:
+                logger.exception(f"Import job {job.id} failed")
+                job.status = JOB_FAILED
+                job.error = f"Eroare la import: {str(e)}"
+            finally:
+                job.finished_at = datetime.utcnow()
+                self._sync(job, results, job.processed)
+                await self._notify(job)
+
+    @staticmethod
+    def _sync(job: ImportJob, results: Dict[str, Any], processed: int) -> None:
+        job.success = results['success']
+        job.failed = results['failed']
+        job.processed = processed
+
+    @staticmethod
+    async def _notify(job: ImportJob) -> None:
+        """Progres pe websocket-ul staff-ului (best effort)."""
+        try:
+            from server.dashboard.websocket import notification_manager
+            await notification_manager.send_to_staff(job.staff_id, {
+                "type": "import_progress",
+                "data": job.to_dict(),
+                "timestamp": datetime.utcnow().isoformat()
+            })
+        except Exception as e:
+            logger.debug(f"Import progress notification failed: {e}")
+
+    def _purge_finished(self) -> None:
+        cutoff = datetime.utcnow() - JOB_RETENTION
+        for job_id in [
+            job_id for job_id, job in self._jobs.items()
+            if job.is_finished and job.finished_at and job.finished_at < cutoff
+        ]:
+            del self._jobs[job_id]
+
+
+# Instanță globală
+import_job_runner = ImportJobRunner()
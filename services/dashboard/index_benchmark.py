@@ -0,0 +1,260 @@
+# services/dashboard/index_benchmark.py
+"""
+Benchmark EXPLAIN ANALYZE pentru indexurile compuse din migrarea a91d3e5f7b20.
+
+Rulează într-o schemă separată (index_bench) din baza de date configurată:
+1. creează copii ale tabelelor orders / invoices / product_prices /
+   user_interactions (doar coloanele interogate; user_interactions
+   partiționat lunar, ca în producție) și le umple cu generate_series
+2. rulează interogările din dashboard fără indexurile noi (before)
+3. creează indexurile, ANALYZE, rulează din nou (after)
+4. șterge schema (--keep o păstrează)
+
+Tabelele aplicației nu sunt atinse. Tipurile enum (orderstatus, ...) sunt
+cele existente în schema public.
+
+Rulare (din rădăcina proiectului):
+    python -m services.dashboard.index_benchmark --orders 200000 --interactions 2000000
+"""
+import argparse
+import asyncio
+import json
+import statistics
+from datetime import date, datetime, timezone
+from typing import Dict, List, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from cfg import engine
+
+SCHEMA = "index_bench"
+
+TABLES = [
+    f"""CREATE TABLE {SCHEMA}.orders (
+        id serial PRIMARY KEY,
+        client_id integer NOT NULL,
+        status orderstatus NOT NULL,
+        total_amount numeric(10, 2) NOT NULL,
+        created_at timestamptz NOT NULL
+    )""",
+    f"CREATE INDEX ON {SCHEMA}.orders (client_id)",
+    f"""CREATE TABLE {SCHEMA}.invoices (
+        id serial PRIMARY KEY,
+        invoice_type invoicetype NOT NULL,
+        cart_id integer UNIQUE,
+        valid_until timestamp,
+        converted_to_order boolean NOT NULL,
+        created_at timestamptz NOT NULL
+    )""",
+    f"CREATE INDEX ON {SCHEMA}.invoices (invoice_type)",
+    f"""CREATE TABLE {SCHEMA}.product_prices (
+        id serial PRIMARY KEY,
+        product_id integer NOT NULL,
+        price_type pricetype NOT NULL,
+        amount numeric(10, 2) NOT NULL,
+        is_active boolean NOT NULL
+    )""",
+    f"""CREATE TABLE {SCHEMA}.user_interactions (
+        id serial,
+        client_id integer NOT NULL,
+        action_type actiontype NOT NULL,
+        target_type targettype NOT NULL,
+        target_id integer NOT NULL,
+        created_at timestamptz NOT NULL,
+        PRIMARY KEY (id, created_at)
+    ) PARTITION BY RANGE (created_at)""",
+    f"CREATE INDEX ON {SCHEMA}.user_interactions (client_id)",
+    f"CREATE INDEX ON {SCHEMA}.user_interactions (action_type)",
+    f"CREATE INDEX ON {SCHEMA}.user_interactions (target_id)",
+    f"CREATE INDEX ON {SCHEMA}.user_interactions (target_type)",
+]
+
+# Distribuții aproximative: majoritatea comenzilor finalizate, ~1/4 oferte,
+# 4 grile de preț per produs (90% active), interacțiuni mai ales VIEW
+SEED = [
+    f"""INSERT INTO {SCHEMA}.orders (client_id, status, total_amount, created_at)
+        SELECT (random() * 20000)::int,
+               (ARRAY['NEW', 'PROCESSING', 'COMPLETED', 'COMPLETED', 'COMPLETED', 'CANCELLED'])
+                   [1 + (random() * 5)::int]::orderstatus,
+               (random() * 5000)::numeric(10, 2),
+               now() - random() * interval '730 days'
+        FROM generate_series(1, CAST(:orders AS integer))""",
+    f"""INSERT INTO {SCHEMA}.invoices (invoice_type, cart_id, valid_until, converted_to_order, created_at)
+        SELECT CASE WHEN i % 4 = 0 THEN 'QUOTE' ELSE 'INVOICE' END::invoicetype,
+               CASE WHEN i % 4 = 0 THEN i END,
+               CASE WHEN i % 4 = 0 THEN (now() - random() * interval '365 days' + interval '14 days')::timestamp END,
+               random() < 0.3,
+               now() - random() * interval '365 days'
+        FROM generate_series(1, CAST(:invoices AS integer)) AS i""",
+    f"""INSERT INTO {SCHEMA}.product_prices (product_id, price_type, amount, is_active)
+        SELECT product_id, price_type, (random() * 1000)::numeric(10, 2), random() < 0.9
+        FROM generate_series(1, CAST(:products AS integer)) AS product_id,
+             unnest(ARRAY['ANONIM', 'USER', 'INSTALATOR', 'PRO']::pricetype[]) AS price_type""",
+    f"""INSERT INTO {SCHEMA}.user_interactions (client_id, action_type, target_type, target_id, created_at)
+        SELECT (random() * 20000)::int,
+               (ARRAY['VIEW', 'VIEW', 'VIEW', 'VIEW', 'ADD_TO_CART', 'REQUEST_QUOTE', 'SHARE'])
+                   [1 + (random() * 6)::int]::actiontype,
+               (ARRAY['PRODUCT', 'PRODUCT', 'PRODUCT', 'CATEGORY', 'BLOG'])[1 + (random() * 4)::int]::targettype,
+               1 + (random() * CAST(:products AS integer))::int,
+               now() - random() * interval '60 days'
+        FROM generate_series(1, CAST(:interactions AS integer))""",
+]
+
+# Aceleași definiții ca în migrare
+INDEXES = [
+    f"CREATE INDEX ix_orders_status_created_at ON {SCHEMA}.orders (status, created_at)",
+    f"CREATE INDEX ix_orders_created_at ON {SCHEMA}.orders (created_at)",
+    f"CREATE INDEX ix_invoices_quote_valid_until ON {SCHEMA}.invoices (valid_until, cart_id) "
+    f"WHERE invoice_type = 'QUOTE'",
+    f"CREATE INDEX ix_product_prices_product_type ON {SCHEMA}.product_prices (product_id, price_type)",
+    f"CREATE INDEX ix_product_prices_active ON {SCHEMA}.product_prices (product_id, price_type) "
+    f"INCLUDE (amount) WHERE is_active",
+    f"CREATE INDEX ix_user_interactions_target_action_created ON {SCHEMA}.user_interactions "
+    f"(target_type, target_id, action_type, created_at)",
+]
+
+# (nume, SQL) - formele interogărilor din stats_service, cart_service,
+# routers/staff/invoice.py, activity_services, product_service
+QUERIES: List[Tuple[str, str]] = [
+    ("orders: completed revenue 30d",
+     f"SELECT sum(total_amount) FROM {SCHEMA}.orders "
+     f"WHERE status = 'COMPLETED' AND created_at >= now() - interval '30 days'"),
+    ("orders: new count",
+     f"SELECT count(*) FROM {SCHEMA}.orders WHERE status = 'NEW' AND created_at >= now() - interval '30 days'"),
+    ("orders: today",
+     f"SELECT count(*) FROM {SCHEMA}.orders WHERE created_at >= date_trunc('day', now())"),
+    ("orders: latest 10",
+     f"SELECT id FROM {SCHEMA}.orders ORDER BY created_at DESC LIMIT 10"),
+    ("invoices: carts with valid quotes",
+     f"SELECT count(DISTINCT cart_id) FROM {SCHEMA}.invoices "
+     f"WHERE invoice_type = 'QUOTE' AND valid_until > now() AND cart_id IS NOT NULL"),
+    ("invoices: active quotes list",
+     f"SELECT id FROM {SCHEMA}.invoices WHERE invoice_type = 'QUOTE' AND valid_until > now() "
+     f"AND converted_to_order = false ORDER BY valid_until LIMIT 50"),
+    ("invoices: has_active_quote",
+     f"SELECT id FROM {SCHEMA}.invoices WHERE cart_id = 4000 AND invoice_type = 'QUOTE' "
+     f"AND converted_to_order = false AND valid_until > now()"),
+    ("interactions: product views 30d",
+     f"SELECT count(id) FROM {SCHEMA}.user_interactions WHERE target_type = 'PRODUCT' AND target_id = 42 "
+     f"AND action_type = 'VIEW' AND created_at >= now() - interval '30 days'"),
+    ("interactions: product add_to_cart 30d",
+     f"SELECT count(id) FROM {SCHEMA}.user_interactions WHERE target_type = 'PRODUCT' AND target_id = 42 "
+     f"AND action_type = 'ADD_TO_CART' AND created_at >= now() - interval '30 days'"),
+    ("prices: product price",
+     f"SELECT amount FROM {SCHEMA}.product_prices WHERE product_id = 1234 AND price_type = 'PRO' AND is_active"),
+    ("prices: catalog page (24 products)",
+     f"SELECT product_id, amount FROM {SCHEMA}.product_prices "
+     f"WHERE product_id = ANY(ARRAY(SELECT generate_series(1000, 1023))) AND price_type = 'USER' AND is_active"),
+]
+
+
+def _add_months(value: date, months: int) -> date:
+    index = value.year * 12 + value.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _plan_nodes(plan: Dict) -> List[str]:
+    """Tipurile de scan din plan (Seq Scan / Index Scan on ix_...)."""
+    nodes = []
+    if "Scan" in plan["Node Type"]:
+        index = plan.get("Index Name")
+        nodes.append(f"{plan['Node Type']}" + (f" ({index})" if index else ""))
+    for child in plan.get("Plans", []):
+        nodes.extend(_plan_nodes(child))
+    return nodes
+
+
+async def _explain(conn: AsyncConnection, sql: str, runs: int) -> Tuple[float, str]:
+    timings = []
+    nodes: List[str] = []
+    for _ in range(runs):
+        result = await conn.execute(text(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sql}"))
+        plan = result.scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        timings.append(plan[0]["Execution Time"])
+        nodes = _plan_nodes(plan[0]["Plan"])
+    # Partițiile apar separat - se comprimă tipurile repetate
+    unique_nodes = list(dict.fromkeys(nodes))
+    return statistics.median(timings), ", ".join(unique_nodes)
+
+
+async def _measure(conn: AsyncConnection, runs: int) -> Dict[str, Tuple[float, str]]:
+    return {name: await _explain(conn, sql, runs) for name, sql in QUERIES}
+
+
+async def _setup(conn: AsyncConnection, sizes: Dict[str, int]) -> None:
+    await conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+    await conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+    for statement in TABLES:
+        await conn.execute(text(statement))
+
+    current = datetime.now(timezone.utc).date().replace(day=1)
+    for offset in range(-3, 2):
+        month = _add_months(current, offset)
+        await conn.execute(text(
+            f"CREATE TABLE {SCHEMA}.user_interactions_p{month.year:04d}_{month.month:02d} "
+            f"PARTITION OF {SCHEMA}.user_interactions "
+            f"FOR VALUES FROM ('{month.isoformat()} 00:00:00+00') TO ('{_add_months(month, 1).isoformat()} 00:00:00+00')"
+        ))
+
+    for statement in SEED:
+        started = datetime.now()
+        await conn.execute(text(statement), sizes)
+        print(f"  seeded {statement.split()[2]} in {(datetime.now() - started).total_seconds():.1f}s")
+    await conn.execute(text(f"ANALYZE {SCHEMA}.orders, {SCHEMA}.invoices, {SCHEMA}.product_prices, {SCHEMA}.user_interactions"))
+
+
+async def run(sizes: Dict[str, int], runs: int, keep: bool) -> None:
+    async with engine.connect() as conn:
+        await conn.execute(text("SET max_parallel_workers_per_gather = 0"))  # timpi comparabili
+        print(f"Seeding schema {SCHEMA}: {sizes}")
+        await _setup(conn, sizes)
+        await conn.commit()
+
+        before = await _measure(conn, runs)
+
+        for statement in INDEXES:
+            await conn.execute(text(statement))
+        await conn.execute(text(f"ANALYZE {SCHEMA}.orders, {SCHEMA}.invoices, {SCHEMA}.product_prices, {SCHEMA}.user_interactions"))
+        await conn.commit()
+
+        after = await _measure(conn, runs)
+
+        width = max(len(name) for name, _ in QUERIES)
+        print(f"\n{'query':<{width}}  {'before ms':>10}  {'after ms':>10}  {'speedup':>8}")
+        for name, _ in QUERIES:
+            before_ms, before_plan = before[name]
+            after_ms, after_plan = after[name]
+            speedup = before_ms / after_ms if after_ms else float("inf")
+            print(f"{name:<{width}}  {before_ms:>10.2f}  {after_ms:>10.2f}  {speedup:>7.1f}x")
+            print(f"{'':<{width}}    before: {before_plan}")
+            print(f"{'':<{width}}    after:  {after_plan}")
+
+        if not keep:
+            await conn.execute(text(f"DROP SCHEMA {SCHEMA} CASCADE"))
+            await conn.commit()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="EXPLAIN ANALYZE înainte / după indexurile compuse")
+    parser.add_argument("--orders", type=int, default=200_000)
+    parser.add_argument("--invoices", type=int, default=50_000)
+    parser.add_argument("--products", type=int, default=20_000)
+    parser.add_argument("--interactions", type=int, default=1_000_000)
+    parser.add_argument("--runs", type=int, default=5, help="rulări per interogare (mediana)")
+    parser.add_argument("--keep", action="store_true", help="păstrează schema index_bench")
+    args = parser.parse_args()
+
+    sizes = {
+        "orders": args.orders,
+        "invoices": args.invoices,
+        "products": args.products,
+        "interactions": args.interactions
+    }
+    asyncio.run(run(sizes, args.runs, args.keep))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+# services/dashboard/invoice_batch_service.py
+"""
+Descărcare în lot a PDF-urilor (oferte / facturi) ca arhivă ZIP.
+
+1. datele pentru toate facturile se citesc cu două query-uri (coșuri, comenzi)
+   - înainte de răspuns, fără randare
+2. arhiva se scrie în flux, în ordinea facturilor: PDF-urile lipsă sau
+   învechite (hash schimbat) se randează în pdf_render_pool cu cel mult
+   pdf_render_max_concurrent facturi înaintea celei scrise, deci primul
+   fișier pleacă după prima randare, nu după tot lotul
+3. fiecare fișier e citit pe bucăți și trimis imediat, fără să se țină
+   arhiva întreagă în memorie
+4. document_path-urile schimbate se salvează la final, cu sesiune proprie
+   (sesiunea request-ului nu mai e folosită în timpul fluxului)
+
+PDF-urile sunt deja comprimate - intrările din ZIP sunt stocate (ZIP_STORED).
+"""
+from __future__ import annotations
+import asyncio
+import io
+import logging
+import zipfile
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import AsyncIterator, Deque, Dict, List, Optional, Tuple
+
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from cfg import async_session_maker
+from models import Invoice
+from services.dashboard.pdf_service_reportlab import PDFService
+from utils.pdf_renderer import InvoiceRenderData
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class InvoiceBatch:
+    """Facturile pentru arhivă (cu datele de randare) + cele care nu au putut fi generate."""
+    items: List[Tuple[Invoice, InvoiceRenderData]] = field(default_factory=list)
+    errors: List[Dict[str, str]] = field(default_factory=list)
+    rendered: int = 0
+
+
+class _ZipBuffer(io.RawIOBase):
+    """Destinație ZIP fără seek: zipfile scrie aici, generatorul golește bufferul."""
+
+    def __init__(self):
+        self._buffer = bytearray()
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._buffer += data
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = bytes(self._buffer)
+        self._buffer.clear()
+        return data
+
+
+class InvoiceBatchService:
+    """PDF-uri în lot + arhivă ZIP în flux."""
+
+    FILE_CHUNK_SIZE = 64 * 1024
+
+    @staticmethod
+    async def prepare(db: AsyncSession, invoices: List[Invoice]) -> InvoiceBatch:
+        """Citește datele de randare pentru toate facturile (fără randare)."""
+        batch = InvoiceBatch()
+        render_data = await PDFService.build_render_data_many(invoices, db)
+
+        for invoice in invoices:
+            if invoice.id in render_data:
+                batch.items.append((invoice, render_data[invoice.id]))
+            else:
+                batch.errors.append({
+                    "invoice_number": invoice.invoice_number,
+                    "error": "Factura nu are coș / comandă asociată"
+                })
+        return batch
+
+    @staticmethod
+    async def stream_zip(batch: InvoiceBatch, render_ahead: Optional[int] = None) -> AsyncIterator[bytes]:
+        """
+        Arhiva ZIP pe bucăți (memoria e limitată la un chunk), cu PDF-urile
+        randate pe parcurs - cel mult `render_ahead` în lucru simultan.
+        """
+        if render_ahead is None:
+            from server.dashboard.config import default_config
+            render_ahead = default_config.pdf_render_max_concurrent
+        render_ahead = max(1, render_ahead)
+
+        previous_paths = {invoice.id: invoice.document_path for invoice, _ in batch.items}
+        remaining = iter(batch.items)
+        pending: Deque[Tuple[Invoice, asyncio.Future]] = deque()
+
+        def schedule() -> None:
+            while len(pending) < render_ahead:
+                item = next(remaining, None)
+                if item is None:
+                    return
+                invoice, render_data = item
+                pending.append((invoice, asyncio.ensure_future(PDFService.ensure_pdf(invoice, render_data))))
+
+        output = _ZipBuffer()
+        try:
+            with zipfile.ZipFile(output, mode="w", compression=zipfile.ZIP_STORED) as archive:
+                schedule()
+                while pending:
+                    invoice, task = pending.popleft()
+                    try:
+                        path, _ = await task
+                    except Exception as e:
+                        logger.error(f"Batch PDF failed for {invoice.invoice_number}: {e}")
+                        batch.errors.append({"invoice_number": invoice.invoice_number, "error": str(e)})
+                        continue
+                    finally:
+                        schedule()
+
+                    if path != previous_paths[invoice.id]:
+                        batch.rendered += 1
+                    pdf_path = Path(path)
+                    if not pdf_path.is_absolute():
+                        pdf_path = Path.cwd() / pdf_path
+
+                    try:
+                        handle = await asyncio.to_thread(open, pdf_path, "rb")
+                    except OSError as e:
+                        batch.errors.append({"invoice_number": invoice.invoice_number, "error": str(e)})
+                        continue
+
+                    try:
+                        with archive.open(f"{invoice.invoice_number}.pdf", mode="w") as entry:
+                            while True:
+                                chunk = await asyncio.to_thread(handle.read, InvoiceBatchService.FILE_CHUNK_SIZE)
+                                if not chunk:
+                                    break
+                                entry.write(chunk)
+                                data = output.drain()
+                                if data:
+                                    yield data
+                    finally:
+                        handle.close()
+
+                if batch.errors:
+                    lines = [f"{error['invoice_number']}: {error['error']}" for error in batch.errors]
+                    archive.writestr("ERORI.txt", "\n".join(lines))
+
+            yield output.drain()
+            logger.info(
+                f"Invoice batch: {len(batch.items)} invoices, {batch.rendered} rendered, {len(batch.errors)} errors"
+            )
+        finally:
+            # Clientul a închis conexiunea - randările care nu au început nu mai sunt necesare
+            for _, task in pending:
+                task.cancel()
+            await InvoiceBatchService._save_document_paths(
+                [invoice for invoice, _ in batch.items if invoice.document_path != previous_paths[invoice.id]]
+            )
+
+    @staticmethod
+    async def _save_document_paths(invoices: List[Invoice]) -> None:
+        """document_path pentru facturile re-randate (ensure_pdf a șters fișierele vechi)."""
+        if not invoices:
+            return
+        try:
+            async with async_session_maker() as db:
+                await db.execute(
+                    update(Invoice),
+                    [{"id": invoice.id, "document_path": invoice.document_path} for invoice in invoices]
+                )
+                await db.commit()
+        except Exception:
+            logger.exception("Batch PDF: failed to save document paths")
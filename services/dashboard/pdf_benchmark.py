@@ -0,0 +1,97 @@
+# services/dashboard/pdf_benchmark.py
+"""
+Micro-benchmark pentru randarea PDF (fără DB).
+
+Compară timpul per factură:
+- before: fonturi înregistrate + stiluri construite la fiecare factură
+  (comportamentul vechi din generate_invoice_pdf)
+- after: registry-ul per proces (init_pdf_resources o singură dată)
+
+Rulare (din rădăcina proiectului):
+    python -m services.dashboard.pdf_benchmark --invoices 50 --items 20
+"""
+import argparse
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List
+
+from utils.pdf_renderer import (
+    InvoiceRenderData, create_styles, init_pdf_resources, register_fonts, render_invoice
+)
+
+
+def _sample_invoice(index: int, items: int, output_dir: Path) -> InvoiceRenderData:
+    now = datetime.now()
+    return InvoiceRenderData(
+        invoice_number=f"BENCH-{index:05d}",
+        is_quote=True,
+        created_at=now,
+        client_name="Client Test Ștefănescu",
+        client_email="client@example.com",
+        client_phone="+373 69 000 000",
+        valid_until=now + timedelta(days=14),
+        notes="Livrare în 3 zile lucrătoare.",
+        total=items * 1250.0,
+        output_path=str(output_dir / f"bench_{index}.pdf"),
+        items=[
+            {
+                'name': f"Produs de test {i} - țeavă PPR Ø20",
+                'sku': f"SKU-{i:05d}",
+                'quantity': 5,
+                'unit_price': 250.0,
+                'subtotal': 1250.0,
+            }
+            for i in range(items)
+        ]
+    )
+
+
+def _run(invoices: int, items: int, output_dir: Path, per_invoice_setup: bool) -> List[float]:
+    timings = []
+    for index in range(invoices):
+        data = _sample_invoice(index, items, output_dir)
+        started = time.perf_counter()
+        if per_invoice_setup:
+            register_fonts()
+            create_styles()
+        render_invoice(data)
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def _report(label: str, timings: List[float]) -> None:
+    print(
+        f"{label:<8} n={len(timings):<4} "
+        f"mean={statistics.mean(timings):8.1f} ms  "
+        f"median={statistics.median(timings):8.1f} ms  "
+        f"min={min(timings):8.1f} ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark randare PDF factură")
+    parser.add_argument("--invoices", type=int, default=30)
+    parser.add_argument("--items", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        output_dir = Path(tmp)
+
+        # Încălzire: importuri, cache-uri ReportLab, registry
+        init_pdf_resources()
+        render_invoice(_sample_invoice(0, args.items, output_dir))
+
+        before = _run(args.invoices, args.items, output_dir, per_invoice_setup=True)
+        after = _run(args.invoices, args.items, output_dir, per_invoice_setup=False)
+
+    _report("before", before)
+    _report("after", after)
+    saved = statistics.mean(before) - statistics.mean(after)
+    print(f"saved    {saved:.1f} ms / invoice ({saved / statistics.mean(before) * 100:.0f}%)")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,64 +2,266 @@
 """
 Utilitar pentru curățarea PDF-urilor orfane.
 Poate fi rulat periodic pentru a șterge PDF-uri care nu mai au invoice în DB.
+
+Curățarea e incrementală:
+- PDFService marchează în manifest directoarele an/lună în care scrie
+  (.cleanup_manifest.json în OUTPUT_DIR)
+- o rulare verifică doar directoarele marcate + luna curentă + câteva
+  directoare verificate cel mai demult (sweep), ca orfanii apăruți prin
+  ștergeri din DB să fie găsiți în timp
+- fișierele se compară cu DB pe bucăți, după invoice_number (indexat),
+  cu pauze între bucăți ca să nu concureze cu request-urile
+
+PDFCleanupScheduler rulează curățarea periodic, în fundal (lifespan).
 """
 
 import asyncio
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime
 from pathlib import Path
-from typing import List, Tuple
+from typing import Dict, List, Optional, Set, Tuple
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from cfg import get_db
+from cfg import get_db, async_session_maker
 from models import Invoice
-from services.dashboard.pdf_service_reportlab import PDFService
+
+logger = logging.getLogger(__name__)
+
+
+def _output_dir() -> Path:
+    # Import local: pdf_service_reportlab importă la rândul lui modulul acesta
+    # (CleanupManifest.mark_dirty) - la nivel de modul ar fi import circular
+    from services.dashboard.pdf_service_reportlab import PDFService
+    return PDFService.OUTPUT_DIR
+
+
+class CleanupManifest:
+    """
+    Directoarele (an/lună) modificate de la ultima curățare și momentul
+    ultimei verificări pentru fiecare director.
+    """
+
+    FILE_NAME = ".cleanup_manifest.json"
+
+    _lock = threading.Lock()
+    _dirty: Optional[Set[str]] = None
+
+    @staticmethod
+    def path() -> Path:
+        return _output_dir() / CleanupManifest.FILE_NAME
+
+    @staticmethod
+    def load() -> Dict:
+        try:
+            with open(CleanupManifest.path(), encoding="utf-8") as handle:
+                data = json.load(handle)
+        except (OSError, ValueError):
+            data = {}
+        data.setdefault("dirty", [])
+        data.setdefault("scanned", {})
+        return data
+
+    @staticmethod
+    def save(data: Dict) -> None:
+        path = CleanupManifest.path()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            json.dump(data, handle, indent=1, sort_keys=True)
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def mark_dirty(directory: Path) -> None:
+        """
+        Marchează directorul an/lună ca modificat.
+        Fișierul se rescrie doar când apare un director nou în listă.
+        """
+        key = CleanupManifest.key_for(directory)
+        if key is None:
+            return
+
+        with CleanupManifest._lock:
+            if CleanupManifest._dirty is None:
+                CleanupManifest._dirty = set(CleanupManifest.load()["dirty"])
+            if key in CleanupManifest._dirty:
+                return
+            CleanupManifest._dirty.add(key)
+            data = CleanupManifest.load()
+            data["dirty"] = sorted(set(data["dirty"]) | {key})
+            CleanupManifest.save(data)
+
+    @staticmethod
+    def mark_scanned(keys: List[str]) -> None:
+        """Scoate directoarele verificate din lista dirty și salvează momentul verificării."""
+        now = datetime.utcnow().isoformat()
+        with CleanupManifest._lock:
+            data = CleanupManifest.load()
+            data["dirty"] = sorted(set(data["dirty"]) - set(keys))
+            for key in keys:
+                data["scanned"][key] = now
+            CleanupManifest.save(data)
+            CleanupManifest._dirty = set(data["dirty"])
+
+    @staticmethod
+    def key_for(directory: Path) -> Optional[str]:
+        """'2025/03' pentru OUTPUT_DIR/2025/03."""
+        try:
+            relative = Path(directory).relative_to(_output_dir())
+        except ValueError:
+            return None
+        parts = relative.parts
+        if len(parts) != 2:
+            return None
+        return f"{parts[0]}/{parts[1]}"
 
 
 class PDFCleanup:
     """Service pentru curățarea PDF-urilor orfane."""
 
+    # Fișierele mai noi de atât nu se ating (randare / commit în curs)
+    GRACE_SECONDS = 15 * 60
+
+    # Nume de fișiere comparate cu DB per query
+    CHUNK_SIZE = 500
+
+    # Pauză între bucăți - curățarea cedează loc request-urilor
+    CHUNK_PAUSE_SECONDS = 0.05
+
+    @staticmethod
+    def list_month_dirs() -> List[str]:
+        """Toate directoarele an/lună existente (două niveluri, fără rglob)."""
+        root = _output_dir()
+        keys = []
+        if not root.exists():
+            return keys
+        for year in os.scandir(root):
+            if not year.is_dir():
+                continue
+            for month in os.scandir(year.path):
+                if month.is_dir():
+                    keys.append(f"{year.name}/{month.name}")
+        return sorted(keys)
+
+    @staticmethod
+    def select_directories(manifest: Dict, sweep_dirs: int) -> List[str]:
+        """Directoare marcate + luna curentă + `sweep_dirs` verificate cel mai demult."""
+        existing = PDFCleanup.list_month_dirs()
+        now = datetime.now()
+        selected = set(manifest["dirty"]) | {f"{now.year}/{now.month:02d}"}
+        selected &= set(existing)
+
+        scanned = manifest["scanned"]
+        oldest_first = sorted(
+            (key for key in existing if key not in selected),
+            key=lambda key: scanned.get(key, "")
+        )
+        selected.update(oldest_first[:sweep_dirs])
+        return sorted(selected)
+
+    @staticmethod
+    def _list_candidates(key: str) -> List[Path]:
+        """PDF-urile (și .tmp rămase) din director, mai vechi decât GRACE_SECONDS."""
+        directory = _output_dir() / key
+        cutoff = time.time() - PDFCleanup.GRACE_SECONDS
+        candidates = []
+        try:
+            entries = list(os.scandir(directory))
+        except FileNotFoundError:
+            return candidates
+        for entry in entries:
+            if not entry.is_file() or not entry.name.endswith((".pdf", ".tmp")):
+                continue
+            if entry.stat().st_mtime < cutoff:
+                candidates.append(Path(entry.path))
+        return candidates
+
     @staticmethod
-    async def find_orphan_pdfs(db: AsyncSession) -> List[Tuple[Path, str]]:
+    async def find_orphan_pdfs(
+            db: AsyncSession,
+            directories: Optional[List[str]] = None
+    ) -> List[Tuple[Path, str]]:
         """
         Găsește PDF-uri care nu mai au invoice în baza de date.
 
+        Args:
+            directories: chei an/lună ('2025/03'); implicit toate
+
         Returns:
             Lista de tuple (path, reason) pentru fișierele orfane
         """
         orphans = []
-        pdf_dir = PDFService.OUTPUT_DIR
-
-        if not pdf_dir.exists():
-            return orphans
-
-        # Obține toate path-urile din DB
-        result = await db.execute(
-            select(Invoice.document_path).where(Invoice.document_path.isnot(None))
-        )
-        db_paths = {Path(row[0]).name for row in result if row[0]}
-
-        # Parcurge toate PDF-urile de pe disc
-        for pdf_file in pdf_dir.rglob("*.pdf"):
-            if pdf_file.name not in db_paths:
-                orphans.append((pdf_file, "No database record"))
+        if directories is None:
+            directories = await asyncio.to_thread(PDFCleanup.list_month_dirs)
+
+        for key in directories:
+            candidates = await asyncio.to_thread(PDFCleanup._list_candidates, key)
+
+            pdf_files = []
+            for path in candidates:
+                if path.name.endswith(".tmp"):
+                    orphans.append((path, "Incomplete render"))
+                else:
+                    pdf_files.append(path)
+
+            for start in range(0, len(pdf_files), PDFCleanup.CHUNK_SIZE):
+                chunk = pdf_files[start:start + PDFCleanup.CHUNK_SIZE]
+
+                # Numele fișierului: <invoice_number>[.<hash>].pdf
+                numbers = {path.name.split(".", 1)[0] for path in chunk}
+                result = await db.execute(
+                    select(Invoice.invoice_number, Invoice.document_path)
+                    .where(Invoice.invoice_number.in_(numbers))
+                )
+                current = {
+                    row.invoice_number: os.path.abspath(row.document_path) if row.document_path else None
+                    for row in result
+                }
+
+                for path in chunk:
+                    number = path.name.split(".", 1)[0]
+                    if number not in current:
+                        orphans.append((path, "No database record"))
+                    elif current[number] != os.path.abspath(path):
+                        orphans.append((path, "Outdated version"))
+
+                await asyncio.sleep(PDFCleanup.CHUNK_PAUSE_SECONDS)
 
         return orphans
 
     @staticmethod
-    async def cleanup_orphan_pdfs(db: AsyncSession, dry_run: bool = True) -> dict:
+    async def cleanup_orphan_pdfs(
+            db: AsyncSession,
+            dry_run: bool = True,
+            full: bool = False,
+            sweep_dirs: int = 2
+    ) -> dict:
         """
         Curăță PDF-urile orfane.
 
         Args:
             db: Sesiunea de bază de date
             dry_run: Dacă True, doar raportează ce ar șterge fără să șteargă efectiv
+            full: verifică toate directoarele, nu doar cele din manifest
+            sweep_dirs: directoare nemarcate verificate în plus (cele mai vechi)
 
         Returns:
             Dicționar cu statistici despre curățare
         """
-        orphans = await PDFCleanup.find_orphan_pdfs(db)
+        manifest = await asyncio.to_thread(CleanupManifest.load)
+        if full:
+            directories = await asyncio.to_thread(PDFCleanup.list_month_dirs)
+        else:
+            directories = await asyncio.to_thread(PDFCleanup.select_directories, manifest, sweep_dirs)
+
+        orphans = await PDFCleanup.find_orphan_pdfs(db, directories)
 
         stats = {
+            "directories": directories,
             "found": len(orphans),
             "deleted": 0,
             "failed": 0,
@@ -79,7 +281,7 @@ class PDFCleanup:
 
             if not dry_run:
                 try:
-                    pdf_path.unlink()
+                    await asyncio.to_thread(pdf_path.unlink)
                     file_info["status"] = "deleted"
                     stats["deleted"] += 1
 
@@ -96,21 +298,76 @@ class PDFCleanup:
 
             stats["files"].append(file_info)
 
+        if not dry_run:
+            await asyncio.to_thread(CleanupManifest.mark_scanned, directories)
+
         return stats
 
 
-async def cleanup_pdfs_command(dry_run: bool = True):
+class PDFCleanupScheduler:
+    """Curățare periodică în fundal, cu sesiune DB proprie."""
+
+    def __init__(self, interval_minutes: int, sweep_dirs: int = 2):
+        self.interval_minutes = interval_minutes
+        self.sweep_dirs = sweep_dirs
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is not None or self.interval_minutes <= 0:
+            return
+        self._task = asyncio.create_task(self._loop(), name="pdf-cleanup")
+        logger.info(f"PDF cleanup scheduled every {self.interval_minutes} min")
+
+    async def shutdown(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    async def _loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval_minutes * 60)
+            try:
+                async with async_session_maker() as db:
+                    stats = await PDFCleanup.cleanup_orphan_pdfs(
+                        db, dry_run=False, sweep_dirs=self.sweep_dirs
+                    )
+                logger.info(
+                    f"PDF cleanup: {len(stats['directories'])} dirs, "
+                    f"{stats['deleted']} deleted, {stats['failed']} failed"
+                )
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("PDF cleanup failed")
+
+
+def _create_scheduler() -> PDFCleanupScheduler:
+    from server.dashboard.config import default_config
+
+    return PDFCleanupScheduler(
+        interval_minutes=default_config.pdf_cleanup_interval_minutes,
+        sweep_dirs=default_config.pdf_cleanup_sweep_dirs
+    )
+
+
+# Instanță globală
+pdf_cleanup_scheduler = _create_scheduler()
+
+
+async def cleanup_pdfs_command(dry_run: bool = True, full: bool = False):
     """
     Comandă pentru curățarea PDF-urilor orfane.
     Poate fi rulată din linia de comandă sau ca task periodic.
     """
-    print(f"Starting PDF cleanup (dry_run={dry_run})...")
+    print(f"Starting PDF cleanup (dry_run={dry_run}, full={full})...")
 
     async for db in get_db():
         try:
-            stats = await PDFCleanup.cleanup_orphan_pdfs(db, dry_run=dry_run)
+            stats = await PDFCleanup.cleanup_orphan_pdfs(db, dry_run=dry_run, full=full)
 
             print(f"\nCleanup Statistics:")
+            print(f"- Directories: {', '.join(stats['directories']) or '-'}")
             print(f"- Found: {stats['found']} orphan PDFs")
             print(f"- Total size: {stats['total_size'] / 1024 / 1024:.2f} MB")
 
@@ -136,4 +393,5 @@ if __name__ == "__main__":
     import sys
 
     dry_run = "--no-dry-run" not in sys.argv
-    asyncio.run(cleanup_pdfs_command(dry_run=dry_run))
\ No newline at end of file
+    full = "--full" in sys.argv
+    asyncio.run(cleanup_pdfs_command(dry_run=dry_run, full=full))
@@ -0,0 +1,225 @@
+# services/dashboard/pdf_render_pool.py
+"""
+Randare PDF într-un ProcessPoolExecutor, în afara event loop-ului.
+
+doc.build() din ReportLab e CPU-bound și ține GIL-ul: rulat direct în
+request blochează toate celelalte request-uri și websocket-urile. Aici:
+- worker-ii sunt porniți la startup (lifespan) și încălziți - reportlab
+  importat și fonturile înregistrate înainte de primul PDF
+- numărul de randări simultane e limitat (restul așteaptă în coadă)
+- fiecare randare are timeout; la timeout sau la un worker căzut pool-ul
+  se recreează, ca un PDF blocat să nu țină un worker ocupat
+- metrici: coadă, în lucru, timp de randare (ultim / mediu / maxim)
+
+Fără start() (scripturi, CLI) randarea rulează într-un thread.
+
+Worker-ii primesc doar funcții din utils.pdf_render_worker, deci importă
+reportlab și utils.pdf_renderer - nu services / server (toată aplicația).
+"""
+from __future__ import annotations
+import asyncio
+import logging
+import multiprocessing
+import sys
+import time
+import types
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+from utils import pdf_render_worker
+from utils.pdf_renderer import InvoiceRenderData, render_invoice
+
+logger = logging.getLogger(__name__)
+
+
+class PDFRenderTimeout(Exception):
+    """Randarea a depășit timeout-ul configurat."""
+
+
+@contextmanager
+def _without_main_script() -> Iterator[None]:
+    """
+    spawn rulează din nou scriptul __main__ în fiecare proces nou; pornit cu
+    `python server_start.py`, asta înseamnă toată aplicația per worker.
+    Cât timp se pornesc procesele, __main__ e un modul gol.
+    """
+    main = sys.modules.get("__main__")
+    sys.modules["__main__"] = types.ModuleType("__main__")
+    try:
+        yield
+    finally:
+        sys.modules["__main__"] = main
+
+
+class PDFRenderPool:
+    """Pool de procese pentru randarea PDF-urilor."""
+
+    def __init__(
+            self,
+            workers: Optional[int] = None,
+            max_concurrent: Optional[int] = None,
+            timeout_seconds: Optional[float] = None
+    ):
+        # None => valoarea din DashboardConfig, citită la start() - la import ar crea
+        # un import circular (services -> server.dashboard -> routers -> services)
+        self._settings = (workers, max_concurrent, timeout_seconds)
+        self.workers = workers
+        self.max_concurrent = max_concurrent
+        self.timeout_seconds = timeout_seconds
+
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+        # Metrici
+        self._waiting = 0
+        self._in_flight = 0
+        self._completed = 0
+        self._failed = 0
+        self._timeouts = 0
+        self._restarts = 0
+        self._total_render_ms = 0.0
+        self._max_render_ms = 0.0
+        self._last_render_ms: Optional[float] = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._executor is not None
+
+    def start(self) -> None:
+        """Pornește worker-ii (apelat din lifespan)."""
+        if self._executor is not None:
+            return
+        self._load_config()
+        self._semaphore = asyncio.Semaphore(self.max_concurrent)
+        self._executor = self._create_executor()
+        logger.info(
+            f"PDF render pool started: {self.workers} workers, "
+            f"max {self.max_concurrent} concurrent, timeout {self.timeout_seconds}s"
+        )
+
+    async def shutdown(self) -> None:
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            await asyncio.to_thread(executor.shutdown, wait=True, cancel_futures=True)
+            logger.info("PDF render pool stopped")
+
+    async def render(self, data: InvoiceRenderData) -> str:
+        """
+        Randează PDF-ul și întoarce calea fișierului.
+
+        Raises:
+            PDFRenderTimeout: randarea a depășit timeout_seconds
+        """
+        if self._executor is None:
+            return await asyncio.to_thread(render_invoice, data)
+
+        self._waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self._waiting -= 1
+
+        self._in_flight += 1
+        executor = self._executor
+        started = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(executor, pdf_render_worker.render, data)
+            path = await asyncio.wait_for(future, timeout=self.timeout_seconds)
+
+        except asyncio.TimeoutError:
+            self._timeouts += 1
+            self._failed += 1
+            logger.error(f"PDF render timeout for {data.invoice_number} after {self.timeout_seconds}s")
+            self._restart(executor)
+            raise PDFRenderTimeout(f"Generarea PDF a depășit {self.timeout_seconds}s")
+
+        except BrokenProcessPool:
+            self._failed += 1
+            logger.error(f"PDF render pool broken while rendering {data.invoice_number}")
+            self._restart(executor)
+            raise
+
+        except Exception:
+            self._failed += 1
+            raise
+
+        else:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            self._completed += 1
+            self._total_render_ms += elapsed_ms
+            self._max_render_ms = max(self._max_render_ms, elapsed_ms)
+            self._last_render_ms = elapsed_ms
+            logger.info(f"PDF {data.invoice_number} rendered in {elapsed_ms:.0f} ms")
+            return path
+
+        finally:
+            self._in_flight -= 1
+            self._semaphore.release()
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "running": self.is_running,
+            "workers": self.workers,
+            "max_concurrent": self.max_concurrent,
+            "timeout_seconds": self.timeout_seconds,
+            "queue_depth": self._waiting,
+            "in_flight": self._in_flight,
+            "completed": self._completed,
+            "failed": self._failed,
+            "timeouts": self._timeouts,
+            "restarts": self._restarts,
+            "render_ms_last": round(self._last_render_ms, 1) if self._last_render_ms is not None else None,
+            "render_ms_avg": round(self._total_render_ms / self._completed, 1) if self._completed else None,
+            "render_ms_max": round(self._max_render_ms, 1)
+        }
+
+    def _load_config(self) -> None:
+        if None not in self._settings:
+            return
+
+        from server.dashboard.config import default_config
+        workers, max_concurrent, timeout_seconds = self._settings
+        self.workers = workers or default_config.pdf_render_workers
+        self.max_concurrent = max_concurrent or default_config.pdf_render_max_concurrent
+        self.timeout_seconds = timeout_seconds or default_config.pdf_render_timeout_seconds
+
+    def _create_executor(self) -> ProcessPoolExecutor:
+        # spawn: worker-ii nu moștenesc conexiunile DB / socket-urile serverului
+        executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=pdf_render_worker.init_worker
+        )
+        # Cu spawn, procesele pornesc la submit (câte unul per task, până la max_workers)
+        with _without_main_script():
+            for _ in range(self.workers):
+                executor.submit(pdf_render_worker.warmup)
+        return executor
+
+    def _restart(self, failed: ProcessPoolExecutor) -> None:
+        """
+        Înlocuiește pool-ul; procesele vechi (inclusiv cel blocat) sunt oprite.
+        Randările care rulau pe același pool primesc BrokenProcessPool.
+        """
+        # Alt task a recreat deja pool-ul (sau serverul se oprește)
+        if self._executor is not failed:
+            return
+        old, self._executor = failed, None
+
+        # ProcessPoolExecutor nu poate opri un task deja pornit
+        processes = list(getattr(old, "_processes", {}).values())
+        old.shutdown(wait=False, cancel_futures=True)
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+
+        self._executor = self._create_executor()
+        self._restarts += 1
+        logger.warning("PDF render pool restarted")
+
+
+# Instanță globală
+pdf_render_pool = PDFRenderPool()
@@ -0,0 +1,201 @@
+# services/dashboard/price_cache.py
+"""
+Cache in-process pentru prețurile catalogului (grile ANONIM / USER / INSTALATOR / PRO).
+
+product_id -> array('q') cu 4 valori în bani (cenți), în ordinea PriceType;
+-1 = fără preț activ pe grila respectivă. Sume exacte (Decimal la citire),
+~100 de octeți per produs.
+
+- get_prices(db, product_ids, status): un singur SELECT pentru toate
+  produsele lipsă sau expirate, restul din memorie
+- warm(db): tot catalogul într-un singur SELECT (la pornire)
+- invalidate(product_ids): după scrierile pe product_prices
+  (ProductPriceService / ProductService.set_price, activare/dezactivare
+  companie, import). Fără argument - tot cache-ul
+
+Invalidarea e locală procesului; ceilalți worker-i văd prețul nou după
+price_cache_seconds (TTL-ul intrărilor), ca la stats_cache.
+"""
+from __future__ import annotations
+import logging
+import time
+from array import array
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models import PriceType, ProductPrice, UserStatus
+
+logger = logging.getLogger(__name__)
+
+# Ordinea din array
+PRICE_TYPES: Tuple[PriceType, ...] = tuple(PriceType)
+_PRICE_INDEX = {price_type: index for index, price_type in enumerate(PRICE_TYPES)}
+
+# Grila folosită la cumpărare, per status client
+STATUS_PRICE_TYPE = {
+    UserStatus.ANONIM: PriceType.ANONIM,
+    UserStatus.USER: PriceType.USER,
+    UserStatus.INSTALATOR: PriceType.INSTALATOR,
+    UserStatus.PRO: PriceType.PRO
+}
+
+# Grilele pe care le poate vedea fiecare status
+STATUS_VISIBLE_PRICES = {
+    UserStatus.ANONIM: (PriceType.ANONIM,),
+    UserStatus.USER: (PriceType.ANONIM, PriceType.USER),
+    UserStatus.INSTALATOR: (PriceType.ANONIM, PriceType.USER, PriceType.INSTALATOR),
+    UserStatus.PRO: PRICE_TYPES
+}
+
+NO_PRICE = -1
+
+
+def _to_cents(amount) -> int:
+    return int((Decimal(amount) * 100).to_integral_value())
+
+
+def _from_cents(cents: int) -> Optional[Decimal]:
+    if cents == NO_PRICE:
+        return None
+    return Decimal(cents).scaleb(-2)
+
+
+class PriceCache:
+    """product_id -> prețurile pe cele 4 grile, cu TTL și invalidare la scriere."""
+
+    def __init__(self, ttl_seconds: Optional[float] = None):
+        # None => se citește lazy din DashboardConfig (evită import circular)
+        self._ttl_seconds = ttl_seconds
+        self._entries: Dict[int, Tuple[float, array]] = {}
+        # Crește la fiecare invalidare; încărcările începute înainte nu se mai salvează
+        self._generation = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.queries = 0
+        self.evictions = 0
+
+    @property
+    def ttl_seconds(self) -> float:
+        if self._ttl_seconds is None:
+            from server.dashboard.config import default_config
+            self._ttl_seconds = default_config.price_cache_seconds
+        return self._ttl_seconds
+
+    async def get_prices(
+            self,
+            db: AsyncSession,
+            product_ids: Iterable[int],
+            user_status: UserStatus
+    ) -> Dict[int, Optional[Decimal]]:
+        """Prețul pe grila statusului pentru fiecare produs (None = fără preț activ)."""
+        price_type = STATUS_PRICE_TYPE.get(user_status)
+        product_ids = list(dict.fromkeys(product_ids))
+        if price_type is None:
+            return {product_id: None for product_id in product_ids}
+
+        index = _PRICE_INDEX[price_type]
+        rows = await self._rows(db, product_ids)
+        return {product_id: _from_cents(rows[product_id][index]) for product_id in product_ids}
+
+    async def get_price(self, db: AsyncSession, product_id: int, user_status: UserStatus) -> Optional[Decimal]:
+        return (await self.get_prices(db, [product_id], user_status))[product_id]
+
+    async def get_visible_prices(
+            self,
+            db: AsyncSession,
+            product_id: int,
+            user_status: UserStatus
+    ) -> Dict[str, float]:
+        """Prețurile active vizibile pentru status: {"anonim": 10.5, ...}."""
+        row = (await self._rows(db, [product_id]))[product_id]
+        return {
+            price_type.value: float(_from_cents(row[_PRICE_INDEX[price_type]]))
+            for price_type in STATUS_VISIBLE_PRICES.get(user_status, ())
+            if row[_PRICE_INDEX[price_type]] != NO_PRICE
+        }
+
+    async def warm(self, db: AsyncSession) -> int:
+        """Încarcă toate prețurile active într-un singur query."""
+        generation = self._generation
+        loaded = await self._load(db, None)
+        if generation == self._generation:
+            expires_at = time.monotonic() + self.ttl_seconds
+            self._entries = {product_id: (expires_at, row) for product_id, row in loaded.items()}
+        logger.info(f"Price cache: {len(loaded)} products loaded")
+        return len(loaded)
+
+    def invalidate(self, product_ids: Optional[Iterable[int]] = None) -> int:
+        """Evacuează produsele date sau, fără argument, tot cache-ul."""
+        self._generation += 1
+        if product_ids is None:
+            evicted = len(self._entries)
+            self._entries.clear()
+        else:
+            evicted = sum(1 for product_id in set(product_ids) if self._entries.pop(product_id, None) is not None)
+        self.evictions += evicted
+        return evicted
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "ttl_seconds": self.ttl_seconds,
+            "products": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "queries": self.queries,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups * 100, 2) if lookups else 0.0
+        }
+
+    async def _rows(self, db: AsyncSession, product_ids: List[int]) -> Dict[int, array]:
+        now = time.monotonic()
+        rows: Dict[int, array] = {}
+        missing = []
+
+        for product_id in product_ids:
+            entry = self._entries.get(product_id)
+            if entry is not None and entry[0] > now:
+                rows[product_id] = entry[1]
+            else:
+                missing.append(product_id)
+
+        self.hits += len(rows)
+        self.misses += len(missing)
+
+        if missing:
+            generation = self._generation
+            loaded = await self._load(db, missing)
+            expires_at = time.monotonic() + self.ttl_seconds
+            for product_id in missing:
+                row = loaded.get(product_id) or array("q", [NO_PRICE] * len(PRICE_TYPES))
+                rows[product_id] = row
+                if generation == self._generation and self.ttl_seconds > 0:
+                    self._entries[product_id] = (expires_at, row)
+
+        return rows
+
+    async def _load(self, db: AsyncSession, product_ids: Optional[List[int]]) -> Dict[int, array]:
+        query = select(ProductPrice.product_id, ProductPrice.price_type, ProductPrice.amount).where(
+            ProductPrice.is_active == True
+        )
+        if product_ids is not None:
+            query = query.where(ProductPrice.product_id.in_(product_ids))
+
+        result = await db.execute(query)
+        self.queries += 1
+
+        loaded: Dict[int, array] = {}
+        for product_id, price_type, amount in result.all():
+            row = loaded.get(product_id)
+            if row is None:
+                row = loaded[product_id] = array("q", [NO_PRICE] * len(PRICE_TYPES))
+            row[_PRICE_INDEX[price_type]] = _to_cents(amount)
+        return loaded
+
+
+# Instanță globală per proces
+price_cache = PriceCache()
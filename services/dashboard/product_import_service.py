@@ -0,0 +1,485 @@
+# services/dashboard/product_import_service.py
+"""
+Import în masă pentru produse (Excel -> products + product_prices).
+
+În loc de câteva query-uri per produs (buclă de unicitate slug, flush,
+4 INSERT-uri de preț), importul:
+- preia într-un singur query slug-urile și SKU-urile deja existente
+- rezolvă coliziunile de slug în memorie
+- inserează produsele și prețurile cu INSERT multi-rând ... RETURNING, pe chunk-uri
+- păstrează raportarea erorilor per rând (un chunk eșuat se reia rând cu rând)
+
+Preview-ul validează fișierul pe coloane (pandas), cu un singur lookup
+`sku = ANY(...)` pentru SKU-urile existente.
+"""
+from __future__ import annotations
+import logging
+from dataclasses import dataclass
+from typing import List, Dict, Any, Optional, Set, Tuple, Union
+
+import numpy as np
+import pandas as pd
+from slugify import slugify
+from sqlalchemy import select, insert, or_, func, any_, bindparam, String, Integer
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models import Product, ProductPrice, PriceType, Category
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ImportRow:
+    """Un rând valid din fișier, pregătit pentru INSERT."""
+    row: int
+    sku: str
+    base_slug: str
+    values: Dict[str, Any]
+    prices: Dict[PriceType, float]
+
+
+class ProductImportService:
+    """Import produse în lot."""
+
+    # Rânduri per INSERT (produse × ~12 coloane, prețuri × 4 rânduri)
+    CHUNK_SIZE = 500
+
+    PRICE_FIELDS = {
+        PriceType.ANONIM: 'price_anonim',
+        PriceType.USER: 'price_user',
+        PriceType.INSTALATOR: 'price_instalator',
+        PriceType.PRO: 'price_pro'
+    }
+
+    # Mapare coloane Excel -> câmpuri sistem
+    COLUMN_MAPPING = {
+        'SKU': 'sku',
+        'Nume': 'name',
+        'Descriere': 'description',
+        'Descriere Scurtă': 'short_description',
+        'ID Categorie': 'category_id',
+        'Preț Anonim': 'price_anonim',
+        'Preț User': 'price_user',
+        'Preț Instalator': 'price_instalator',
+        'Preț Pro': 'price_pro',
+        'Meta Title': 'meta_title',
+        'Meta Description': 'meta_description',
+        'În Stoc': 'in_stock',
+        'Cantitate': 'stock_quantity'
+    }
+
+    TEXT_FIELDS = ['sku', 'name', 'description', 'short_description', 'meta_title', 'meta_description']
+    INT_FIELDS = ['category_id', 'stock_quantity']
+    TRUE_VALUES = ['DA', 'YES', 'TRUE', '1']
+
+    # Perechi (mai mic, mai mare): prețul pentru nivelul superior trebuie să fie mai mic
+    PRICE_ORDER_WARNINGS = [
+        ('price_user', 'price_anonim', 'Preț user >= preț anonim'),
+        ('price_instalator', 'price_user', 'Preț instalator >= preț user'),
+        ('price_pro', 'price_instalator', 'Preț pro >= preț instalator')
+    ]
+
+    # ==================== PREVIEW ====================
+
+    @staticmethod
+    async def preview_frame(
+            db: AsyncSession,
+            df: pd.DataFrame,
+            import_type: str,
+            category_id: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Validează tot fișierul pe coloane.
+
+        Returns:
+            {"products": [{row, errors, warnings, ...câmpuri}], "stats": {...}}
+        """
+        frame = ProductImportService._normalize_frame(df)
+
+        # Pentru import per categorie
+        if import_type == 'category' and category_id:
+            frame['category_id'] = pd.Series(category_id, index=frame.index, dtype='Int64')
+
+        count = len(frame)
+        errors: List[List[str]] = [[] for _ in range(count)]
+        warnings: List[List[str]] = [[] for _ in range(count)]
+
+        # SKU: lipsă / existent (un singur query pentru toate)
+        sku = frame['sku']
+        missing_sku = (sku.isna() | (sku == '')).astype(bool)
+        ProductImportService._flag(errors, missing_sku, 'SKU lipsă')
+
+        existing_skus = await ProductImportService._fetch_existing_skus(
+            db, sku[~missing_sku].unique().tolist()
+        )
+        ProductImportService._flag(
+            errors,
+            ~missing_sku & sku.isin(existing_skus),
+            "SKU " + sku.astype(str) + " există deja"
+        )
+
+        name = frame['name']
+        ProductImportService._flag(errors, name.isna() | (name == ''), 'Nume lipsă')
+
+        # Prețuri
+        for field in ProductImportService.PRICE_FIELDS.values():
+            price = frame[field]
+            ProductImportService._flag(
+                errors,
+                price.isna() | (price <= 0),
+                f'{field.replace("_", " ").title()} invalid'
+            )
+
+        # Categorie pentru import general
+        if import_type == 'general':
+            category = frame['category_id']
+            missing_category = (category.isna() | (category == 0)).fillna(True).astype(bool)
+            ProductImportService._flag(errors, missing_category, 'ID categorie lipsă')
+
+            valid_categories = await ProductImportService._fetch_categories(
+                db, {int(value) for value in category[~missing_category].unique()}
+            )
+            ProductImportService._flag(
+                errors,
+                ~missing_category & ~category.isin(valid_categories),
+                "Categoria " + category.astype(str) + " nu există"
+            )
+
+        # Warnings pentru logica prețuri
+        prices = frame[list(ProductImportService.PRICE_FIELDS.values())]
+        all_positive = (prices > 0).all(axis=1)
+        for lower, higher, message in ProductImportService.PRICE_ORDER_WARNINGS:
+            ProductImportService._flag(warnings, all_positive & (frame[lower] >= frame[higher]), message)
+
+        # Doar câmpurile cu valoare, ca în formatul anterior
+        records = frame.astype(object).where(frame.notna(), None).to_dict('records')
+        products = []
+        for position, (index, record) in enumerate(zip(df.index, records)):
+            product_data = {'row': int(index) + 2, 'errors': errors[position], 'warnings': warnings[position]}
+            product_data.update({key: value for key, value in record.items() if value is not None})
+            products.append(product_data)
+
+        error_count = sum(1 for row_errors in errors if row_errors)
+        return {
+            "products": products,
+            "stats": {
+                "total": count,
+                "valid": count - error_count,
+                "errors": error_count
+            }
+        }
+
+    @staticmethod
+    def _normalize_frame(df: pd.DataFrame) -> pd.DataFrame:
+        """Redenumește coloanele și convertește tipurile pe coloană întreagă."""
+        present = {
+            excel_col: field
+            for excel_col, field in ProductImportService.COLUMN_MAPPING.items()
+            if excel_col in df.columns
+        }
+        frame = df[list(present)].rename(columns=present).copy()
+        for field in ProductImportService.COLUMN_MAPPING.values():
+            if field not in frame.columns:
+                frame[field] = pd.Series(np.nan, index=frame.index, dtype=object)
+
+        for field in ProductImportService.TEXT_FIELDS:
+            column = frame[field]
+            frame[field] = column.where(column.isna(), column.astype(str))
+
+        for field in ProductImportService.INT_FIELDS:
+            frame[field] = np.trunc(pd.to_numeric(frame[field], errors='coerce')).astype('Int64')
+
+        for field in ProductImportService.PRICE_FIELDS.values():
+            frame[field] = pd.to_numeric(frame[field], errors='coerce').astype(float)
+
+        # DA/NU, YES/NO, TRUE/FALSE, 1/0 sau valori booleene/numerice
+        in_stock = frame['in_stock']
+        as_number = pd.to_numeric(in_stock, errors='coerce')
+        as_text = in_stock.astype(str).str.strip().str.upper().isin(ProductImportService.TRUE_VALUES)
+        flags = (as_number != 0).where(as_number.notna(), as_text)
+        frame['in_stock'] = flags.astype(object).where(in_stock.notna(), None)
+
+        return frame
+
+    @staticmethod
+    def _flag(
+            target: List[List[str]],
+            mask: pd.Series,
+            message: Union[str, pd.Series]
+    ) -> None:
+        """Adaugă mesajul la rândurile marcate în mască."""
+        positions = np.flatnonzero(mask.fillna(False).to_numpy(dtype=bool))
+        for position in positions:
+            target[position].append(message if isinstance(message, str) else message.iloc[position])
+
+    @staticmethod
+    async def _fetch_existing_skus(db: AsyncSession, skus: List[str]) -> Set[str]:
+        """SKU-urile deja existente, într-un singur query."""
+        if not skus:
+            return set()
+        result = await db.execute(
+            select(Product.sku).where(
+                Product.sku == any_(bindparam('skus', value=skus, type_=ARRAY(String)))
+            )
+        )
+        return set(result.scalars().all())
+
+    # ==================== IMPORT ====================
+
+    @staticmethod
+    async def import_products(
+            db: AsyncSession,
+            products_data: List[Dict[str, Any]],
+            default_category_id: Optional[int] = None,
+            vendor_company_id: int = 1,
+            chunk_size: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Importă produsele (fără commit - apelantul decide).
+
+        Args:
+            products_data: rândurile din preview (sku, name, price_*, row, ...)
+            default_category_id: pentru importul per categorie
+            vendor_company_id: System Vendor în MVP
+
+        Returns:
+            {'success': int, 'failed': int, 'details': [...]} - details în ordinea rândurilor
+        """
+        results = {'success': 0, 'failed': 0, 'details': []}
+        chunk_size = chunk_size or ProductImportService.CHUNK_SIZE
+
+        ready = await ProductImportService.prepare_rows(
+            db, products_data, results, default_category_id, vendor_company_id
+        )
+
+        for start in range(0, len(ready), chunk_size):
+            await ProductImportService.insert_chunk(db, ready[start:start + chunk_size], results)
+
+        results['details'].sort(key=lambda detail: detail['row'])
+        return results
+
+    @staticmethod
+    async def prepare_rows(
+            db: AsyncSession,
+            products_data: List[Dict[str, Any]],
+            results: Dict[str, Any],
+            default_category_id: Optional[int] = None,
+            vendor_company_id: int = 1
+    ) -> List[ImportRow]:
+        """Validează rândurile, verifică SKU / categorii și alocă slug-urile."""
+        prepared: List[ImportRow] = []
+        for product_data in products_data:
+            try:
+                prepared.append(
+                    ProductImportService._build_row(product_data, default_category_id, vendor_company_id)
+                )
+            except (KeyError, TypeError, ValueError) as e:
+                ProductImportService._add_error(
+                    results, product_data.get('row', 0), product_data.get('sku') or 'N/A', str(e)
+                )
+
+        if not prepared:
+            return []
+
+        taken_slugs, existing_skus = await ProductImportService._fetch_existing(
+            db,
+            [row.base_slug for row in prepared],
+            [row.sku for row in prepared]
+        )
+        valid_categories = await ProductImportService._fetch_categories(
+            db, {row.values['category_id'] for row in prepared}
+        )
+
+        ready: List[ImportRow] = []
+        seen_skus: Set[str] = set()
+        for row in prepared:
+            if row.sku in existing_skus:
+                ProductImportService._add_error(results, row.row, row.sku, f"SKU {row.sku} există deja")
+            elif row.sku in seen_skus:
+                ProductImportService._add_error(results, row.row, row.sku, f"SKU {row.sku} duplicat în fișier")
+            elif row.values['category_id'] not in valid_categories:
+                ProductImportService._add_error(
+                    results, row.row, row.sku, f"Categoria {row.values['category_id']} nu există"
+                )
+            else:
+                seen_skus.add(row.sku)
+                row.values['slug'] = ProductImportService._allocate_slug(row.base_slug, taken_slugs)
+                ready.append(row)
+
+        return ready
+
+    @staticmethod
+    async def insert_chunk(db: AsyncSession, rows: List[ImportRow], results: Dict[str, Any]) -> None:
+        """Inserează un chunk într-un savepoint; la eșec reia rând cu rând."""
+        if not rows:
+            return
+
+        try:
+            async with db.begin_nested():
+                product_ids = await ProductImportService._insert_rows(db, rows)
+        except SQLAlchemyError as e:
+            logger.warning(f"Import chunk of {len(rows)} rows failed, retrying per row: {e}")
+            for row in rows:
+                try:
+                    async with db.begin_nested():
+                        product_ids = await ProductImportService._insert_rows(db, [row])
+                except SQLAlchemyError as row_error:
+                    message = str(getattr(row_error, 'orig', None) or row_error)
+                    ProductImportService._add_error(results, row.row, row.sku, message)
+                    continue
+                ProductImportService._add_success(results, row, product_ids[row.sku])
+            return
+
+        for row in rows:
+            ProductImportService._add_success(results, row, product_ids[row.sku])
+
+    # ==================== INTERNE ====================
+
+    @staticmethod
+    def _build_row(
+            product_data: Dict[str, Any],
+            default_category_id: Optional[int],
+            vendor_company_id: int
+    ) -> ImportRow:
+        """Normalizează un rând din preview; ValueError pentru date invalide."""
+        sku = str(product_data.get('sku') or '').strip()
+        name = str(product_data.get('name') or '').strip()
+        if not sku:
+            raise ValueError('SKU lipsă')
+        if not name:
+            raise ValueError('Nume lipsă')
+
+        category_id = product_data.get('category_id') or default_category_id
+        if not category_id:
+            raise ValueError('ID categorie lipsă')
+
+        base_slug = slugify(name)
+        if not base_slug:
+            raise ValueError(f'Nu se poate genera slug din numele "{name}"')
+
+        prices = {
+            price_type: float(product_data.get(field, 0) or 0)
+            for price_type, field in ProductImportService.PRICE_FIELDS.items()
+        }
+
+        return ImportRow(
+            row=product_data.get('row', 0),
+            sku=sku,
+            base_slug=base_slug,
+            values={
+                'vendor_company_id': vendor_company_id,
+                'category_id': int(category_id),
+                'name': name,
+                'sku': sku,
+                'description': product_data.get('description'),
+                'short_description': product_data.get('short_description'),
+                'in_stock': product_data.get('in_stock', True),
+                'stock_quantity': product_data.get('stock_quantity', 0),
+                'meta_title': product_data.get('meta_title') or name,
+                'meta_description': product_data.get('meta_description'),
+                'sort_order': 0
+            },
+            prices=prices
+        )
+
+    @staticmethod
+    async def _fetch_existing(
+            db: AsyncSession,
+            base_slugs: List[str],
+            skus: List[str]
+    ) -> Tuple[Set[str], Set[str]]:
+        """
+        Un singur query pentru slug-urile ocupate și SKU-urile existente.
+
+        Slug-urile ocupate includ variantele numerotate ("baza-1", "baza-2"...).
+        Listele se trimit ca array-uri (un singur parametru, indiferent de mărime).
+        """
+        slugs_param = bindparam('base_slugs', value=list(set(base_slugs)), type_=ARRAY(String))
+        skus_param = bindparam('skus', value=list(set(skus)), type_=ARRAY(String))
+
+        result = await db.execute(
+            select(Product.slug, Product.sku).where(
+                or_(
+                    Product.slug == any_(slugs_param),
+                    func.regexp_replace(Product.slug, '-[0-9]+$', '') == any_(slugs_param),
+                    Product.sku == any_(skus_param)
+                )
+            )
+        )
+
+        requested_skus = set(skus)
+        taken_slugs: Set[str] = set()
+        existing_skus: Set[str] = set()
+        for slug, sku in result:
+            taken_slugs.add(slug)
+            if sku in requested_skus:
+                existing_skus.add(sku)
+        return taken_slugs, existing_skus
+
+    @staticmethod
+    async def _fetch_categories(db: AsyncSession, category_ids: Set[int]) -> Set[int]:
+        """ID-urile de categorie care există."""
+        result = await db.execute(
+            select(Category.id).where(
+                Category.id == any_(bindparam('category_ids', value=list(category_ids), type_=ARRAY(Integer)))
+            )
+        )
+        return set(result.scalars().all())
+
+    @staticmethod
+    def _allocate_slug(base_slug: str, taken: Set[str]) -> str:
+        """Primul slug liber: baza, baza-1, baza-2... (marchează slug-ul ca ocupat)."""
+        slug = base_slug
+        counter = 1
+        while slug in taken:
+            slug = f"{base_slug}-{counter}"
+            counter += 1
+        taken.add(slug)
+        return slug
+
+    @staticmethod
+    async def _insert_rows(db: AsyncSession, rows: List[ImportRow]) -> Dict[str, int]:
+        """INSERT multi-rând pentru produse (RETURNING id) și prețurile lor."""
+        result = await db.execute(
+            insert(Product)
+            .values([row.values for row in rows])
+            .returning(Product.id, Product.sku)
+        )
+        product_ids = {sku: product_id for product_id, sku in result.all()}
+
+        price_values = [
+            {
+                'product_id': product_ids[row.sku],
+                'price_type': price_type,
+                'amount': amount,
+                'currency': "MDL"
+            }
+            for row in rows
+            for price_type, amount in row.prices.items()
+        ]
+        if price_values:
+            await db.execute(insert(ProductPrice).values(price_values))
+
+        return product_ids
+
+    @staticmethod
+    def _add_success(results: Dict[str, Any], row: ImportRow, product_id: int) -> None:
+        results['success'] += 1
+        results['details'].append({
+            'row': row.row,
+            'sku': row.sku,
+            'status': 'success',
+            'product_id': product_id
+        })
+
+    @staticmethod
+    def _add_error(results: Dict[str, Any], row: int, sku: str, message: str) -> None:
+        results['failed'] += 1
+        results['details'].append({
+            'row': row,
+            'sku': sku,
+            'status': 'error',
+            'message': message
+        })
@@ -0,0 +1,413 @@
+# services/dashboard/sales_rollup_service.py
+"""
+Service pentru rollup-ul zilnic de vânzări (daily_sales_rollup).
+
+Reîmprospătarea e incrementală: se reprocesează doar zilele în care au
+fost create/modificate comenzi după ultimul watermark, plus zilele
+comenzilor marcate la scriere (mark_orders_dirty - prinde și editările
+doar pe order_items, care nu ating orders.updated_at). Rapoartele pe
+7-365 zile citesc apoi câteva sute de rânduri mici în loc să facă join
+pe tot istoricul orders / order_items / products.
+
+Zilele sunt în UTC (ca start_day din rapoarte), nu în timezone-ul sesiunii DB.
+
+Reîmprospătarea rulează în fundal (SalesRollupScheduler, pornit din lifespan)
+cu sesiune DB proprie. Înainte de a recalcula din rollup (după o evacuare
+din stats_cache), rapoartele reprocesează doar zilele marcate în procesul
+curent - refresh_pending(), câteva zile, nu toată scanarea.
+"""
+from __future__ import annotations
+import asyncio
+import itertools
+import logging
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Iterable, List, Dict, Any, Optional
+
+from sqlalchemy import select, func, and_, delete, insert, distinct, literal
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from cfg import async_session_maker
+from models import (
+    Order, OrderStatus, OrderItem, Product, Category,
+    DailySalesRollup, RollupWatermark
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _order_day():
+    """Ziua comenzii în UTC - independent de timezone-ul sesiunii DB."""
+    return func.date(func.timezone('UTC', Order.created_at))
+
+
+class SalesRollupService:
+    """Reîmprospătare și citire pentru daily_sales_rollup."""
+
+    WATERMARK_NAME = "daily_sales_rollup"
+
+    # Cheie pentru pg_advisory_xact_lock - o singură reîmprospătare simultan
+    ADVISORY_LOCK_KEY = 731_001
+
+    # Tranzacțiile începute înainte de watermark pot comite după el;
+    # reprocesăm o fereastră de siguranță (idempotent)
+    SAFETY_MARGIN = timedelta(minutes=5)
+
+    # order_id -> numărul ultimei marcări; comenzile scrise în procesul curent,
+    # încă nereprocesate. Se șterg doar după commit-ul refresh-ului și doar dacă
+    # nu au fost marcate din nou între timp.
+    _pending_orders: Dict[int, int] = {}
+    _mark_sequence = itertools.count(1)
+
+    @staticmethod
+    def mark_orders_dirty(order_ids: Iterable[int]) -> None:
+        """Apelat după commit-ul scrierilor pe orders / order_items (lângă stats_cache.invalidate)."""
+        for order_id in order_ids:
+            SalesRollupService._pending_orders[order_id] = next(SalesRollupService._mark_sequence)
+
+    @staticmethod
+    def has_pending() -> bool:
+        return bool(SalesRollupService._pending_orders)
+
+    @staticmethod
+    async def refresh(db: AsyncSession, full: bool = False, pending_only: bool = False) -> int:
+        """
+        Reprocesează zilele atinse de la ultimul watermark și zilele comenzilor marcate.
+
+        Args:
+            pending_only: doar comenzile marcate (fără scanarea după updated_at;
+                watermark-ul rămâne neschimbat)
+
+        Returns:
+            Numărul de zile reprocesate (-1 pentru rebuild complet)
+        """
+        pending = dict(SalesRollupService._pending_orders)
+        if pending_only and not pending:
+            return 0
+
+        await db.execute(select(func.pg_advisory_xact_lock(SalesRollupService.ADVISORY_LOCK_KEY)))
+
+        started_at = await db.scalar(select(func.now()))
+
+        watermark = await db.scalar(
+            select(RollupWatermark)
+            .where(RollupWatermark.name == SalesRollupService.WATERMARK_NAME)
+        )
+
+        if full or watermark is None:
+            await db.execute(delete(DailySalesRollup))
+            await SalesRollupService._insert_rollup_rows(db, days=None)
+            processed = -1
+            logger.info("Sales rollup: full rebuild")
+        else:
+            days = set()
+            if pending:
+                marked = await db.execute(
+                    select(_order_day()).distinct().where(Order.id.in_(pending))
+                )
+                days.update(marked.scalars().all())
+            if not pending_only:
+                since = watermark.refreshed_at - SalesRollupService.SAFETY_MARGIN
+                touched = await db.execute(
+                    select(_order_day()).distinct().where(Order.updated_at >= since)
+                )
+                days.update(touched.scalars().all())
+            days = sorted(days)
+
+            if days:
+                await db.execute(
+                    delete(DailySalesRollup).where(DailySalesRollup.day.in_(days))
+                )
+                await SalesRollupService._insert_rollup_rows(db, days=days)
+                logger.info(f"Sales rollup: reprocessed {len(days)} days")
+            processed = len(days)
+
+        if watermark is None:
+            db.add(RollupWatermark(name=SalesRollupService.WATERMARK_NAME, refreshed_at=started_at))
+        elif not pending_only:
+            watermark.refreshed_at = started_at
+
+        await db.commit()
+
+        for order_id, sequence in pending.items():
+            if SalesRollupService._pending_orders.get(order_id) == sequence:
+                del SalesRollupService._pending_orders[order_id]
+        return processed
+
+    @staticmethod
+    async def _insert_rollup_rows(db: AsyncSession, days: Optional[List[date]]) -> None:
+        """Inserează cele 3 nivele de rollup pentru zilele date (None = tot istoricul)."""
+        day_col = _order_day()
+
+        def restrict(stmt):
+            if days is None:
+                return stmt
+            # Intervalul permite folosirea indexului pe created_at, IN-ul filtrează exact
+            return stmt.where(
+                and_(
+                    Order.created_at >= datetime.combine(min(days), time.min, tzinfo=timezone.utc),
+                    Order.created_at < datetime.combine(max(days) + timedelta(days=1), time.min, tzinfo=timezone.utc),
+                    day_col.in_(days)
+                )
+            )
+
+        columns = [
+            DailySalesRollup.level, DailySalesRollup.day, DailySalesRollup.status,
+            DailySalesRollup.product_id, DailySalesRollup.category_id, DailySalesRollup.vendor_company_id,
+            DailySalesRollup.quantity, DailySalesRollup.revenue, DailySalesRollup.order_count
+        ]
+
+        # 1. zi × status × produs × categorie × vendor
+        product_level = restrict(
+            select(
+                literal(DailySalesRollup.LEVEL_PRODUCT),
+                day_col,
+                Order.status,
+                OrderItem.product_id,
+                Product.category_id,
+                OrderItem.vendor_company_id,
+                func.sum(OrderItem.quantity),
+                func.sum(OrderItem.subtotal),
+                func.count(distinct(Order.id))
+            )
+            .select_from(OrderItem)
+            .join(Order, OrderItem.order_id == Order.id)
+            .join(Product, OrderItem.product_id == Product.id)
+        ).group_by(
+            day_col, Order.status, OrderItem.product_id,
+            Product.category_id, OrderItem.vendor_company_id
+        )
+
+        # 2. zi × status × categorie (comenzi distincte exacte)
+        category_level = restrict(
+            select(
+                literal(DailySalesRollup.LEVEL_CATEGORY),
+                day_col,
+                Order.status,
+                literal(None),
+                Product.category_id,
+                literal(None),
+                func.sum(OrderItem.quantity),
+                func.sum(OrderItem.subtotal),
+                func.count(distinct(Order.id))
+            )
+            .select_from(OrderItem)
+            .join(Order, OrderItem.order_id == Order.id)
+            .join(Product, OrderItem.product_id == Product.id)
+        ).group_by(day_col, Order.status, Product.category_id)
+
+        # 3. zi × status (totaluri din orders)
+        order_level = restrict(
+            select(
+                literal(DailySalesRollup.LEVEL_ORDER),
+                day_col,
+                Order.status,
+                literal(None),
+                literal(None),
+                literal(None),
+                literal(0),
+                func.coalesce(func.sum(Order.total_amount), 0),
+                func.count(Order.id)
+            )
+        ).group_by(day_col, Order.status)
+
+        for stmt in (product_level, category_level, order_level):
+            await db.execute(insert(DailySalesRollup).from_select(columns, stmt))
+
+    # ==================== CITIRE ====================
+
+    @staticmethod
+    async def get_orders_by_status(
+            db: AsyncSession,
+            start_day: date
+    ) -> Dict[str, Dict[str, Any]]:
+        """Număr și total comenzi pe status începând cu start_day."""
+        result = await db.execute(
+            select(
+                DailySalesRollup.status,
+                func.sum(DailySalesRollup.order_count).label('count'),
+                func.sum(DailySalesRollup.revenue).label('total')
+            )
+            .where(
+                and_(
+                    DailySalesRollup.level == DailySalesRollup.LEVEL_ORDER,
+                    DailySalesRollup.day >= start_day
+                )
+            )
+            .group_by(DailySalesRollup.status)
+        )
+
+        return {
+            row.status.value: {
+                "count": int(row.count or 0),
+                "total": float(row.total or 0)
+            }
+            for row in result
+        }
+
+    @staticmethod
+    async def get_orders_count(db: AsyncSession, start_day: date) -> int:
+        """Număr total comenzi (toate statusurile) începând cu start_day."""
+        count = await db.scalar(
+            select(func.sum(DailySalesRollup.order_count))
+            .where(
+                and_(
+                    DailySalesRollup.level == DailySalesRollup.LEVEL_ORDER,
+                    DailySalesRollup.day >= start_day
+                )
+            )
+        )
+        return int(count or 0)
+
+    @staticmethod
+    async def get_top_products(
+            db: AsyncSession,
+            start_day: date,
+            limit: int = 10,
+            vendor_company_id: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Top produse după venit (fără comenzi anulate)."""
+        conditions = [
+            DailySalesRollup.level == DailySalesRollup.LEVEL_PRODUCT,
+            DailySalesRollup.day >= start_day,
+            DailySalesRollup.status != OrderStatus.CANCELLED
+        ]
+        if vendor_company_id:
+            conditions.append(DailySalesRollup.vendor_company_id == vendor_company_id)
+
+        totals = (
+            select(
+                DailySalesRollup.product_id,
+                func.sum(DailySalesRollup.quantity).label('quantity'),
+                func.sum(DailySalesRollup.revenue).label('revenue')
+            )
+            .where(and_(*conditions))
+            .group_by(DailySalesRollup.product_id)
+            .order_by(func.sum(DailySalesRollup.revenue).desc())
+            .limit(limit)
+            .subquery()
+        )
+
+        result = await db.execute(
+            select(Product.name, Product.sku, totals.c.quantity, totals.c.revenue)
+            .join(totals, totals.c.product_id == Product.id)
+            .order_by(totals.c.revenue.desc())
+        )
+
+        return [
+            {
+                "name": row.name,
+                "sku": row.sku,
+                "quantity": int(row.quantity or 0),
+                "revenue": float(row.revenue or 0)
+            }
+            for row in result
+        ]
+
+    @staticmethod
+    async def get_top_categories(
+            db: AsyncSession,
+            start_day: date,
+            limit: int = 5
+    ) -> List[Dict[str, Any]]:
+        """Top categorii după venit (fără comenzi anulate)."""
+        totals = (
+            select(
+                DailySalesRollup.category_id,
+                func.sum(DailySalesRollup.order_count).label('orders'),
+                func.sum(DailySalesRollup.revenue).label('revenue')
+            )
+            .where(
+                and_(
+                    DailySalesRollup.level == DailySalesRollup.LEVEL_CATEGORY,
+                    DailySalesRollup.day >= start_day,
+                    DailySalesRollup.status != OrderStatus.CANCELLED
+                )
+            )
+            .group_by(DailySalesRollup.category_id)
+            .order_by(func.sum(DailySalesRollup.revenue).desc())
+            .limit(limit)
+            .subquery()
+        )
+
+        result = await db.execute(
+            select(Category.name, totals.c.orders, totals.c.revenue)
+            .join(totals, totals.c.category_id == Category.id)
+            .order_by(totals.c.revenue.desc())
+        )
+
+        return [
+            {
+                "name": row.name,
+                "orders": int(row.orders or 0),
+                "revenue": float(row.revenue or 0)
+            }
+            for row in result
+        ]
+
+
+class SalesRollupScheduler:
+    """Reîmprospătare incrementală periodică, în afara request-urilor."""
+
+    def __init__(self, interval_seconds: Optional[int] = None):
+        # None => se citește din DashboardConfig la start() (evită import circular)
+        self.interval_seconds = interval_seconds
+        self._task: Optional[asyncio.Task] = None
+        self._pending_task: Optional[asyncio.Future] = None
+
+    def start(self) -> None:
+        if self._task is not None:
+            return
+        if self.interval_seconds is None:
+            from server.dashboard.config import default_config
+            self.interval_seconds = default_config.sales_rollup_refresh_seconds
+        if self.interval_seconds <= 0:
+            return
+        self._task = asyncio.create_task(self._loop(), name="sales-rollup")
+        logger.info(f"Sales rollup refresh every {self.interval_seconds} s")
+
+    async def shutdown(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    async def run_once(self, pending_only: bool = False) -> int:
+        async with async_session_maker() as db:
+            return await SalesRollupService.refresh(db, pending_only=pending_only)
+
+    async def refresh_pending(self) -> None:
+        """
+        Înainte de citirea din rollup: reprocesează zilele comenzilor marcate în
+        procesul curent. Request-urile concurente așteaptă aceeași reîmprospătare.
+        """
+        task = self._pending_task
+        if task is not None and not task.done():
+            # Poate a început înaintea ultimei scrieri - se reia mai jos dacă e cazul
+            await asyncio.shield(task)
+
+        if SalesRollupService.has_pending():
+            task = self._pending_task
+            if task is None or task.done():
+                self._pending_task = task = asyncio.ensure_future(self._refresh_pending())
+            await asyncio.shield(task)
+
+    async def _refresh_pending(self) -> None:
+        try:
+            await self.run_once(pending_only=True)
+        except Exception:
+            # Raportul se calculează din rollup-ul existent; zilele rămân marcate
+            logger.exception("Sales rollup pending refresh failed")
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Sales rollup refresh failed")
+            await asyncio.sleep(self.interval_seconds)
+
+
+# Instanță globală
+sales_rollup_scheduler = SalesRollupScheduler()
@@ -0,0 +1,136 @@
+# services/dashboard/search_service.py
+"""
+Căutare pentru produse, clienți și comenzi (pickere + liste din dashboard).
+
+În loc de `col.ilike('%q%')` pe mai multe coloane (seq scan), fiecare entitate
+are un document de căutare indexat (migrarea b6f0c3d18e42):
+- trigrame (pg_trgm, GIN) pe f_unaccent(coloane concatenate) - subșir
+  oriunde, fără diacritice ("teava" găsește "țeavă"), fiecare cuvânt din
+  termen trebuie să apară
+- cod (SKU, număr comandă): prefix pe lower(cod) (btree text_pattern_ops)
+- produse: full-text pe nume (A) + descriere (B), configurația
+  romanian_unaccent (stemming românesc + fără diacritice)
+
+Relevanța: potrivire exactă / prefix pe cod, apoi word_similarity și ts_rank.
+
+    query = SearchService.apply(query, PRODUCT_SEARCH, q)          # picker, ordonat după relevanță
+    filters.append(SearchService.condition(CLIENT_SEARCH, search))  # listă cu sortarea ei
+
+Expresiile din SearchSpec trebuie să fie identice cu cele din indexuri.
+"""
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import List, Optional
+
+from sqlalchemy import and_, case, func, literal, literal_column, or_
+from sqlalchemy.sql import ColumnElement, Select
+
+# Configurația text search creată în migrare (romanian + unaccent)
+TEXT_SEARCH_CONFIG = "romanian_unaccent"
+
+# Termenii lungi nu mai ajută la relevanță, doar încetinesc
+MAX_TERM_LENGTH = 100
+
+
+@dataclass(frozen=True)
+class SearchSpec:
+    """Documentul de căutare al unei entități (expresii SQL, ca în indexuri)."""
+    document: str  # indexat cu gin_trgm_ops
+    code: Optional[str] = None  # indexat lower(...) text_pattern_ops
+    vector: Optional[str] = None  # coloană tsvector (GIN)
+
+
+PRODUCT_SEARCH = SearchSpec(
+    document="f_unaccent(products.name || ' ' || products.sku)",
+    code="products.sku",
+    vector="products.search_vector"
+)
+
+CLIENT_SEARCH = SearchSpec(
+    document=(
+        "f_unaccent(coalesce(clients.first_name, '') || ' ' || coalesce(clients.last_name, '') || ' ' || "
+        "coalesce(clients.email, '') || ' ' || coalesce(clients.phone, '') || ' ' || "
+        "coalesce(clients.username, ''))"
+    )
+)
+
+ORDER_SEARCH = SearchSpec(
+    document="orders.order_number",
+    code="orders.order_number"
+)
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+class SearchService:
+    """Constructorul comun de condiții și relevanță."""
+
+    @staticmethod
+    def normalize(term: Optional[str]) -> str:
+        return " ".join((term or "").split())[:MAX_TERM_LENGTH]
+
+    @staticmethod
+    def words(term: str) -> List[str]:
+        normalized = SearchService.normalize(term)
+        return normalized.split(" ") if normalized else []
+
+    @staticmethod
+    def condition(spec: SearchSpec, term: str) -> ColumnElement:
+        """WHERE: toate cuvintele în document, sau prefix pe cod, sau full-text."""
+        term = SearchService.normalize(term)
+        if not term:
+            return literal(True)
+
+        document = literal_column(spec.document)
+        clauses = [
+            and_(*(
+                document.ilike(func.f_unaccent(f"%{_escape_like(word)}%"), escape="\\")
+                for word in SearchService.words(term)
+            ))
+        ]
+
+        if spec.code:
+            clauses.append(
+                func.lower(literal_column(spec.code)).like(f"{_escape_like(term.lower())}%", escape="\\")
+            )
+
+        if spec.vector:
+            clauses.append(
+                literal_column(spec.vector).op("@@")(SearchService._tsquery(term))
+            )
+
+        return or_(*clauses)
+
+    @staticmethod
+    def rank(spec: SearchSpec, term: str) -> ColumnElement:
+        """Scor de relevanță (mai mare = mai relevant)."""
+        term = SearchService.normalize(term)
+        score = func.word_similarity(func.f_unaccent(term), literal_column(spec.document))
+
+        if spec.code:
+            code = func.lower(literal_column(spec.code))
+            score = score + case(
+                (code == term.lower(), 2.0),
+                (code.like(f"{_escape_like(term.lower())}%", escape="\\"), 1.0),
+                else_=0.0
+            )
+
+        if spec.vector:
+            score = score + func.ts_rank(literal_column(spec.vector), SearchService._tsquery(term))
+
+        return score
+
+    @staticmethod
+    def apply(query: Select, spec: SearchSpec, term: Optional[str]) -> Select:
+        """Filtrează și ordonează după relevanță (pentru pickere); fără termen - neschimbat."""
+        if not SearchService.normalize(term):
+            return query
+        return query.where(SearchService.condition(spec, term)).order_by(
+            SearchService.rank(spec, term).desc()
+        )
+
+    @staticmethod
+    def _tsquery(term: str) -> ColumnElement:
+        return func.websearch_to_tsquery(literal_column(f"'{TEXT_SEARCH_CONFIG}'::regconfig"), term)
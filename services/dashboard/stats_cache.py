@@ -0,0 +1,172 @@
+# services/dashboard/stats_cache.py
+"""
+Cache async cu TTL pentru statisticile dashboard-ului.
+
+Cheile sunt (metodă, perioadă, scope vendor). Calculele concurente pentru
+aceeași cheie sunt comasate (single-flight): primul request calculează,
+restul așteaptă același rezultat (dacă primul e anulat, unul dintre cei care
+aștepta preia calculul). Scrierile care afectează statisticile
+(comenzi, coșuri) evacuează cheile relevante prin invalidate().
+
+TTL-ul vine din DashboardConfig.stats_cache_minutes.
+"""
+from __future__ import annotations
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Metodele DashboardStatsService care sunt cache-uite
+DASHBOARD_STATS = "dashboard_stats"
+QUICK_STATS = "quick_stats"
+DETAILED_STATS = "detailed_stats"
+CHARTS_DATA = "charts_data"
+
+# Ce chei depind de ce scrieri
+ORDER_DEPENDENT_STATS = (DASHBOARD_STATS, QUICK_STATS, DETAILED_STATS, CHARTS_DATA)
+CART_DEPENDENT_STATS = (DASHBOARD_STATS,)
+
+StatsKey = Tuple[str, Optional[str], Optional[int]]
+
+
+class StatsCache:
+    """Cache in-process cu TTL, single-flight și contoare hit/miss."""
+
+    def __init__(self, ttl_seconds: Optional[float] = None):
+        # None => se citește lazy din DashboardConfig (evită import circular)
+        self._ttl_seconds = ttl_seconds
+        self._entries: Dict[StatsKey, Tuple[float, Any]] = {}
+        self._inflight: Dict[StatsKey, asyncio.Future] = {}
+        # Crește la fiecare invalidare; rezultatele calculate înainte nu se mai salvează
+        self._generation = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+    @property
+    def ttl_seconds(self) -> float:
+        if self._ttl_seconds is None:
+            from server.dashboard.config import default_config
+            self._ttl_seconds = default_config.stats_cache_minutes * 60
+        return self._ttl_seconds
+
+    @staticmethod
+    def make_key(
+            method: str,
+            period: Optional[str] = None,
+            vendor_company_id: Optional[int] = None
+    ) -> StatsKey:
+        return method, period, vendor_company_id
+
+    async def get_or_compute(
+            self,
+            method: str,
+            compute: Callable[[], Awaitable[Any]],
+            period: Optional[str] = None,
+            vendor_company_id: Optional[int] = None
+    ) -> Any:
+        """Returnează valoarea din cache sau o calculează o singură dată."""
+        key = self.make_key(method, period, vendor_company_id)
+
+        if self.ttl_seconds <= 0:
+            self.misses += 1
+            return await compute()
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at > time.monotonic():
+                self.hits += 1
+                return value
+            del self._entries[key]
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            # Alt request calculează deja aceeași cheie
+            self.coalesced += 1
+            try:
+                return await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                if not inflight.cancelled():
+                    raise  # Anulat chiar acest request
+                # Leader-ul a fost anulat (ex. client deconectat) - calculul îl preia acest request,
+                # pe sesiunea lui (compute() folosește sesiunea DB a request-ului care îl apelează)
+                return await self.get_or_compute(method, compute, period, vendor_company_id)
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        generation = self._generation
+
+        try:
+            value = await compute()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Marchează excepția ca preluată dacă nu așteaptă nimeni
+            future.exception()
+            raise
+        else:
+            if generation == self._generation:
+                self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            future.set_result(value)
+            return value
+        finally:
+            self._inflight.pop(key, None)
+
+    def invalidate(
+            self,
+            methods: Iterable[str],
+            vendor_company_id: Optional[int] = None
+    ) -> int:
+        """
+        Evacuează cheile pentru metodele date.
+
+        Cu vendor_company_id=None se evacuează toate scope-urile; altfel doar
+        scope-ul vendor-ului respectiv și cel global (staff).
+        """
+        methods = set(methods)
+        self._generation += 1
+
+        to_delete = [
+            key for key in self._entries
+            if key[0] in methods
+            and (vendor_company_id is None or key[2] in (None, vendor_company_id))
+        ]
+        for key in to_delete:
+            del self._entries[key]
+
+        self.evictions += len(to_delete)
+        if to_delete:
+            logger.debug(f"Stats cache: evicted {len(to_delete)} keys for {sorted(methods)}")
+        return len(to_delete)
+
+    def clear(self) -> None:
+        """Golește complet cache-ul."""
+        self._generation += 1
+        self.evictions += len(self._entries)
+        self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Contoare pentru monitoring."""
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "ttl_seconds": self.ttl_seconds,
+            "entries": len(self._entries),
+            "inflight": len(self._inflight),
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            "hit_rate": round((self.hits + self.coalesced) / lookups * 100, 2) if lookups else 0.0
+        }
+
+
+# Instanță globală per proces
+stats_cache = StatsCache()
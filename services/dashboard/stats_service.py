@@ -4,14 +4,21 @@ Service pentru statistici dashboard.
 """
 from __future__ import annotations
 from datetime import datetime, timedelta
-from typing import List, Dict, Any
-from sqlalchemy import select, func, and_, or_, case, distinct
+from typing import List, Dict, Any, Optional
+from sqlalchemy import select, func, and_, or_, case, distinct, true
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from services.dashboard.sales_rollup_service import SalesRollupService, sales_rollup_scheduler
+from services.dashboard.timeseries_service import (
+    TimeSeriesService, SeriesSpec, BUCKET_HOUR, BUCKET_DAY, BUCKET_MONTH
+)
+from services.dashboard.stats_cache import (
+    stats_cache, DASHBOARD_STATS, QUICK_STATS, DETAILED_STATS, CHARTS_DATA
+)
 from models import (
     Client, UserStatus, Vendor, Staff,
-    Order, OrderStatus, OrderItem,
-    Product, Category, Post,
+    Order, OrderStatus,
+    Product, Post,
     UserRequest, UserActivity, UserInteraction, ActionType,
     Cart, CartItem, Invoice, InvoiceType
 )
@@ -21,9 +28,205 @@ class DashboardStatsService:
     """Service pentru statistici dashboard."""
 
     @staticmethod
-    async def get_dashboard_stats(db: AsyncSession) -> Dict[str, Any]:
-        """Obține statisticile principale pentru dashboard - ACTUALIZAT cu coșuri."""
-        now = datetime.utcnow()
+    async def get_dashboard_stats(
+            db: AsyncSession,
+            aggregated: bool = True,
+            now: Optional[datetime] = None,
+            use_cache: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Obține statisticile principale pentru dashboard - ACTUALIZAT cu coșuri.
+
+        aggregated=True calculează toate KPI-urile într-un singur round-trip
+        (CTE-uri cu agregate condiționale); aggregated=False păstrează varianta
+        veche, cu câte un query per indicator, utilă pentru comparații.
+        Rezultatul e cache-uit doar pentru momentul curent (now=None).
+        """
+        if use_cache and now is None:
+            return await stats_cache.get_or_compute(
+                DASHBOARD_STATS,
+                lambda: DashboardStatsService.get_dashboard_stats(db, aggregated, use_cache=False)
+            )
+
+        if aggregated:
+            return await DashboardStatsService._get_dashboard_stats_aggregated(db, now)
+        return await DashboardStatsService._get_dashboard_stats_per_query(db, now)
+
+    @staticmethod
+    async def _get_dashboard_stats_aggregated(
+            db: AsyncSession,
+            now: Optional[datetime] = None
+    ) -> Dict[str, Any]:
+        """Toate KPI-urile dashboard-ului într-un singur SELECT peste CTE-uri."""
+        now = now or datetime.utcnow()
+        week_ago = now - timedelta(days=7)
+        month_ago = now - timedelta(days=30)
+        day_ago = now - timedelta(hours=24)
+
+        # Clienți - totaluri + distribuție pe status
+        users_cte = select(
+            func.count(Client.id).filter(Client.is_active == True).label('total_users'),
+            func.count(Client.id).filter(
+                and_(
+                    Client.created_at >= week_ago,
+                    Client.is_active == True
+                )
+            ).label('new_users_week'),
+            *[
+                func.count(Client.id).filter(
+                    and_(
+                        Client.is_active == True,
+                        Client.status == user_status
+                    )
+                ).label(f'users_{user_status.value}')
+                for user_status in UserStatus
+            ]
+        ).cte('users_kpi')
+
+        # Comenzi
+        orders_cte = select(
+            func.count(Order.id).label('total_orders'),
+            func.count(Order.id).filter(Order.status == OrderStatus.NEW).label('new_orders'),
+            func.count(Order.id).filter(
+                and_(
+                    Order.status == OrderStatus.COMPLETED,
+                    Order.created_at >= month_ago
+                )
+            ).label('completed_orders_month'),
+            func.sum(Order.total_amount).filter(
+                and_(
+                    Order.status.in_([OrderStatus.PROCESSING, OrderStatus.COMPLETED]),
+                    Order.created_at >= month_ago
+                )
+            ).label('revenue_month'),
+            func.count(Order.id).filter(Order.created_at >= month_ago).label('orders_last_month')
+        ).cte('orders_kpi')
+
+        # Cereri neprocesate
+        requests_cte = select(
+            func.count(UserRequest.id).filter(UserRequest.is_processed == False).label('pending_requests')
+        ).cte('requests_kpi')
+
+        # Produse
+        products_cte = select(
+            func.count(Product.id).filter(
+                and_(
+                    Product.is_active == True,
+                    Product.in_stock == True
+                )
+            ).label('active_products'),
+            func.count(Product.id).filter(
+                or_(
+                    Product.is_active == False,
+                    Product.in_stock == False
+                )
+            ).label('inactive_products')
+        ).cte('products_kpi')
+
+        # Coșuri cu items (nu putem avea coșuri goale)
+        carts_cte = select(
+            func.count(distinct(Cart.id)).label('total_carts'),
+            func.count(distinct(Cart.id)).filter(Cart.updated_at >= day_ago).label('active_carts'),
+            func.count(distinct(Cart.id)).filter(Cart.created_at >= month_ago).label('carts_last_month')
+        ).select_from(Cart).join(CartItem).cte('carts_kpi')
+
+        # Coșuri cu oferte valide
+        quotes_cte = select(
+            func.count(distinct(Invoice.cart_id)).label('carts_with_quotes')
+        ).where(
+            and_(
+                Invoice.invoice_type == InvoiceType.QUOTE,
+                Invoice.valid_until > now,
+                Invoice.cart_id.isnot(None)
+            )
+        ).cte('quotes_kpi')
+
+        # Fiecare CTE întoarce exact un rând => cross join-ul dă un singur rând
+        # (explicit, ON true - altfel SQLAlchemy avertizează de produs cartezian)
+        ctes = [users_cte, orders_cte, requests_cte, products_cte, carts_cte, quotes_cte]
+        joined = ctes[0]
+        for cte in ctes[1:]:
+            joined = joined.join(cte, true())
+        result = await db.execute(select(*ctes).select_from(joined))
+        row = result.one()
+
+        return DashboardStatsService._compose_dashboard_stats(
+            now=now,
+            total_users=row.total_users or 0,
+            new_users_week=row.new_users_week or 0,
+            total_orders=row.total_orders or 0,
+            new_orders=row.new_orders or 0,
+            completed_orders_month=row.completed_orders_month or 0,
+            revenue_month=float(row.revenue_month or 0),
+            pending_requests=row.pending_requests or 0,
+            active_products=row.active_products or 0,
+            inactive_products=row.inactive_products or 0,
+            user_distribution={
+                user_status.value: getattr(row, f'users_{user_status.value}') or 0
+                for user_status in UserStatus
+            },
+            total_carts=row.total_carts or 0,
+            active_carts=row.active_carts or 0,
+            carts_with_quotes=row.carts_with_quotes or 0,
+            carts_last_month=row.carts_last_month or 0,
+            orders_last_month=row.orders_last_month or 0
+        )
+
+    @staticmethod
+    def _compose_dashboard_stats(
+            now: datetime,
+            total_users: int,
+            new_users_week: int,
+            total_orders: int,
+            new_orders: int,
+            completed_orders_month: int,
+            revenue_month: float,
+            pending_requests: int,
+            active_products: int,
+            inactive_products: int,
+            user_distribution: Dict[str, int],
+            total_carts: int,
+            active_carts: int,
+            carts_with_quotes: int,
+            carts_last_month: int,
+            orders_last_month: int
+    ) -> Dict[str, Any]:
+        """Construiește dicționarul de statistici (comun ambelor moduri de calcul)."""
+        # Abandoned carts - calculat ca diferența
+        abandoned_carts = total_carts - active_carts
+
+        # Comenzi create în ultima lună vs coșuri create în ultima lună
+        cart_conversion_rate = 0
+        if total_carts > 0 and carts_last_month > 0:
+            cart_conversion_rate = (orders_last_month / carts_last_month) * 100
+
+        return {
+            "total_users": total_users,
+            "new_users_week": new_users_week,
+            "total_orders": total_orders,
+            "new_orders": new_orders,
+            "completed_orders_month": completed_orders_month,
+            "revenue_month": revenue_month,
+            "pending_requests": pending_requests,
+            "active_products": active_products,
+            "inactive_products": inactive_products,
+            "user_distribution": user_distribution,
+            # Cart stats
+            "total_carts": total_carts,
+            "active_carts": active_carts,
+            "carts_with_quotes": carts_with_quotes,
+            "abandoned_carts": abandoned_carts,
+            "cart_conversion_rate": cart_conversion_rate,
+            "last_updated": now
+        }
+
+    @staticmethod
+    async def _get_dashboard_stats_per_query(
+            db: AsyncSession,
+            now: Optional[datetime] = None
+    ) -> Dict[str, Any]:
+        """Varianta inițială: câte un SELECT per indicator."""
+        now = now or datetime.utcnow()
         week_ago = now - timedelta(days=7)
         month_ago = now - timedelta(days=30)
         day_ago = now - timedelta(hours=24)
@@ -144,13 +347,10 @@ class DashboardStatsService:
         )
         carts_with_quotes = carts_with_quotes_result.scalar() or 0
 
-        # Abandoned carts - calculat ca diferența
-        abandoned_carts = total_carts - active_carts
-
-        # Cart conversion rate
-        cart_conversion_rate = 0
+        # Cart conversion rate - comenzi vs coșuri create în ultima lună
+        carts_last_month = 0
+        orders_last_month = 0
         if total_carts > 0:
-            # Calculăm câte comenzi au fost create în ultima lună vs coșuri create în ultima lună
             carts_last_month_result = await db.execute(
                 select(func.count(distinct(Cart.id)))
                 .select_from(Cart)
@@ -165,9 +365,6 @@ class DashboardStatsService:
             )
             orders_last_month = orders_last_month_result.scalar() or 0
 
-            if carts_last_month > 0:
-                cart_conversion_rate = (orders_last_month / carts_last_month) * 100
-
         # User distribution by status
         user_distribution = await db.execute(
             select(
@@ -182,25 +379,24 @@ class DashboardStatsService:
         for row in user_distribution:
             distribution_dict[row.status.value] = row.count
 
-        return {
-            "total_users": total_users,
-            "new_users_week": new_users_week,
-            "total_orders": total_orders,
-            "new_orders": new_orders,
-            "completed_orders_month": completed_orders_month,
-            "revenue_month": revenue_month,
-            "pending_requests": pending_requests,
-            "active_products": active_products,
-            "inactive_products": inactive_products,
-            "user_distribution": distribution_dict,
-            # Cart stats
-            "total_carts": total_carts,
-            "active_carts": active_carts,
-            "carts_with_quotes": carts_with_quotes,
-            "abandoned_carts": abandoned_carts,
-            "cart_conversion_rate": cart_conversion_rate,
-            "last_updated": now
-        }
+        return DashboardStatsService._compose_dashboard_stats(
+            now=now,
+            total_users=total_users,
+            new_users_week=new_users_week,
+            total_orders=total_orders,
+            new_orders=new_orders,
+            completed_orders_month=completed_orders_month,
+            revenue_month=revenue_month,
+            pending_requests=pending_requests,
+            active_products=active_products,
+            inactive_products=inactive_products,
+            user_distribution=distribution_dict,
+            total_carts=total_carts,
+            active_carts=active_carts,
+            carts_with_quotes=carts_with_quotes,
+            carts_last_month=carts_last_month,
+            orders_last_month=orders_last_month
+        )
 
     @staticmethod
     async def get_recent_activity(
@@ -335,8 +531,14 @@ class DashboardStatsService:
         return result
 
     @staticmethod
-    async def get_quick_stats(db: AsyncSession) -> Dict[str, Any]:
+    async def get_quick_stats(db: AsyncSession, use_cache: bool = True) -> Dict[str, Any]:
         """Statistici rapide pentru API."""
+        if use_cache:
+            return await stats_cache.get_or_compute(
+                QUICK_STATS,
+                lambda: DashboardStatsService.get_quick_stats(db, use_cache=False)
+            )
+
         now = datetime.utcnow()
         today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
 
@@ -379,9 +581,17 @@ class DashboardStatsService:
     @staticmethod
     async def get_detailed_stats(
             db: AsyncSession,
-            period: str = "week"
+            period: str = "week",
+            use_cache: bool = True
     ) -> Dict[str, Any]:
         """Statistici detaliate pentru perioada specificată."""
+        if use_cache:
+            return await stats_cache.get_or_compute(
+                DETAILED_STATS,
+                lambda: DashboardStatsService.get_detailed_stats(db, period, use_cache=False),
+                period=period
+            )
+
         now = datetime.utcnow()
 
         # Calculate date range
@@ -396,82 +606,22 @@ class DashboardStatsService:
         else:
             start_date = now - timedelta(days=7)
 
-        # Orders by status
-        orders_by_status = await db.execute(
-            select(
-                Order.status,
-                func.count(Order.id).label('count'),
-                func.sum(Order.total_amount).label('total')
-            )
-            .where(Order.created_at >= start_date)
-            .group_by(Order.status)
-        )
+        # Rollup-ul e zilnic - fereastra începe la miezul nopții
+        start_date = start_date.replace(hour=0, minute=0, second=0, microsecond=0)
+        start_day = start_date.date()
 
-        status_stats = {}
-        for row in orders_by_status:
-            status_stats[row.status.value] = {
-                "count": row.count,
-                "total": float(row.total or 0)
-            }
+        # Comenzile scrise în procesul curent (cache-ul tocmai a fost evacuat) - altfel
+        # raportul s-ar calcula dintr-un rollup de până la un interval de refresh în urmă
+        await sales_rollup_scheduler.refresh_pending()
 
-        # Top products
-        top_products = await db.execute(
-            select(
-                Product.name,
-                Product.sku,
-                func.sum(OrderItem.quantity).label('quantity'),
-                func.sum(OrderItem.subtotal).label('revenue')
-            )
-            .join(OrderItem)
-            .join(Order)
-            .where(
-                and_(
-                    Order.created_at >= start_date,
-                    Order.status != OrderStatus.CANCELLED
-                )
-            )
-            .group_by(Product.id, Product.name, Product.sku)
-            .order_by(func.sum(OrderItem.subtotal).desc())
-            .limit(10)
-        )
+        # Orders by status
+        status_stats = await SalesRollupService.get_orders_by_status(db, start_day)
 
-        products_list = []
-        for row in top_products:
-            products_list.append({
-                "name": row.name,
-                "sku": row.sku,
-                "quantity": row.quantity,
-                "revenue": float(row.revenue)
-            })
+        # Top products
+        products_list = await SalesRollupService.get_top_products(db, start_day, limit=10)
 
         # Top categories
-        top_categories = await db.execute(
-            select(
-                Category.name,
-                func.count(distinct(Order.id)).label('orders'),
-                func.sum(OrderItem.subtotal).label('revenue')
-            )
-            .join(Product, Category.id == Product.category_id)
-            .join(OrderItem, Product.id == OrderItem.product_id)
-            .join(Order)
-            .where(
-                and_(
-                    Order.created_at >= start_date,
-                    Order.status != OrderStatus.CANCELLED
-                )
-            )
-            .group_by(Category.id, Category.name)
-            .order_by(func.sum(OrderItem.subtotal).desc())
-            .limit(5)
-        )
-
-        categories_list = []
-        for row in top_categories:
-            categories_list.append({
-                "name": row.name,
-                "orders": row.orders,
-                "revenue": float(row.revenue)
-            })
+        categories_list = await SalesRollupService.get_top_categories(db, start_day, limit=5)
 
         return {
             "period": period,
@@ -485,67 +635,69 @@ class DashboardStatsService:
     @staticmethod
     async def get_charts_data(
             db: AsyncSession,
-            period: str = "week"
+            period: str = "week",
+            use_cache: bool = True
     ) -> Dict[str, Any]:
         """Date pentru grafice."""
-        now = datetime.utcnow()
-
-        if period == "today":
-            # Hourly data
-            labels = [f"{i:02d}:00" for i in range(24)]
-            start_date = now.replace(hour=0, minute=0, second=0, microsecond=0)
-
-            # Orders per hour
-            orders_data = await db.execute(
-                select(
-                    func.extract('hour', Order.created_at).label('hour'),
-                    func.count(Order.id).label('count')
-                )
-                .where(Order.created_at >= start_date)
-                .group_by(func.extract('hour', Order.created_at))
-            )
-
-        elif period == "week":
-            # Daily data for last 7 days
-            labels = []
-            for i in range(7, -1, -1):
-                date = now - timedelta(days=i)
-                labels.append(date.strftime("%d %b"))
-
-            start_date = now - timedelta(days=7)
-
-            # Orders per day
-            orders_data = await db.execute(
-                select(
-                    func.date(Order.created_at).label('date'),
-                    func.count(Order.id).label('count')
-                )
-                .where(Order.created_at >= start_date)
-                .group_by(func.date(Order.created_at))
+        if use_cache:
+            return await stats_cache.get_or_compute(
+                CHARTS_DATA,
+                lambda: DashboardStatsService.get_charts_data(db, period, use_cache=False),
+                period=period
             )
 
-        else:
-            # Default to week
-            return await DashboardStatsService.get_charts_data(db, "week")
-
-        # Process orders data
-        orders_dict = {row.hour if period == "today" else row.date: row.count
-                       for row in orders_data}
+        now = datetime.utcnow()
 
-        orders_values = []
         if period == "today":
-            for i in range(24):
-                orders_values.append(orders_dict.get(i, 0))
+            # Hourly data - orele de azi
+            bucket = BUCKET_HOUR
+            buckets = [
+                TimeSeriesService.shift(TimeSeriesService.truncate(now, BUCKET_DAY), BUCKET_HOUR, i)
+                for i in range(24)
+            ]
+            labels = [f"{i:02d}:00" for i in range(24)]
+        elif period == "month":
+            # Daily data for last 30 days
+            bucket = BUCKET_DAY
+            buckets = TimeSeriesService.bucket_starts(now, 31, BUCKET_DAY)
+            labels = [bucket_start.strftime("%d %b") for bucket_start in buckets]
+        elif period == "year":
+            # Monthly data for last 12 months
+            bucket = BUCKET_MONTH
+            buckets = TimeSeriesService.bucket_starts(now, 12, BUCKET_MONTH)
+            labels = [bucket_start.strftime("%b %Y") for bucket_start in buckets]
         else:
-            for i in range(7, -1, -1):
-                date = (now - timedelta(days=i)).date()
-                orders_values.append(orders_dict.get(date, 0))
+            # Daily data for last 7 days (default)
+            bucket = BUCKET_DAY
+            buckets = TimeSeriesService.bucket_starts(now, 8, BUCKET_DAY)
+            labels = [bucket_start.strftime("%d %b") for bucket_start in buckets]
+
+        series = await TimeSeriesService.fetch_many(
+            db,
+            [
+                SeriesSpec(
+                    time_column=Order.created_at,
+                    aggregates={
+                        "orders": func.count(Order.id),
+                        "revenue": func.sum(Order.total_amount).filter(
+                            Order.status != OrderStatus.CANCELLED
+                        )
+                    }
+                ),
+                SeriesSpec(
+                    time_column=Client.created_at,
+                    aggregates={"users": func.count(Client.id)}
+                )
+            ],
+            buckets,
+            bucket
+        )
 
         return {
             "labels": labels,
-            "orders": orders_values,
-            "revenue": [],  # To be implemented
-            "users": []  # To be implemented
+            "orders": series["orders"],
+            "revenue": series["revenue"],
+            "users": series["users"]
         }
 
     @staticmethod
@@ -0,0 +1,148 @@
+# services/dashboard/timeseries_service.py
+"""
+Motor de serii de timp pentru grafice dashboard.
+
+Fiecare metrică (sau grup de metrici peste același tabel) se calculează
+într-un singur query GROUP BY date_trunc(...); golurile (buckets fără
+date) se completează cu 0 în Python. Înlocuiește buclele "un query per zi".
+"""
+from __future__ import annotations
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import List, Dict, Any, Optional
+
+from sqlalchemy import select, func, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+BUCKET_HOUR = "hour"
+BUCKET_DAY = "day"
+BUCKET_MONTH = "month"
+
+
+@dataclass
+class SeriesSpec:
+    """
+    Una sau mai multe serii calculate din același tabel.
+
+    time_column: coloana după care se grupează (ex. Order.created_at)
+    aggregates: nume serie -> expresie agregată (ex. {"orders": func.count(Order.id)})
+    conditions: filtre suplimentare (ex. Order.status != OrderStatus.CANCELLED)
+    """
+    time_column: Any
+    aggregates: Dict[str, Any]
+    conditions: List[Any] = field(default_factory=list)
+
+
+class TimeSeriesService:
+    """Serii de timp bucketed, zero-filled."""
+
+    @staticmethod
+    def truncate(moment: datetime, bucket: str) -> datetime:
+        """Începutul bucket-ului care conține momentul dat."""
+        if bucket == BUCKET_HOUR:
+            return moment.replace(minute=0, second=0, microsecond=0)
+        if bucket == BUCKET_DAY:
+            return moment.replace(hour=0, minute=0, second=0, microsecond=0)
+        if bucket == BUCKET_MONTH:
+            return moment.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        raise ValueError(f"Unknown bucket: {bucket}")
+
+    @staticmethod
+    def shift(moment: datetime, bucket: str, steps: int) -> datetime:
+        """Mută un început de bucket cu `steps` bucket-uri (poate fi negativ)."""
+        if bucket == BUCKET_HOUR:
+            return moment + timedelta(hours=steps)
+        if bucket == BUCKET_DAY:
+            return moment + timedelta(days=steps)
+        if bucket == BUCKET_MONTH:
+            month_index = moment.year * 12 + (moment.month - 1) + steps
+            return moment.replace(year=month_index // 12, month=month_index % 12 + 1)
+        raise ValueError(f"Unknown bucket: {bucket}")
+
+    @staticmethod
+    def bucket_starts(end: datetime, count: int, bucket: str) -> List[datetime]:
+        """Ultimele `count` bucket-uri, cel curent inclus, în ordine cronologică."""
+        last = TimeSeriesService.truncate(end, bucket)
+        return [TimeSeriesService.shift(last, bucket, -i) for i in range(count - 1, -1, -1)]
+
+    @staticmethod
+    def _normalize(value: Any) -> Optional[datetime]:
+        """Cheie comparabilă: datetime naive în UTC."""
+        if value is None:
+            return None
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value
+
+    @staticmethod
+    async def fetch(
+            db: AsyncSession,
+            spec: SeriesSpec,
+            buckets: List[datetime],
+            bucket: str
+    ) -> Dict[str, List[float]]:
+        """Un singur query pentru toate seriile din spec, completat cu 0."""
+        if not buckets:
+            return {name: [] for name in spec.aggregates}
+
+        start = buckets[0]
+        end = TimeSeriesService.shift(buckets[-1], bucket, 1)
+        # Coloanele timestamptz se trunchiază în UTC, indiferent de TimeZone-ul sesiunii
+        time_column = spec.time_column
+        if getattr(time_column.type, 'timezone', False):
+            time_column = func.timezone('UTC', time_column)
+        bucket_col = func.date_trunc(bucket, time_column).label('bucket')
+
+        stmt = (
+            select(
+                bucket_col,
+                *[expr.label(name) for name, expr in spec.aggregates.items()]
+            )
+            .where(
+                and_(
+                    spec.time_column >= start,
+                    spec.time_column < end,
+                    *spec.conditions
+                )
+            )
+            .group_by(bucket_col)
+        )
+
+        result = await db.execute(stmt)
+
+        values: Dict[datetime, Any] = {}
+        for row in result:
+            values[TimeSeriesService._normalize(row.bucket)] = row
+
+        series = {}
+        for name in spec.aggregates:
+            points = []
+            for bucket_start in buckets:
+                row = values.get(bucket_start)
+                value = getattr(row, name) if row is not None else None
+                points.append(TimeSeriesService._to_number(value))
+            series[name] = points
+        return series
+
+    @staticmethod
+    async def fetch_many(
+            db: AsyncSession,
+            specs: List[SeriesSpec],
+            buckets: List[datetime],
+            bucket: str
+    ) -> Dict[str, List[float]]:
+        """Execută fiecare spec (un query per tabel) și combină seriile."""
+        combined: Dict[str, List[float]] = {}
+        for spec in specs:
+            combined.update(await TimeSeriesService.fetch(db, spec, buckets, bucket))
+        return combined
+
+    @staticmethod
+    def _to_number(value: Any):
+        """int rămâne int (count), Decimal/Numeric devine float (sume)."""
+        if value is None:
+            return 0
+        if isinstance(value, int):
+            return value
+        return float(value)
@@ -7,6 +7,7 @@ from typing import Optional, List, Dict
 from sqlalchemy import select, func, and_, or_
 
 from models import UserActivity, UserRequest, UserInteraction, ActionType, TargetType, UserTargetStats
+from services.models.interaction_buffer import InteractionEvent, interaction_buffer
 
 
 class ActivityService:
@@ -57,7 +58,32 @@ class ActivityService:
             activity_id: Optional[int] = None,
             metadata: Optional[Dict] = None
     ) -> UserInteraction:
-        """Înregistrează interacțiune și actualizează statistici."""
+        """
+        Înregistrează interacțiune și actualizează statistici.
+
+        Cu write-behind pornit (lifespan) evenimentul intră în interaction_buffer
+        și se scrie în lot; interacțiunea returnată nu are încă id.
+        """
+        if interaction_buffer.is_running:
+            event = InteractionEvent(
+                client_id=client_id,
+                action_type=action_type,
+                target_type=target_type,
+                target_id=target_id,
+                activity_id=activity_id,
+                metadata=metadata
+            )
+            interaction_buffer.add(event)
+            return UserInteraction(
+                client_id=client_id,
+                action_type=action_type,
+                target_type=target_type,
+                target_id=target_id,
+                activity_id=activity_id,
+                extra_data=metadata,
+                created_at=event.created_at
+            )
+
         # 1. Salvează interacțiunea detaliată (istoric complet)
         interaction = UserInteraction(
             client_id=client_id,
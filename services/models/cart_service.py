@@ -12,6 +12,7 @@ from models.sale import Cart, CartItem, Invoice
 from models.user import Client
 from models.enum import UserStatus, InvoiceType
 from services.models.product_service import ProductService
+from services.dashboard.stats_cache import stats_cache, CART_DEPENDENT_STATS
 
 
 class CartService:
@@ -88,6 +89,8 @@ class CartService:
 
         await db.commit()
         await db.refresh(existing_item)
+
+        stats_cache.invalidate(CART_DEPENDENT_STATS)
         return existing_item
 
     @staticmethod
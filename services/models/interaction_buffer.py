@@ -0,0 +1,280 @@
+# services/models/interaction_buffer.py
+"""
+Write-behind pentru ActivityService.track_interaction.
+
+Evenimentele (view, add to cart, ...) intră într-un buffer în memorie, limitat.
+Un task de fundal le scrie în lot, la fiecare flush_interval_ms sau când se
+adună flush_batch_size evenimente:
+- user_interactions: un singur INSERT cu toate rândurile
+- user_target_stats: deltele agregate per (client, target_type, target_id),
+  aplicate cu INSERT ... ON CONFLICT DO UPDATE (fără SELECT înainte)
+- user_activities: contoarele per sesiune, un UPDATE executemany
+- un singur commit per lot
+
+Pornit din lifespan; fără start() (scripturi, bot) track_interaction
+scrie sincron, ca înainte.
+"""
+from __future__ import annotations
+import asyncio
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Deque, Dict, List, Optional, Tuple
+
+from sqlalchemy import bindparam, func, insert, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from cfg import async_session_maker
+from models import ActionType, TargetType, UserActivity, UserInteraction, UserTargetStats
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class InteractionEvent:
+    client_id: int
+    action_type: ActionType
+    target_type: TargetType
+    target_id: int
+    activity_id: Optional[int] = None
+    metadata: Optional[Dict] = None
+    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    attempts: int = 0
+
+
+@dataclass
+class _StatsDelta:
+    views: int = 0
+    interactions: int = 0
+    add_to_cart: int = 0
+    request_quote: int = 0
+
+
+class InteractionBuffer:
+    """Buffer limitat + flusher periodic."""
+
+    MAX_ATTEMPTS = 2
+
+    def __init__(
+            self,
+            max_events: Optional[int] = None,
+            flush_interval_ms: Optional[int] = None,
+            flush_batch_size: Optional[int] = None
+    ):
+        # None => valoarea din DashboardConfig, citită la start() - la import ar crea
+        # un import circular (services.models -> server.dashboard -> routers -> services.models)
+        self._settings = (max_events, flush_interval_ms, flush_batch_size)
+        self.max_events = max_events or 20000
+        self.flush_interval = (flush_interval_ms or 500) / 1000
+        self.flush_batch_size = flush_batch_size or 500
+
+        self._events: Deque[InteractionEvent] = deque()
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+        self._flush_lock = asyncio.Lock()
+
+        # Metrici
+        self.accepted = 0
+        self.dropped = 0
+        self.written = 0
+        self.failed_batches = 0
+        self.last_flush_ms: Optional[float] = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._load_config()
+            self._stopping = False
+            self._task = asyncio.create_task(self._loop(), name="interaction-flusher")
+            logger.info(
+                f"Interaction write-behind started: every {self.flush_interval * 1000:.0f} ms "
+                f"or {self.flush_batch_size} events"
+            )
+
+    async def shutdown(self) -> None:
+        """Oprește flusher-ul și scrie ce a rămas în buffer."""
+        task, self._task = self._task, None
+        if task is not None:
+            # Fără cancel(): lotul în curs de scriere s-ar pierde; bucla termină flush-ul și iese
+            self._stopping = True
+            self._wakeup.set()
+            await asyncio.gather(task, return_exceptions=True)
+        await self.flush()
+
+    def add(self, event: InteractionEvent) -> bool:
+        """Adaugă evenimentul; False dacă bufferul e plin (evenimentul se pierde)."""
+        if len(self._events) >= self.max_events:
+            self.dropped += 1
+            if self.dropped % 1000 == 1:
+                logger.warning(f"Interaction buffer full ({self.max_events}), {self.dropped} events dropped")
+            return False
+
+        self._events.append(event)
+        self.accepted += 1
+        if len(self._events) >= self.flush_batch_size:
+            self._wakeup.set()
+        return True
+
+    async def flush(self) -> None:
+        """Scrie tot bufferul, în loturi de flush_batch_size."""
+        async with self._flush_lock:
+            while self._events:
+                batch = [
+                    self._events.popleft()
+                    for _ in range(min(self.flush_batch_size, len(self._events)))
+                ]
+                started = time.perf_counter()
+                try:
+                    await self._write(batch)
+                except asyncio.CancelledError:
+                    # Lotul a fost scos din buffer - se pune înapoi, nu se pierde
+                    self._events.extendleft(reversed(batch))
+                    raise
+                except Exception as e:
+                    self.failed_batches += 1
+                    logger.error(f"Interaction batch of {len(batch)} failed: {type(e).__name__}: {e}")
+                    # O singură reîncercare, la următorul ciclu (un lot invalid nu blochează bufferul)
+                    retry = [event for event in batch if event.attempts < self.MAX_ATTEMPTS - 1]
+                    retry = retry[:max(self.max_events - len(self._events), 0)]
+                    for event in retry:
+                        event.attempts += 1
+                    self._events.extendleft(reversed(retry))
+                    self.dropped += len(batch) - len(retry)
+                    return
+
+                self.written += len(batch)
+                self.last_flush_ms = (time.perf_counter() - started) * 1000
+
+    def metrics(self) -> Dict:
+        return {
+            "running": self.is_running,
+            "buffered": len(self._events),
+            "accepted": self.accepted,
+            "written": self.written,
+            "dropped": self.dropped,
+            "failed_batches": self.failed_batches,
+            "last_flush_ms": round(self.last_flush_ms, 1) if self.last_flush_ms is not None else None
+        }
+
+    def _load_config(self) -> None:
+        max_events, flush_interval_ms, flush_batch_size = self._settings
+        if None not in self._settings:
+            return
+
+        from server.dashboard.config import default_config
+        self.max_events = max_events or default_config.activity_buffer_max_events
+        self.flush_interval = (flush_interval_ms or default_config.activity_flush_interval_ms) / 1000
+        self.flush_batch_size = flush_batch_size or default_config.activity_flush_batch_size
+
+    async def _loop(self) -> None:
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    @staticmethod
+    def _aggregate(batch: List[InteractionEvent]) -> Tuple[Dict[Tuple, _StatsDelta], Dict[int, _StatsDelta]]:
+        targets: Dict[Tuple, _StatsDelta] = {}
+        activities: Dict[int, _StatsDelta] = {}
+
+        for event in batch:
+            key = (event.client_id, event.target_type, event.target_id)
+            deltas = [targets.setdefault(key, _StatsDelta())]
+            if event.activity_id:
+                deltas.append(activities.setdefault(event.activity_id, _StatsDelta()))
+
+            for delta in deltas:
+                delta.interactions += 1
+                if event.action_type == ActionType.VIEW:
+                    delta.views += 1
+                elif event.action_type == ActionType.ADD_TO_CART:
+                    delta.add_to_cart += 1
+                elif event.action_type == ActionType.REQUEST_QUOTE:
+                    delta.request_quote += 1
+
+        return targets, activities
+
+    async def _write(self, batch: List[InteractionEvent]) -> None:
+        targets, activities = self._aggregate(batch)
+
+        async with async_session_maker() as db:
+            # 1. Istoricul detaliat - un singur INSERT
+            await db.execute(
+                insert(UserInteraction),
+                [
+                    {
+                        "client_id": event.client_id,
+                        "action_type": event.action_type,
+                        "target_type": event.target_type,
+                        "target_id": event.target_id,
+                        "activity_id": event.activity_id,
+                        "extra_data": event.metadata,
+                        "created_at": event.created_at
+                    }
+                    for event in batch
+                ]
+            )
+
+            # 2. Statistici agregate - upsert; cheile sortate (ordine stabilă a lock-urilor între worker-i)
+            rows = [
+                {
+                    "client_id": client_id,
+                    "target_type": target_type,
+                    "target_id": target_id,
+                    "total_views": delta.views,
+                    "total_interactions": delta.interactions,
+                    "add_to_cart_count": delta.add_to_cart,
+                    "request_quote_count": delta.request_quote
+                }
+                for (client_id, target_type, target_id), delta in sorted(
+                    targets.items(), key=lambda item: (item[0][0], item[0][1].value, item[0][2])
+                )
+            ]
+            stmt = pg_insert(UserTargetStats).values(rows)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[UserTargetStats.client_id, UserTargetStats.target_type, UserTargetStats.target_id],
+                set_={
+                    "total_views": UserTargetStats.total_views + stmt.excluded.total_views,
+                    "total_interactions": UserTargetStats.total_interactions + stmt.excluded.total_interactions,
+                    "add_to_cart_count": UserTargetStats.add_to_cart_count + stmt.excluded.add_to_cart_count,
+                    "request_quote_count": UserTargetStats.request_quote_count + stmt.excluded.request_quote_count,
+                    "last_interaction_at": func.now(),
+                    "updated_at": func.now()
+                }
+            )
+            await db.execute(stmt)
+
+            # 3. Contoare per sesiune
+            if activities:
+                activity_table = UserActivity.__table__
+                await db.execute(
+                    update(activity_table)
+                    .where(activity_table.c.id == bindparam("activity_pk"))
+                    .values(
+                        interactions=activity_table.c.interactions + bindparam("interactions_delta"),
+                        page_views=activity_table.c.page_views + bindparam("views_delta")
+                    ),
+                    [
+                        {
+                            "activity_pk": activity_id,
+                            "interactions_delta": delta.interactions,
+                            "views_delta": delta.views
+                        }
+                        for activity_id, delta in sorted(activities.items())
+                    ]
+                )
+
+            await db.commit()
+
+
+# Instanță globală; setările din DashboardConfig se citesc la start()
+interaction_buffer = InteractionBuffer()
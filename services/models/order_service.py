@@ -19,6 +19,8 @@ from models.enum import OrderStatus, NotificationType, InvoiceType
 from services.models.cart_service import CartService
 from services.models.notification_service import NotificationService
 from services.models.product_service import ProductService
+from services.dashboard.stats_cache import stats_cache, ORDER_DEPENDENT_STATS, CART_DEPENDENT_STATS
+from services.dashboard.sales_rollup_service import SalesRollupService
 
 # Configurare logging
 logger = logging.getLogger(__name__)
@@ -161,6 +163,10 @@ class OrderService:
         await db.commit()
         await db.refresh(order)
 
+        # Comanda nouă + coșul șters schimbă statisticile
+        stats_cache.invalidate(ORDER_DEPENDENT_STATS + CART_DEPENDENT_STATS)
+        SalesRollupService.mark_orders_dirty([order.id])
+
         logger.info(f"✅ Order {order.order_number} created successfully")
 
         # Trimite notificări cu numărul de items cunoscut
@@ -198,20 +204,26 @@ class OrderService:
         total_amount = 0
         order_items = []
 
+        # Produsele și prețurile pentru toate liniile - câte un singur query
+        product_ids = [item_data["product_id"] for item_data in items]
+        products_result = await db.execute(
+            select(Product).where(Product.id.in_(product_ids))
+        )
+        products = {product.id: product for product in products_result.scalars().all()}
+        prices = await ProductService.get_prices_for_user_status(
+            db, product_ids, client.status
+        )
+
         for item_data in items:
             product_id = item_data["product_id"]
             quantity = item_data["quantity"]
 
-            # Obține produsul
-            product_result = await db.execute(
-                select(Product).where(Product.id == product_id)
-            )
-            product = product_result.scalar_one()
+            product = products.get(product_id)
+            if product is None:
+                raise ValueError(f"Product {product_id} not found")
 
-            # Obține prețul pentru statusul clientului
-            price = await ProductService.get_price_for_user_status(
-                db, product_id, client.status
-            )
+            # Prețul pentru statusul clientului
+            price = prices[product_id]
 
             if price is None:
                 raise ValueError(f"No price found for product {product.sku}")
@@ -262,6 +274,9 @@ class OrderService:
         await db.commit()
         await db.refresh(order)
 
+        stats_cache.invalidate(ORDER_DEPENDENT_STATS)
+        SalesRollupService.mark_orders_dirty([order.id])
+
         logger.info(f"✅ Manual order {order.order_number} created successfully")
 
         # Trimite notificări (folosind un obiect mock pentru cart)
@@ -443,6 +458,9 @@ class OrderService:
         await db.commit()
         await db.refresh(order)
 
+        stats_cache.invalidate(ORDER_DEPENDENT_STATS)
+        SalesRollupService.mark_orders_dirty([order.id])
+
         logger.info(
             f"📝 Order {order.order_number} status changed: "
             f"{old_status.value} → {new_status.value}"
@@ -579,6 +597,9 @@ class OrderService:
 
         await db.commit()
 
+        stats_cache.invalidate(ORDER_DEPENDENT_STATS)
+        SalesRollupService.mark_orders_dirty([order.id])
+
         # Notificări
         try:
             await NotificationService.create_notification(
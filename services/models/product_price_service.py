@@ -9,6 +9,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 
 from models import PriceType, ProductPrice
+from services.dashboard.price_cache import price_cache
 
 
 class ProductPriceService:
@@ -43,6 +44,7 @@ class ProductPriceService:
             db.add(price)
 
         await db.commit()
+        price_cache.invalidate([product_id])
         await db.refresh(price)
         return price
 
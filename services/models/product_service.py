@@ -1,6 +1,7 @@
 # services/models/product_services.py
 
 from __future__ import annotations
+from decimal import Decimal
 from typing import Optional, List, Dict
 from sqlalchemy import select, and_, update
 from sqlalchemy.orm import selectinload
@@ -9,6 +10,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from models import Product, ProductImage, UserStatus, PriceType, ProductPrice
 from services.models.product_price_service import ProductPriceService
+from services.dashboard.search_service import SearchService, PRODUCT_SEARCH
+from services.dashboard.price_cache import price_cache
 
 
 class ProductService:
@@ -66,31 +69,18 @@ class ProductService:
             db: AsyncSession,
             product_id: int,
             user_status: UserStatus
-    ) -> Optional[float]:
+    ) -> Optional[Decimal]:
         """Returnează prețul pentru un status de utilizator - doar din prețuri active."""
-        # Mapare status -> price type
-        status_to_price = {
-            UserStatus.ANONIM: PriceType.ANONIM,
-            UserStatus.USER: PriceType.USER,
-            UserStatus.INSTALATOR: PriceType.INSTALATOR,
-            UserStatus.PRO: PriceType.PRO
-        }
-
-        price_type = status_to_price.get(user_status)
-        if not price_type:
-            return None
+        return await price_cache.get_price(db, product_id, user_status)
 
-        result = await db.execute(
-            select(ProductPrice.amount)
-            .where(
-                and_(
-                    ProductPrice.product_id == product_id,
-                    ProductPrice.price_type == price_type,
-                    ProductPrice.is_active == True  # DOAR PREȚURI ACTIVE
-                )
-            )
-        )
-        return result.scalar_one_or_none()
+    @staticmethod
+    async def get_prices_for_user_status(
+            db: AsyncSession,
+            product_ids: List[int],
+            user_status: UserStatus
+    ) -> Dict[int, Optional[Decimal]]:
+        """Prețurile mai multor produse pentru un status - cel mult un query (cache)."""
+        return await price_cache.get_prices(db, product_ids, user_status)
 
     @staticmethod
     async def get_all_prices_for_status(
@@ -99,33 +89,7 @@ class ProductService:
             user_status: UserStatus
     ) -> Dict[str, float]:
         """Returnează toate prețurile vizibile pentru un status - doar active."""
-        # Determinăm ce prețuri poate vedea
-        visible_prices = []
-        if user_status == UserStatus.ANONIM:
-            visible_prices = [PriceType.ANONIM]
-        elif user_status == UserStatus.USER:
-            visible_prices = [PriceType.ANONIM, PriceType.USER]
-        elif user_status == UserStatus.INSTALATOR:
-            visible_prices = [PriceType.ANONIM, PriceType.USER, PriceType.INSTALATOR]
-        elif user_status == UserStatus.PRO:
-            visible_prices = list(PriceType)  # toate
-
-        result = await db.execute(
-            select(ProductPrice)
-            .where(
-                and_(
-                    ProductPrice.product_id == product_id,
-                    ProductPrice.price_type.in_(visible_prices),
-                    ProductPrice.is_active == True  # DOAR PREȚURI ACTIVE
-                )
-            )
-        )
-        prices = result.scalars().all()
-
-        return {
-            price.price_type.value: float(price.amount)
-            for price in prices
-        }
+        return await price_cache.get_visible_prices(db, product_id, user_status)
 
     @staticmethod
     async def search(
@@ -139,10 +103,10 @@ class ProductService:
         stmt = select(Product).where(
             and_(
                 Product.is_active == True,
-                Product.in_stock == True,
-                Product.name.ilike(f"%{query}%") | Product.sku.ilike(f"%{query}%")
+                Product.in_stock == True
             )
         )
+        stmt = SearchService.apply(stmt, PRODUCT_SEARCH, query)
 
         if vendor_company_id:
             stmt = stmt.where(Product.vendor_company_id == vendor_company_id)
@@ -243,6 +207,7 @@ class ProductService:
             db.add(price)
 
         await db.commit()
+        price_cache.invalidate([product_id])
         await db.refresh(price)
         return price
 
@@ -296,6 +261,7 @@ class ProductService:
             prices_count = prices_result.rowcount
 
         await db.commit()
+        price_cache.invalidate(product_ids)
 
         print(f"✅ REACTIVARE: {products_count} produse, {prices_count} prețuri")
         print(f"🔍 AUDIT: Staff {staff_id} a reactivat produsele companiei {company_id}")
@@ -0,0 +1,103 @@
+# tests/test_pdf_render_pool.py
+"""
+PDFRenderPool pornit dintr-un interpretor nou, cu aplicația importată ca la
+`uvicorn server_start:app`: randarea trece prin worker-ii spawn, iar aceștia
+nu încarcă aplicația (services / server / models / cfg).
+
+Scriptul rulează ca fișier (are __main__ cu __file__), deci prinde și
+re-rularea scriptului principal în worker-i.
+
+Rulează din rădăcina proiectului, cu fișierele .env_* ale aplicației:
+
+    python -m pytest -q tests/test_pdf_render_pool.py
+"""
+from __future__ import annotations
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+
+if not all((ROOT / name).exists() for name in (".env_bot", ".env_srv", ".env_db")):
+    pytest.skip("configurația aplicației (.env_bot / .env_srv / .env_db) lipsește", allow_module_level=True)
+
+SCRIPT = """
+import asyncio
+import json
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import server_start  # noqa: F401 - aplicația, ca în procesul uvicorn
+from services.dashboard.pdf_render_pool import PDFRenderPool
+from utils.pdf_renderer import InvoiceRenderData
+
+APP_PACKAGES = ("services", "server", "models", "cfg", "server_start")
+# (modulele aplicației încărcate, fișierul rulat ca __main__) - în worker
+PROBE = (
+    f"(sorted(m for m in __import__('sys').modules if m.split('.')[0] in {APP_PACKAGES!r}), "
+    f"getattr(__import__('sys').modules['__main__'], '__file__', None))"
+)
+
+
+async def main(output_dir: Path) -> dict:
+    now = datetime.now()
+    data = InvoiceRenderData(
+        invoice_number="POOL-TEST-1",
+        is_quote=True,
+        created_at=now,
+        client_name="Client Test Ștefănescu",
+        client_email="client@example.com",
+        client_phone="+373 69 000 000",
+        valid_until=now + timedelta(days=14),
+        notes=None,
+        total=2500.0,
+        output_path=str(output_dir / "pool_test.pdf"),
+        items=[{"name": "Produs", "sku": "SKU-1", "quantity": 2, "unit_price": 1250.0, "subtotal": 2500.0}]
+    )
+
+    pool = PDFRenderPool(workers=1, max_concurrent=1, timeout_seconds=60)
+    pool.start()
+    try:
+        path = await pool.render(data)
+        loop = asyncio.get_running_loop()
+        worker_modules, worker_main = await loop.run_in_executor(pool._executor, eval, PROBE)
+    finally:
+        await pool.shutdown()
+
+    return {
+        "path": path,
+        "header": Path(path).read_bytes()[:5].decode(),
+        "worker_modules": worker_modules,
+        "worker_main": worker_main,
+        "metrics": pool.metrics()
+    }
+
+
+if __name__ == "__main__":
+    print(json.dumps(asyncio.run(main(Path(sys.argv[1])))))
+"""
+
+
+def test_render_in_spawned_workers(tmp_path):
+    script = tmp_path / "render_through_pool.py"
+    script.write_text(SCRIPT, encoding="utf-8")
+
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [str(ROOT), os.getenv("PYTHONPATH")])))
+    completed = subprocess.run(
+        [sys.executable, str(script), str(tmp_path)],
+        cwd=ROOT, env=env, capture_output=True, text=True, timeout=180
+    )
+    assert completed.returncode == 0, completed.stderr
+
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    assert result["header"] == "%PDF-"
+    assert result["worker_modules"] == []
+    assert result["worker_main"] is None
+    assert result["metrics"]["completed"] == 1
+    assert result["metrics"]["failed"] == 0
+    assert result["metrics"]["restarts"] == 0
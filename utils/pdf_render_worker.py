@@ -0,0 +1,26 @@
+# utils/pdf_render_worker.py
+"""
+Funcțiile rulate în worker-ii PDFRenderPool.
+
+Worker-ii sunt porniți cu spawn și importă doar modulele funcțiilor primite
+(pickle după nume): acest modul și utils.pdf_renderer, adică reportlab.
+Nu importa nimic din services / server aici - oricare dintre ele încarcă
+toată aplicația în fiecare worker (și, la pornire, dă import circular).
+"""
+from __future__ import annotations
+
+from utils.pdf_renderer import InvoiceRenderData, init_pdf_resources, render_invoice
+
+
+def init_worker() -> None:
+    """Rulează o dată în fiecare worker: fonturi + stiluri (registry per proces)."""
+    init_pdf_resources()
+
+
+def warmup() -> bool:
+    return True
+
+
+def render(data: InvoiceRenderData) -> str:
+    """Randarea propriu-zisă, în worker."""
+    return render_invoice(data)
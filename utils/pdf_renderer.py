@@ -0,0 +1,442 @@
+# utils/pdf_renderer.py
+"""
+Randarea PDF-ului pentru oferte / facturi (ReportLab), fără acces la DB.
+
+Modulul nu importă modele sau sesiuni: primește un InvoiceRenderData
+(date simple, serializabile cu pickle) și poate rula atât în procesul
+serverului cât și în worker-ii din PDFRenderPool. Stă în afara pachetelor
+services / server: importul lor încarcă toată aplicația (modele, engine DB),
+iar worker-ii nu trebuie să o încarce.
+
+Fonturile și stilurile se pregătesc o singură dată per proces
+(init_pdf_resources - din lifespan și din initializer-ul worker-ilor);
+randările folosesc doar get_styles() / get_fonts().
+"""
+from __future__ import annotations
+import hashlib
+import json
+import threading
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import inch, cm
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+from reportlab.lib.enums import TA_CENTER, TA_RIGHT, TA_LEFT
+
+
+FONT_DIR = Path("server/dashboard/static/fonts")
+
+# Se incrementează la orice schimbare de layout / stiluri - invalidează toate PDF-urile din cache
+TEMPLATE_VERSION = 1
+
+# Registry per proces (fonturi înregistrate + stylesheet)
+_resources_lock = threading.Lock()
+_styles = None
+_fonts: Tuple[str, str] = ('Roboto', 'Roboto-Bold')
+
+
+@dataclass
+class InvoiceRenderData:
+    """
+    Tot ce trebuie pentru randare - fără obiecte ORM.
+
+    items: [{'name', 'sku', 'quantity', 'unit_price', 'subtotal'}]
+    output_path: fișierul PDF care se scrie
+    """
+    invoice_number: str
+    is_quote: bool
+    created_at: datetime
+    client_name: str
+    client_email: Optional[str]
+    client_phone: Optional[str]
+    valid_until: Optional[datetime]
+    notes: Optional[str]
+    total: float
+    output_path: str
+    items: List[Dict[str, Any]] = field(default_factory=list)
+
+    @property
+    def subtotal(self) -> float:
+        return sum(item['subtotal'] for item in self.items)
+
+    def content_hash(self) -> str:
+        """
+        Hash-ul datelor randate + versiunea template-ului.
+        Aceleași date -> același hash -> PDF-ul existent se refolosește.
+        """
+        payload = asdict(self)
+        payload.pop('output_path')
+        payload['template_version'] = TEMPLATE_VERSION
+        raw = json.dumps(payload, sort_keys=True, default=str, ensure_ascii=False)
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def add_page_numbers(canvas, doc):
+    """Funcție callback pentru adăugarea numerelor de pagină."""
+    canvas.saveState()
+
+    # Setează font și culoare
+    canvas.setFont("Helvetica", 10)
+    canvas.setFillColor(colors.grey)
+
+    # Desenează numărul paginii
+    page_num = canvas.getPageNumber()
+    text = f"Pagina {page_num}"
+
+    # Poziționează în colțul din dreapta jos
+    canvas.drawRightString(
+        A4[0] - 1.5 * cm,  # X - la 1.5cm de marginea dreaptă
+        1.5 * cm,  # Y - la 1.5cm de marginea de jos
+        text
+    )
+
+    canvas.restoreState()
+
+
+def register_fonts():
+    """Înregistrează fonturi Roboto pentru suport UTF-8 complet."""
+    try:
+        from reportlab.pdfbase.ttfonts import TTFont
+        from reportlab.pdfbase import pdfmetrics
+
+        # Descarcă fonturile de la: https://fonts.google.com/specimen/Roboto
+        # și pune-le în directorul specificat
+        FONT_DIR.mkdir(parents=True, exist_ok=True)
+
+        fonts_to_register = {
+            'Roboto': 'Roboto-Regular.ttf',
+            'Roboto-Bold': 'Roboto-Bold.ttf',
+            'Roboto-Italic': 'Roboto-Italic.ttf',
+            'Roboto-BoldItalic': 'Roboto-BoldItalic.ttf',
+        }
+
+        registered = False
+        for font_name, font_file in fonts_to_register.items():
+            font_path = FONT_DIR / font_file
+            if font_path.exists():
+                try:
+                    pdfmetrics.registerFont(TTFont(font_name, str(font_path)))
+                    print(f"[PDFService] Registered font: {font_name}")
+                    registered = True
+                except Exception as e:
+                    print(f"[PDFService] Failed to register {font_name}: {e}")
+            else:
+                print(f"[PDFService] Font file not found: {font_path}")
+
+        if not registered:
+            # Fallback la Arial Unicode (dacă există în sistem)
+            try:
+                # Pe Windows
+                pdfmetrics.registerFont(TTFont('Arial', 'C:/Windows/Fonts/arial.ttf'))
+                pdfmetrics.registerFont(TTFont('Arial-Bold', 'C:/Windows/Fonts/arialbd.ttf'))
+                print("[PDFService] Fallback to Arial fonts")
+            except:
+                print("[PDFService] WARNING: No UTF-8 fonts available!")
+
+    except Exception as e:
+        print(f"[PDFService] Font registration error: {e}")
+
+
+def create_styles():
+    """Creează stiluri pentru document cu font Roboto."""
+    styles = getSampleStyleSheet()
+
+    # Font implicit pentru document
+    default_font = 'Roboto'
+    bold_font = 'Roboto-Bold'
+
+    # Verifică dacă fonturile sunt înregistrate
+    from reportlab.pdfbase import pdfmetrics
+    if default_font not in pdfmetrics.getRegisteredFontNames():
+        default_font = 'Arial'  # Fallback la Arial care suportă diacritice
+        bold_font = 'Arial-Bold'
+        print(f"[PDFService] Using fallback fonts: {default_font}")
+
+    # Actualizează stilul Normal pentru tot documentul
+    styles['Normal'].fontName = default_font
+    styles['Normal'].fontSize = 11
+    styles['Normal'].leading = 14  # Spațiere între linii
+
+    # Stil pentru titlu companie
+    styles.add(ParagraphStyle(
+        name='CompanyTitle',
+        parent=styles['Heading1'],
+        fontName=bold_font,
+        fontSize=24,
+        leading=30,
+        textColor=colors.HexColor('#2c3e50'),
+        spaceAfter=12,
+        alignment=TA_LEFT
+    ))
+
+    # Stil pentru subtitlu
+    styles.add(ParagraphStyle(
+        name='DocumentType',
+        parent=styles['Heading2'],
+        fontName=bold_font,
+        fontSize=20,
+        leading=24,
+        textColor=colors.HexColor('#e74c3c'),
+        alignment=TA_RIGHT
+    ))
+
+    # Stil pentru număr document
+    styles.add(ParagraphStyle(
+        name='DocumentNumber',
+        parent=styles['Normal'],
+        fontName=bold_font,
+        fontSize=14,
+        leading=18,
+        alignment=TA_RIGHT
+    ))
+
+    # Stil pentru secțiuni
+    styles.add(ParagraphStyle(
+        name='SectionTitle',
+        parent=styles['Heading3'],
+        fontName=bold_font,
+        fontSize=14,
+        leading=20,
+        textColor=colors.HexColor('#2c3e50'),
+        spaceBefore=20,
+        spaceAfter=12
+    ))
+
+    # Stil pentru valabilitatea ofertei
+    styles.add(ParagraphStyle(
+        name='Validity',
+        parent=styles['Normal'],
+        fontSize=14,
+        textColor=colors.red,
+        alignment=TA_CENTER,
+        borderWidth=2,
+        borderColor=colors.HexColor('#ffc107'),
+        borderPadding=10,
+        backColor=colors.HexColor('#fff3cd')
+    ))
+
+    # Stil pentru footer
+    styles.add(ParagraphStyle(
+        name='Footer',
+        parent=styles['Normal'],
+        fontSize=10,
+        textColor=colors.grey,
+        alignment=TA_CENTER
+    ))
+
+    return styles
+
+
+def init_pdf_resources() -> None:
+    """Înregistrează fonturile și construiește stilurile (o dată per proces)."""
+    global _styles, _fonts
+
+    if _styles is not None:
+        return
+    with _resources_lock:
+        if _styles is not None:
+            return
+        register_fonts()
+        styles = create_styles()
+        _fonts = (styles['Normal'].fontName, styles['CompanyTitle'].fontName)
+        _styles = styles
+
+
+def get_styles():
+    """Stylesheet-ul comun (read-only - nu se modifică în randare)."""
+    if _styles is None:
+        init_pdf_resources()
+    return _styles
+
+
+def get_fonts() -> Tuple[str, str]:
+    """(font normal, font bold) efectiv înregistrate."""
+    if _styles is None:
+        init_pdf_resources()
+    return _fonts
+
+
+def render_invoice(data: InvoiceRenderData) -> str:
+    """
+    Construiește și scrie PDF-ul (CPU-bound, sincron).
+
+    Returns:
+        Calea fișierului generat (cu '/')
+    """
+    styles = get_styles()
+    regular_font, bold_font = get_fonts()
+
+    output_path = Path(data.output_path)
+    subtotal = data.subtotal
+    total = data.total
+
+    # Creează PDF cu margini mai mici
+    doc = SimpleDocTemplate(
+        str(output_path),
+        pagesize=A4,
+        rightMargin=1.5 * cm,  # Redus de la 2cm
+        leftMargin=1.5 * cm,  # Redus de la 2cm
+        topMargin=2 * cm,
+        bottomMargin=2 * cm,
+        title=f"{data.invoice_number}",
+        author="PCE Distribution SRL"
+    )
+
+    # Conținut
+    story = []
+
+    # Header
+    company_data = [
+        [
+            Paragraph("PCE Distribution SRL", styles['CompanyTitle']),
+            Paragraph("OFERTĂ" if data.is_quote else "FACTURĂ", styles['DocumentType'])
+        ],
+        [
+            Paragraph("str. Mihai Eminescu 47, Chișinău<br/>Tel: +373 22 123 456<br/>Email: contact@pce.md",
+                      styles['Normal']),
+            Paragraph(f"{data.invoice_number}<br/>Data: {data.created_at.strftime('%d.%m.%Y')}",
+                      styles['DocumentNumber'])
+        ]
+    ]
+
+    header_table = Table(company_data, colWidths=[11.5 * cm, 6.5 * cm])  # Ajustat pentru margini mai mici
+    header_table.setStyle(TableStyle([
+        ('ALIGN', (0, 0), (0, -1), 'LEFT'),
+        ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
+        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
+    ]))
+    story.append(header_table)
+    story.append(Spacer(1, 0.5 * inch))
+
+    # Date client
+    story.append(Paragraph("DATE CLIENT", styles['SectionTitle']))
+
+    client_info = f"""
+    <b>Nume:</b> {data.client_name}<br/>
+    <b>Email:</b> {data.client_email or 'N/A'}<br/>
+    """
+    if data.client_phone:
+        client_info += f"<b>Telefon:</b> {data.client_phone}<br/>"
+    story.append(Paragraph(client_info, styles['Normal']))
+    story.append(Spacer(1, 0.3 * inch))
+
+    # Validitate (pentru oferte)
+    if data.is_quote and data.valid_until:
+        story.append(Paragraph(
+            f"<b>Ofertă valabilă până la: {data.valid_until.strftime('%d.%m.%Y')}</b>",
+            styles['Validity']
+        ))
+        story.append(Spacer(1, 0.3 * inch))
+
+    # Tabel produse
+    story.append(Paragraph("PRODUSE", styles['SectionTitle']))
+
+    # Header tabel - 6 coloane
+    table_data = [['Nr.', 'Cod produs', 'Denumire produs', 'Cant.', 'Preț unit.\n(MDL)', 'Total\n(MDL)']]
+
+    # Adaugă produse
+    for idx, item in enumerate(data.items, 1):
+        table_data.append([
+            str(idx),
+            item['sku'],
+            item['name'],
+            str(item['quantity']),
+            f"{item['unit_price']:,.0f}",
+            f"{item['subtotal']:,.0f}"
+        ])
+
+    # Crează tabel - colWidths ajustate pentru 6 coloane
+    items_table = Table(
+        table_data,
+        colWidths=[
+            0.8 * cm,  # Nr.
+            2.5 * cm,  # Cod produs
+            7.7 * cm,  # Denumire produs (mai mult spațiu)
+            1.5 * cm,  # Cant.
+            2.5 * cm,  # Preț unit.
+            2.5 * cm  # Total
+        ]
+    )
+
+    items_table.setStyle(TableStyle([
+        # Header
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2c3e50')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), bold_font),
+        ('FONTSIZE', (0, 0), (-1, 0), 11),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+
+        # Body
+        ('ALIGN', (0, 1), (0, -1), 'CENTER'),  # Nr.
+        ('ALIGN', (1, 1), (1, -1), 'CENTER'),  # Cod
+        ('ALIGN', (2, 1), (2, -1), 'LEFT'),  # Denumire
+        ('ALIGN', (3, 1), (3, -1), 'CENTER'),  # Cant.
+        ('ALIGN', (4, 1), (5, -1), 'RIGHT'),  # Prețuri
+        ('GRID', (0, 0), (-1, -1), 1, colors.black),
+        ('FONTNAME', (0, 1), (-1, -1), regular_font),
+        ('FONTSIZE', (0, 1), (-1, -1), 10),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f8f9fa')]),
+    ]))
+
+    story.append(items_table)
+    story.append(Spacer(1, 0.3 * inch))
+
+    # Totaluri
+    totals_data = [
+        ['', '', '', '', 'Subtotal:', f"{(subtotal / 1.2):,.0f} MDL"],
+        ['', '', '', '', 'TVA (20%):', f"{(subtotal - subtotal / 1.2):,.0f} MDL"],
+        ['', '', '', '', 'TOTAL:', f"{total:,.0f} MDL"],
+    ]
+
+    totals_table = Table(
+        totals_data,
+        colWidths=[
+            0.8 * cm,  # Nr.
+            2.5 * cm,  # Cod produs
+            7.2 * cm,  # Denumire produs (redus)
+            1.5 * cm,  # Cant.
+            2.0 * cm,  # Label (redus)
+            3.5 * cm  # Valoare (mărit pentru sume mari)
+        ]
+    )
+
+    totals_table.setStyle(TableStyle([
+        ('ALIGN', (4, 0), (5, -1), 'RIGHT'),
+        ('FONTNAME', (4, 0), (5, -2), regular_font),
+        ('FONTNAME', (4, -1), (5, -1), bold_font),
+        ('FONTSIZE', (4, -1), (5, -1), 13),  # Redus din 14
+        ('LINEABOVE', (4, -1), (5, -1), 2, colors.HexColor('#2c3e50')),
+        ('LINEBELOW', (4, -1), (5, -1), 2, colors.HexColor('#2c3e50')),
+        ('TEXTCOLOR', (5, -1), (5, -1), colors.HexColor('#27ae60')),
+        ('RIGHTPADDING', (5, 0), (5, -1), 8),  # Adăugat padding dreapta
+    ]))
+
+    story.append(totals_table)
+
+    # Note
+    if data.notes:
+        story.append(Spacer(1, 0.3 * inch))
+        story.append(Paragraph("OBSERVAȚII", styles['SectionTitle']))
+        story.append(Paragraph(data.notes, styles['Normal']))
+
+    # Footer
+    story.append(Spacer(1, 0.5 * inch))
+    footer_text = "Vă mulțumim pentru încrederea acordată!<br/>"
+    footer_text += f"Document generat electronic la {datetime.now().strftime('%d.%m.%Y %H:%M')}"
+    story.append(Paragraph(footer_text, styles['Footer']))
+
+    # Generează PDF cu numerotare pagini
+    doc.build(story, onFirstPage=add_page_numbers, onLaterPages=add_page_numbers)
+
+    if not output_path.exists():
+        raise RuntimeError(f"PDF file was not created at {output_path}")
+
+    return str(output_path).replace('\\', '/')
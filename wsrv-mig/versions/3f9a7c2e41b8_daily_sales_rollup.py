@@ -0,0 +1,56 @@
+"""Tabel daily_sales_rollup si rollup_watermarks
+
+Revision ID: 3f9a7c2e41b8
+Revises: d545a5c8c4d4
+Create Date: 2026-10-18 09:12:40.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9a7c2e41b8'
+down_revision: Union[str, Sequence[str], None] = 'd545a5c8c4d4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('daily_sales_rollup',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('level', sa.String(length=10), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('status', postgresql.ENUM('NEW', 'PROCESSING', 'COMPLETED', 'CANCELLED', name='orderstatus', create_type=False), nullable=False),
+    sa.Column('product_id', sa.Integer(), nullable=True),
+    sa.Column('category_id', sa.Integer(), nullable=True),
+    sa.Column('vendor_company_id', sa.Integer(), nullable=True),
+    sa.Column('quantity', sa.Integer(), nullable=False),
+    sa.Column('revenue', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('order_count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['category_id'], ['categories.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['product_id'], ['products.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['vendor_company_id'], ['vendor_companies.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_daily_sales_rollup_level_day_status', 'daily_sales_rollup', ['level', 'day', 'status'], unique=False)
+    op.create_index('ix_daily_sales_rollup_product', 'daily_sales_rollup', ['product_id'], unique=False)
+    op.create_index('ix_daily_sales_rollup_category', 'daily_sales_rollup', ['category_id'], unique=False)
+    op.create_table('rollup_watermarks',
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.Column('refreshed_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('rollup_watermarks')
+    op.drop_index('ix_daily_sales_rollup_category', table_name='daily_sales_rollup')
+    op.drop_index('ix_daily_sales_rollup_product', table_name='daily_sales_rollup')
+    op.drop_index('ix_daily_sales_rollup_level_day_status', table_name='daily_sales_rollup')
+    op.drop_table('daily_sales_rollup')
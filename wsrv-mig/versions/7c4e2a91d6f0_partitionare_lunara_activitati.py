@@ -0,0 +1,114 @@
+"""Partitionare lunara user_activities si user_interactions
+
+Revision ID: 7c4e2a91d6f0
+Revises: 3f9a7c2e41b8
+Create Date: 2026-10-18 14:05:12.503117
+
+"""
+from datetime import date, datetime, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c4e2a91d6f0'
+down_revision: Union[str, Sequence[str], None] = '3f9a7c2e41b8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Partițiile create în avans aici; după aceea le întreține
+# services/dashboard/activity_partitions.py
+MONTHS_AHEAD = 2
+
+INDEXES = {
+    'user_activities': ['client_id'],
+    'user_interactions': ['action_type', 'client_id', 'target_id', 'target_type'],
+}
+
+
+def _add_months(value: date, months: int) -> date:
+    index = value.year * 12 + value.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _create_indexes(table: str) -> None:
+    for column in INDEXES[table]:
+        op.create_index(op.f(f'ix_{table}_{column}'), table, [column], unique=False)
+
+
+def _drop_indexes(table: str) -> None:
+    for column in INDEXES[table]:
+        op.drop_index(op.f(f'ix_{table}_{column}'), table_name=table)
+
+
+def _partition(table: str) -> None:
+    """Tabel obișnuit -> tabel partiționat lunar, cu datele copiate."""
+    legacy = f'{table}_legacy'
+
+    _drop_indexes(table)
+    op.execute(f'ALTER TABLE {table} RENAME TO {legacy}')
+    op.execute(f'ALTER INDEX {table}_pkey RENAME TO {legacy}_pkey')
+
+    # Aceleași coloane și default-uri (inclusiv nextval pe secvența existentă)
+    op.execute(f'CREATE TABLE {table} (LIKE {legacy} INCLUDING DEFAULTS) PARTITION BY RANGE (created_at)')
+    op.create_primary_key(f'{table}_pkey', table, ['id', 'created_at'])
+    op.create_foreign_key(f'{table}_client_id_fkey', table, 'clients', ['client_id'], ['id'])
+    op.execute(f'ALTER SEQUENCE {table}_id_seq OWNED BY {table}.id')
+    _create_indexes(table)
+
+    # O partiție pentru fiecare lună cu date + luna curentă și următoarele
+    first = op.get_bind().execute(sa.text(f'SELECT min(created_at) FROM {legacy}')).scalar()
+    current = datetime.now(timezone.utc).date().replace(day=1)
+    month = min(first.astimezone(timezone.utc).date().replace(day=1), current) if first else current
+    last = _add_months(current, MONTHS_AHEAD)
+    while month <= last:
+        upper = _add_months(month, 1)
+        op.execute(
+            f"CREATE TABLE {table}_p{month.year:04d}_{month.month:02d} PARTITION OF {table} "
+            f"FOR VALUES FROM ('{month.isoformat()} 00:00:00+00') TO ('{upper.isoformat()} 00:00:00+00')"
+        )
+        month = upper
+
+    op.execute(f'INSERT INTO {table} SELECT * FROM {legacy}')
+    op.execute(f'DROP TABLE {legacy}')
+
+
+def _unpartition(table: str) -> None:
+    """Inversul lui _partition: tabel obișnuit cu PK pe id."""
+    partitioned = f'{table}_partitioned'
+
+    _drop_indexes(table)
+    op.execute(f'ALTER TABLE {table} RENAME TO {partitioned}')
+    op.execute(f'ALTER INDEX {table}_pkey RENAME TO {partitioned}_pkey')
+
+    op.execute(f'CREATE TABLE {table} (LIKE {partitioned} INCLUDING DEFAULTS)')
+    op.create_primary_key(f'{table}_pkey', table, ['id'])
+    op.create_foreign_key(f'{table}_client_id_fkey', table, 'clients', ['client_id'], ['id'])
+    op.execute(f'ALTER SEQUENCE {table}_id_seq OWNED BY {table}.id')
+    op.execute(f'INSERT INTO {table} SELECT * FROM {partitioned}')
+    op.execute(f'DROP TABLE {partitioned}')
+    _create_indexes(table)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Un FK nu poate referi un tabel partiționat fără cheia de partiționare
+    op.drop_constraint('user_interactions_activity_id_fkey', 'user_interactions', type_='foreignkey')
+
+    _partition('user_activities')
+    _partition('user_interactions')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _unpartition('user_interactions')
+    _unpartition('user_activities')
+
+    # NOT VALID: retenția poate să fi șters sesiuni încă referite din interacțiuni
+    op.execute(
+        'ALTER TABLE user_interactions ADD CONSTRAINT user_interactions_activity_id_fkey '
+        'FOREIGN KEY (activity_id) REFERENCES user_activities (id) NOT VALID'
+    )
@@ -0,0 +1,62 @@
+"""Indexuri compuse si partiale pentru interogarile din dashboard
+
+Revision ID: a91d3e5f7b20
+Revises: 7c4e2a91d6f0
+Create Date: 2026-10-18 16:40:27.881930
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a91d3e5f7b20'
+down_revision: Union[str, Sequence[str], None] = '7c4e2a91d6f0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY - fără lock de scriere pe tabelele mari; nu poate rula în tranzacție
+    with op.get_context().autocommit_block():
+        # KPI-uri / rapoarte: status = ... AND created_at >= ...
+        op.create_index('ix_orders_status_created_at', 'orders', ['status', 'created_at'],
+                        unique=False, postgresql_concurrently=True)
+        # Ultimele comenzi, comenzi azi, serii de timp (fără filtru pe status)
+        op.create_index('ix_orders_created_at', 'orders', ['created_at'],
+                        unique=False, postgresql_concurrently=True)
+
+        # Oferte valide / expirate (cart_id are deja index unic - uq_invoice_cart)
+        op.create_index('ix_invoices_quote_valid_until', 'invoices', ['valid_until', 'cart_id'],
+                        unique=False, postgresql_concurrently=True,
+                        postgresql_where=sa.text("invoice_type = 'QUOTE'"))
+
+        # Prețul unui produs pe o grilă (și FK-ul product_id, fără index până acum)
+        op.create_index('ix_product_prices_product_type', 'product_prices', ['product_id', 'price_type'],
+                        unique=False, postgresql_concurrently=True)
+        # Doar prețurile active, cu amount în index (index-only scan)
+        op.create_index('ix_product_prices_active', 'product_prices', ['product_id', 'price_type'],
+                        unique=False, postgresql_concurrently=True,
+                        postgresql_include=['amount'],
+                        postgresql_where=sa.text('is_active'))
+
+    # user_interactions e partiționat - indexul se creează pe fiecare partiție (fără CONCURRENTLY)
+    op.create_index('ix_user_interactions_target_action_created', 'user_interactions',
+                    ['target_type', 'target_id', 'action_type', 'created_at'], unique=False)
+    # Prefix al indexului de mai sus - doar cost la scriere
+    op.drop_index(op.f('ix_user_interactions_target_type'), table_name='user_interactions')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index(op.f('ix_user_interactions_target_type'), 'user_interactions', ['target_type'], unique=False)
+    op.drop_index('ix_user_interactions_target_action_created', table_name='user_interactions')
+
+    op.drop_index('ix_product_prices_active', table_name='product_prices')
+    op.drop_index('ix_product_prices_product_type', table_name='product_prices')
+    op.drop_index('ix_invoices_quote_valid_until', table_name='invoices')
+    op.drop_index('ix_orders_created_at', table_name='orders')
+    op.drop_index('ix_orders_status_created_at', table_name='orders')
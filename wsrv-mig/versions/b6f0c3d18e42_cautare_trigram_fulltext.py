@@ -0,0 +1,76 @@
+"""Cautare: pg_trgm, unaccent, full-text romana pentru produse
+
+Revision ID: b6f0c3d18e42
+Revises: a91d3e5f7b20
+Create Date: 2026-10-18 18:22:03.417560
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b6f0c3d18e42'
+down_revision: Union[str, Sequence[str], None] = 'a91d3e5f7b20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Expresiile trebuie să fie identice cu SearchSpec din services/dashboard/search_service.py
+PRODUCT_DOCUMENT = "f_unaccent(name || ' ' || sku)"
+CLIENT_DOCUMENT = (
+    "f_unaccent(coalesce(first_name, '') || ' ' || coalesce(last_name, '') || ' ' || "
+    "coalesce(email, '') || ' ' || coalesce(phone, '') || ' ' || coalesce(username, ''))"
+)
+PRODUCT_VECTOR = (
+    "setweight(to_tsvector('romanian_unaccent', name), 'A') || "
+    "setweight(to_tsvector('romanian_unaccent', coalesce(description, '')), 'B')"
+)
+
+INDEXES = [
+    ('ix_products_search_trgm', f'products USING gin ({PRODUCT_DOCUMENT} gin_trgm_ops)'),
+    ('ix_products_sku_prefix', 'products (lower(sku) text_pattern_ops)'),
+    ('ix_products_search_vector', 'products USING gin (search_vector)'),
+    ('ix_clients_search_trgm', f'clients USING gin ({CLIENT_DOCUMENT} gin_trgm_ops)'),
+    ('ix_orders_number_trgm', 'orders USING gin (order_number gin_trgm_ops)'),
+    ('ix_orders_number_prefix', 'orders (lower(order_number) text_pattern_ops)'),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.execute('CREATE EXTENSION IF NOT EXISTS unaccent')
+
+    # unaccent() e STABLE - pentru indexuri e nevoie de o variantă IMMUTABLE
+    # (dicționarul fixat explicit)
+    op.execute(
+        "CREATE OR REPLACE FUNCTION f_unaccent(text) RETURNS text "
+        "LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT "
+        "AS $$ SELECT public.unaccent('public.unaccent'::regdictionary, $1) $$"
+    )
+
+    # Stemming românesc, fără diacritice
+    op.execute('CREATE TEXT SEARCH CONFIGURATION romanian_unaccent (COPY = romanian)')
+    op.execute(
+        'ALTER TEXT SEARCH CONFIGURATION romanian_unaccent '
+        'ALTER MAPPING FOR hword, hword_part, word WITH unaccent, romanian_stem'
+    )
+
+    op.execute(f'ALTER TABLE products ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ({PRODUCT_VECTOR}) STORED')
+
+    with op.get_context().autocommit_block():
+        for name, definition in INDEXES:
+            op.execute(f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {definition}')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, _ in reversed(INDEXES):
+        op.execute(f'DROP INDEX IF EXISTS {name}')
+
+    op.drop_column('products', 'search_vector')
+    op.execute('DROP TEXT SEARCH CONFIGURATION IF EXISTS romanian_unaccent')
+    op.execute('DROP FUNCTION IF EXISTS f_unaccent(text)')
+    # Extensiile rămân - pot fi folosite și în afara aplicației